@@ -0,0 +1,503 @@
+"""Offline benchmarks of the request hot path.
+
+The benchmarks run without Elasticsearch/OpenSearch: the searches of the API are
+answered by a client returning canned responses built from the items of
+`sample_data/`, so the numbers only measure the work done by the API itself.
+
+    python benchmark.py run --output before.json
+    python benchmark.py run --compare before.json
+    python benchmark.py replay recorded_requests.jsonl
+"""
+import asyncio
+import copy
+import json
+import math
+import os
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+import click
+
+DEFAULT_BACKEND = "elasticsearch"
+
+COLLECTION_ID = "sentinel-s2-l2a-cogs-test"
+
+BASE_URL = "http://benchmark/"
+
+CQL2_FILTER = {
+    "op": "and",
+    "args": [
+        {"op": "<", "args": [{"property": "eo:cloud_cover"}, 10]},
+        {"op": ">=", "args": [{"property": "eo:cloud_cover"}, 0]},
+        {
+            "op": "in",
+            "args": [{"property": "platform"}, ["sentinel-2a", "sentinel-2b"]],
+        },
+        {
+            "op": "between",
+            "args": [
+                {"property": "datetime"},
+                {"timestamp": "2020-01-01T00:00:00Z"},
+                {"timestamp": "2021-01-01T00:00:00Z"},
+            ],
+        },
+        {
+            "op": "s_intersects",
+            "args": [
+                {"property": "geometry"},
+                {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [[-180, -90], [180, -90], [180, 90], [-180, 90], [-180, -90]]
+                    ],
+                },
+            ],
+        },
+    ],
+}
+
+
+def load_sample_data(data_dir: str):
+    """Load the sample collection and items, with the items in the collection."""
+    with open(os.path.join(data_dir, "collection.json")) as f:
+        collection = json.load(f)
+    collection["id"] = COLLECTION_ID
+    with open(os.path.join(data_dir, "sentinel-s2-l2a-cogs_0_100.json")) as f:
+        items = json.load(f)["features"]
+    for item in items:
+        item["collection"] = COLLECTION_ID
+    return collection, items
+
+
+class CannedIndicesClient:
+    """Indices client of `CannedClient`."""
+
+    async def stats(self, **kwargs) -> Dict[str, Any]:
+        """Get the write counters of the collections index, which never change."""
+        indexing = {"index_total": 1, "delete_total": 0}
+        return {"_all": {"primaries": {"indexing": indexing}}}
+
+
+class CannedClient:
+    """Elasticsearch/OpenSearch client answering every call with canned responses.
+
+    Searches return the first `size` items, whatever their query, with a sort array
+    so that the API builds its pagination tokens.
+    """
+
+    def __init__(self, collection: Dict[str, Any], items: List[Dict[str, Any]]):
+        """Create the client from the collection and the database items."""
+        self.collection = collection
+        self.items = items
+        self.indices = CannedIndicesClient()
+
+    def options(self, **kwargs) -> "CannedClient":
+        """Return the client, the options are ignored."""
+        return self
+
+    def search_response(self, size: Optional[int]) -> Dict[str, Any]:
+        """Get the response of a search of `size` items."""
+        hits = [
+            {
+                "_index": f"items_{item['collection']}",
+                "_id": item["id"],
+                "_source": item,
+                "sort": [
+                    item["properties"]["datetime"],
+                    item["id"],
+                    item["collection"],
+                ],
+            }
+            for item in self.items[: size or 10]
+        ]
+        return {
+            "took": 1,
+            "hits": {
+                "total": {"value": len(self.items), "relation": "eq"},
+                "hits": hits,
+            },
+        }
+
+    async def search(self, **kwargs) -> Dict[str, Any]:
+        """Search the items, or the collections."""
+        index = str(kwargs.get("index", ""))
+        if index.startswith("collections"):
+            return {
+                "hits": {
+                    "total": {"value": 1, "relation": "eq"},
+                    "hits": [{"_source": self.collection, "sort": [COLLECTION_ID]}],
+                }
+            }
+        size = kwargs.get("size") or (kwargs.get("body") or {}).get("size")
+        return self.search_response(size)
+
+    async def msearch(self, **kwargs) -> Dict[str, Any]:
+        """Run the searches of a multi search, one header and one body per search."""
+        lines = kwargs.get("searches") or kwargs.get("body") or []
+        return {
+            "responses": [
+                self.search_response(body.get("size")) for body in lines[1::2]
+            ]
+        }
+
+    async def get(self, **kwargs) -> Dict[str, Any]:
+        """Get the collection, or an item."""
+        if str(kwargs.get("index", "")).startswith("collections"):
+            return {"_source": self.collection, "_seq_no": 1, "_primary_term": 1}
+        for item in self.items:
+            if item["id"] == kwargs.get("id"):
+                return {"_source": item, "_seq_no": 1, "_primary_term": 1}
+        return {"_source": self.items[0], "_seq_no": 1, "_primary_term": 1}
+
+    async def exists(self, **kwargs) -> bool:
+        """Every document exists."""
+        return True
+
+    async def count(self, **kwargs) -> Dict[str, Any]:
+        """Count the items."""
+        return {"count": len(self.items)}
+
+    async def open_point_in_time(self, **kwargs) -> Dict[str, Any]:
+        """Open an Elasticsearch point in time."""
+        return {"id": "benchmark-pit"}
+
+    async def create_pit(self, **kwargs) -> Dict[str, Any]:
+        """Open an OpenSearch point in time."""
+        return {"pit_id": "benchmark-pit"}
+
+    async def close_point_in_time(self, **kwargs) -> Dict[str, Any]:
+        """Close an Elasticsearch point in time."""
+        return {}
+
+    async def delete_pit(self, **kwargs) -> Dict[str, Any]:
+        """Close an OpenSearch point in time."""
+        return {}
+
+
+def load_app(backend: str, data_dir: str):
+    """Import the application of a backend, with its client answering canned responses."""
+    # the client is created on import, it is never connected to
+    os.environ.setdefault("ES_HOST", "localhost")
+    os.environ.setdefault("ES_PORT", "9200")
+    os.environ.setdefault("ES_USE_SSL", "false")
+
+    import importlib
+
+    from stac_fastapi.core.serializers import ItemSerializer
+
+    app_module = importlib.import_module(f"stac_fastapi.{backend}.app")
+    collection, items = load_sample_data(data_dir)
+    db_items = [ItemSerializer.stac_to_db(item, BASE_URL) for item in items]
+    app_module.database_logic.client = CannedClient(collection, db_items)
+    return app_module.app
+
+
+def make_request(method: str = "GET", path: str = "/search", query: str = ""):
+    """Make a request to the benchmark server."""
+    from starlette.requests import Request
+
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "scheme": "http",
+            "server": ("benchmark", 80),
+            "root_path": "",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [(b"host", b"benchmark")],
+        }
+    )
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """Summarize durations in seconds as the mean, median, p95 and min microseconds.
+
+    The p95 is the nearest-rank percentile, the smallest duration that is at least as
+    long as 95% of the durations.
+    """
+    durations = sorted(durations)
+    return {
+        "mean_us": statistics.fmean(durations) * 1e6,
+        "median_us": statistics.median(durations) * 1e6,
+        "p95_us": durations[math.ceil(0.95 * len(durations)) - 1] * 1e6,
+        "min_us": durations[0] * 1e6,
+    }
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int) -> Dict[str, float]:
+    """Measure the duration of each of `number` calls, `repeat` times."""
+    durations = []
+    for _ in range(repeat):
+        for _ in range(number):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+async def ameasure(
+    func: Callable[[], Awaitable[Any]], number: int, repeat: int
+) -> Dict[str, float]:
+    """Measure the duration of an asynchronous call, see `measure`."""
+    durations = []
+    for _ in range(repeat):
+        for _ in range(number):
+            start = time.perf_counter()
+            await func()
+            durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+async def run_benchmarks(
+    backend: str, data_dir: str, number: int, repeat: int, selected: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """Run the benchmarks, or the selected ones."""
+    import httpx
+
+    from stac_fastapi.core.extensions import filter
+    from stac_fastapi.core.models.links import PagingLinks
+    from stac_fastapi.core.serializers import CollectionSerializer, ItemSerializer
+    from stac_fastapi.core.utilities import encode_token, filter_fields
+
+    app = load_app(backend, data_dir)
+    collection, items = load_sample_data(data_dir)
+    db_item = ItemSerializer.stac_to_db(copy.deepcopy(items[0]), BASE_URL)
+    stac_item = ItemSerializer.db_to_stac(db_item, BASE_URL)
+    include = {"id", "collection", "properties.datetime", "properties.eo:cloud_cover"}
+    exclude = {"assets"}
+    token = encode_token(["2020-02-12T12:30:22Z", items[0]["id"], COLLECTION_ID])
+
+    async def paging_links():
+        request = make_request(query="limit=10&collections=" + COLLECTION_ID)
+        return await PagingLinks(request=request, next=token).get_links()
+
+    sync_benchmarks: Dict[str, Callable[[], Any]] = {
+        "filter.to_es": lambda: filter.to_es(CQL2_FILTER),
+        "filter.to_es_filter": lambda: filter.to_es_filter(CQL2_FILTER),
+        "filter_fields.include": lambda: filter_fields(stac_item, include, set()),
+        "filter_fields.exclude": lambda: filter_fields(stac_item, set(), exclude),
+        "ItemSerializer.db_to_stac": lambda: ItemSerializer.db_to_stac(
+            db_item, BASE_URL
+        ),
+        "CollectionSerializer.db_to_stac": lambda: CollectionSerializer.db_to_stac(
+            collection, make_request(path="/collections"), extensions=[]
+        ),
+    }
+
+    results = {}
+    for name, func in sync_benchmarks.items():
+        if not selected or name in selected:
+            results[name] = measure(func, number, repeat)
+
+    if not selected or "PagingLinks" in selected:
+        results["PagingLinks"] = await ameasure(paging_links, number, repeat)
+
+    # the requests are fewer, they serialize a page of items each
+    request_number = max(1, number // 100)
+    async with httpx.AsyncClient(app=app, base_url=BASE_URL) as client:
+        requests = {
+            "post_search.limit_10": lambda: client.post(
+                "/search", json={"collections": [COLLECTION_ID], "limit": 10}
+            ),
+            "post_search.limit_100.filter": lambda: client.post(
+                "/search",
+                json={
+                    "collections": [COLLECTION_ID],
+                    "limit": 100,
+                    "filter-lang": "cql2-json",
+                    "filter": CQL2_FILTER,
+                },
+            ),
+            "post_search.limit_100.fields": lambda: client.post(
+                "/search",
+                json={
+                    "collections": [COLLECTION_ID],
+                    "limit": 100,
+                    "fields": {"include": sorted(include)},
+                },
+            ),
+            "item_collection.limit_10": lambda: client.get(
+                f"/collections/{COLLECTION_ID}/items", params={"limit": 10}
+            ),
+        }
+        for name, send in requests.items():
+            if not selected or name in selected:
+                response = await send()
+                response.raise_for_status()
+                results[name] = await ameasure(send, request_number, repeat)
+
+    return results
+
+
+def print_results(
+    results: Dict[str, Dict[str, float]],
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+) -> None:
+    """Print the results, with their change against a baseline."""
+    header = f"{'benchmark':<48} {'median us':>12} {'p95 us':>12} {'min us':>12}"
+    if baseline:
+        header += f" {'change':>9}"
+    click.echo(header)
+    for name, result in results.items():
+        line = (
+            f"{name:<48} {result['median_us']:>12.1f} "
+            f"{result['p95_us']:>12.1f} {result['min_us']:>12.1f}"
+        )
+        if baseline and name in baseline:
+            change = result["median_us"] / baseline[name]["median_us"] - 1
+            line += f" {change:>+9.1%}"
+        click.echo(line)
+
+
+@click.group()
+def main():
+    """Benchmark the request hot path without a cluster."""
+
+
+@main.command()
+@click.option(
+    "--backend",
+    type=click.Choice(["elasticsearch", "opensearch"]),
+    default=DEFAULT_BACKEND,
+    help="Backend of the benchmarked application",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True),
+    default="sample_data/",
+    help="Directory containing collection.json and the Sentinel-2 feature collection",
+)
+@click.option("--number", default=1000, help="Calls per measure")
+@click.option("--repeat", default=7, help="Measures per benchmark")
+@click.option(
+    "--benchmark", "selected", multiple=True, help="Only run the named benchmarks"
+)
+@click.option("--output", type=click.Path(), help="Write the results to this JSON file")
+@click.option(
+    "--compare",
+    type=click.Path(exists=True),
+    help="Compare the results to the results of a previous run",
+)
+def run(backend, data_dir, number, repeat, selected, output, compare):
+    """Run the micro benchmarks and the end-to-end search benchmarks."""
+    results = asyncio.run(
+        run_benchmarks(backend, data_dir, number, repeat, list(selected))
+    )
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def read_request_log(path: str) -> List[Dict[str, Any]]:
+    """Read the requests of a JSON lines request log.
+
+    Every line is a request with a `method` (GET by default), a `path`, and
+    optionally a `query`, as a string or an object, and a JSON `body`.
+    """
+    requests = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            if "path" not in request:
+                raise click.ClickException(f"{path}:{number}: the request has no path")
+            query = request.get("query") or ""
+            if isinstance(query, dict):
+                query = urlencode(query, doseq=True)
+            requests.append(
+                {
+                    "method": request.get("method", "GET").upper(),
+                    "url": request["path"] + (f"?{query}" if query else ""),
+                    "body": request.get("body"),
+                }
+            )
+    return requests
+
+
+async def replay_requests(
+    requests: List[Dict[str, Any]], client, repeat: int
+) -> Dict[str, Dict[str, Any]]:
+    """Send the requests in order, `repeat` times, and summarize them per path."""
+    durations: Dict[str, List[float]] = {}
+    statuses: Dict[str, Dict[int, int]] = {}
+    for _ in range(repeat):
+        for request in requests:
+            key = f"{request['method']} {request['url'].split('?')[0]}"
+            start = time.perf_counter()
+            response = await client.request(
+                request["method"], request["url"], json=request["body"]
+            )
+            durations.setdefault(key, []).append(time.perf_counter() - start)
+            counts = statuses.setdefault(key, {})
+            counts[response.status_code] = counts.get(response.status_code, 0) + 1
+    return {
+        key: {**summarize(durations[key]), "statuses": statuses[key]}
+        for key in durations
+    }
+
+
+@main.command()
+@click.argument("request_log", type=click.Path(exists=True))
+@click.option(
+    "--backend",
+    type=click.Choice(["elasticsearch", "opensearch"]),
+    default=DEFAULT_BACKEND,
+    help="Backend of the benchmarked application",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True),
+    default="sample_data/",
+    help="Directory containing collection.json and the Sentinel-2 feature collection",
+)
+@click.option(
+    "--base-url", help="Replay against a running API instead of the offline application"
+)
+@click.option("--repeat", default=1, help="Times the requests are replayed")
+@click.option("--output", type=click.Path(), help="Write the results to this JSON file")
+@click.option(
+    "--compare",
+    type=click.Path(exists=True),
+    help="Compare the results to the results of a previous replay",
+)
+def replay(request_log, backend, data_dir, base_url, repeat, output, compare):
+    """Replay a JSON lines log of recorded requests, and time them."""
+    import httpx
+
+    requests = read_request_log(request_log)
+
+    async def replay_all():
+        if base_url:
+            client = httpx.AsyncClient(base_url=base_url, timeout=60)
+        else:
+            client = httpx.AsyncClient(
+                app=load_app(backend, data_dir), base_url=BASE_URL
+            )
+        async with client:
+            return await replay_requests(requests, client, repeat)
+
+    results = asyncio.run(replay_all())
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    for key, result in results.items():
+        if any(status >= 400 for status in result["statuses"]):
+            click.secho(f"{key}: responses {result['statuses']}", fg="yellow")
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
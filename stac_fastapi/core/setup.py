@@ -20,6 +20,7 @@ install_requires = [
     "typing_extensions==4.8.0",
     "jsonschema",
     "slowapi==0.1.9",
+    "prometheus-client>=0.17.0",
 ]
 
 setup(
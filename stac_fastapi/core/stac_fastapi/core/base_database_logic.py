@@ -1,7 +1,7 @@
 """Base database logic."""
 
 import abc
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 
 class BaseDatabaseLogic(abc.ABC):
@@ -29,6 +29,26 @@ class BaseDatabaseLogic(abc.ABC):
         """Create an item in the database."""
         pass
 
+    @abc.abstractmethod
+    async def update_item(
+        self, item: Dict, refresh: bool = False, version: Optional[Any] = None
+    ) -> Optional[Any]:
+        """Replace an item in the database, returning its new version."""
+        pass
+
+    @abc.abstractmethod
+    async def patch_item(
+        self,
+        collection_id: str,
+        item_id: str,
+        patch: Any,
+        updated: str,
+        refresh: bool = False,
+        version: Optional[Any] = None,
+    ) -> Tuple[Dict, Optional[Any]]:
+        """Apply a patch to an item in the database, returning it and its new version."""
+        pass
+
     @abc.abstractmethod
     async def delete_item(
         self, item_id: str, collection_id: str, refresh: bool = False
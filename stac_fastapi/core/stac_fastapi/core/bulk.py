@@ -0,0 +1,236 @@
+"""Per-item results of the bulk item writes.
+
+Bulk writes don't check whether the items exist beforehand. Inserts are sent as bulk
+`create` actions, which the cluster rejects with a conflict when the item exists, and
+upserts as `index` actions, which overwrite the item. The outcome of every item is read
+from the bulk response.
+
+The asynchronous bulk writes split the items into chunks, and send up to
+`STAC_FASTAPI_BULK_CONCURRENCY` chunks at the same time on the client of the searches.
+"""
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import attr
+
+from stac_fastapi.types.errors import ConflictError, DatabaseError
+
+# bulk operation types
+CREATE = "create"
+INDEX = "index"
+
+
+def bulk_op_type(exist_ok: bool) -> str:
+    """Get the bulk operation type of an item write.
+
+    Args:
+        exist_ok (bool): Whether the items can exist already, and are overwritten.
+
+    Returns:
+        str: `index` to overwrite the existing items, else `create`.
+    """
+    return INDEX if exist_ok else CREATE
+
+
+@attr.s(frozen=True)
+class BulkOptions:
+    """How the bulk writes are chunked.
+
+    Attributes:
+        chunk_size (int): The maximum number of items of a bulk request.
+        max_chunk_bytes (int): The maximum size in bytes of a bulk request.
+        max_concurrency (int): The maximum number of bulk requests in flight at the same
+            time, for the asynchronous bulk writes.
+    """
+
+    chunk_size: int = attr.ib(default=500)
+    max_chunk_bytes: int = attr.ib(default=100 * 1024 * 1024)
+    max_concurrency: int = attr.ib(default=1)
+
+    @classmethod
+    def from_env(cls) -> "BulkOptions":
+        """Create the options from the environment.
+
+        `STAC_FASTAPI_BULK_CHUNK_SIZE` sets the maximum number of items of a bulk request,
+        500 by default, `STAC_FASTAPI_BULK_CHUNK_BYTES` its maximum size in bytes, 100 MiB
+        by default, and `STAC_FASTAPI_BULK_CONCURRENCY` the maximum number of bulk requests
+        in flight, 1 by default.
+
+        Returns:
+            BulkOptions: The bulk options.
+
+        Raises:
+            ValueError: If a variable is not a positive integer.
+        """
+        values = {
+            "STAC_FASTAPI_BULK_CHUNK_SIZE": os.getenv("STAC_FASTAPI_BULK_CHUNK_SIZE")
+            or "500",
+            "STAC_FASTAPI_BULK_CHUNK_BYTES": os.getenv("STAC_FASTAPI_BULK_CHUNK_BYTES")
+            or str(100 * 1024 * 1024),
+            "STAC_FASTAPI_BULK_CONCURRENCY": os.getenv("STAC_FASTAPI_BULK_CONCURRENCY")
+            or "1",
+        }
+        for name, value in values.items():
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(
+                    f"Invalid {name} '{value}', must be a positive integer"
+                )
+        return cls(
+            chunk_size=int(values["STAC_FASTAPI_BULK_CHUNK_SIZE"]),
+            max_chunk_bytes=int(values["STAC_FASTAPI_BULK_CHUNK_BYTES"]),
+            max_concurrency=int(values["STAC_FASTAPI_BULK_CONCURRENCY"]),
+        )
+
+
+@attr.s(frozen=True)
+class BulkItemResult:
+    """The outcome of the bulk write of an item.
+
+    Attributes:
+        id (str): The id of the item.
+        status (int): The HTTP status of the write, e.g. 201 when the item was created,
+            200 when it was overwritten and 409 when it exists already.
+        error (Optional[str]): The reason of the failure of the write, if it failed.
+    """
+
+    id: str = attr.ib()
+    status: int = attr.ib()
+    error: Optional[str] = attr.ib(default=None)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was written."""
+        return self.error is None and self.status < 300
+
+    @property
+    def conflict(self) -> bool:
+        """Whether the item was not written because it exists already."""
+        return self.status == 409
+
+
+def conflict_result(item_id: str, collection_id: str) -> BulkItemResult:
+    """Get the result of an item that exists already."""
+    return BulkItemResult(
+        id=item_id,
+        status=409,
+        error=f"Item {item_id} in collection {collection_id} already exists",
+    )
+
+
+def bulk_item_result(
+    item_id: str, response: Tuple[bool, Dict[str, Any]]
+) -> BulkItemResult:
+    """Read the result of an item from a streaming bulk response.
+
+    Args:
+        item_id (str): The id of the item.
+        response (Tuple[bool, Dict[str, Any]]): The `(ok, {op_type: info})` tuple
+            yielded by the streaming bulk helpers for the action of the item.
+
+    Returns:
+        BulkItemResult: The result of the item.
+    """
+    ok, response_item = response
+    info = next(iter(response_item.values()), {})
+    status = info.get("status", 200 if ok else 500)
+    if ok:
+        return BulkItemResult(id=item_id, status=status)
+    error = info.get("error") or info.get("exception") or "Unknown error"
+    if isinstance(error, dict):
+        error = error.get("reason") or error.get("type") or str(error)
+    return BulkItemResult(id=item_id, status=status, error=str(error))
+
+
+def bulk_results_summary(results: List[BulkItemResult]) -> str:
+    """Summarize the results of a bulk write.
+
+    Args:
+        results (List[BulkItemResult]): The results of the items.
+
+    Returns:
+        str: The number of items written, and the reason of each failure.
+    """
+    failures = [result for result in results if not result.ok]
+    if not failures:
+        return f"Successfully added {len(results)} Items."
+    details = "; ".join(f"{result.id}: {result.error}" for result in failures)
+    return (
+        f"Added {len(results) - len(failures)} of {len(results)} Items. "
+        f"{len(failures)} Items failed: {details}"
+    )
+
+
+def raise_for_bulk_results(results: Iterable[BulkItemResult]) -> None:
+    """Raise an error if the write of any item failed.
+
+    Args:
+        results (Iterable[BulkItemResult]): The results of the items.
+
+    Raises:
+        ConflictError: If the failed items all exist already.
+        DatabaseError: If the write of any item failed for another reason.
+    """
+    results = list(results)
+    failures = [result for result in results if not result.ok]
+    if not failures:
+        return
+    message = bulk_results_summary(results)
+    if all(result.conflict for result in failures):
+        raise ConflictError(message)
+    raise DatabaseError(message)
+
+
+async def concurrent_streaming_bulk(
+    streaming_bulk: Callable[..., AsyncIterator[Tuple[bool, Dict[str, Any]]]],
+    client: Any,
+    actions: List[Dict[str, Any]],
+    options: BulkOptions,
+    **kwargs: Any,
+) -> List[Tuple[bool, Dict[str, Any]]]:
+    """Send bulk actions in chunks, with several chunks in flight.
+
+    Args:
+        streaming_bulk (Callable): The `async_streaming_bulk` helper of the client.
+        client (Any): The asynchronous Elasticsearch/OpenSearch client.
+        actions (List[Dict[str, Any]]): The bulk actions.
+        options (BulkOptions): The chunking of the bulk requests.
+        **kwargs: The parameters of the bulk requests, e.g. `refresh`.
+
+    Returns:
+        List[Tuple[bool, Dict[str, Any]]]: The `(ok, {op_type: info})` response of each
+        action, in the order of the actions. Errors are returned, not raised.
+    """
+
+    async def send(chunk: List[Dict[str, Any]]) -> List[Tuple[bool, Dict[str, Any]]]:
+        return [
+            response
+            async for response in streaming_bulk(
+                client,
+                chunk,
+                chunk_size=options.chunk_size,
+                max_chunk_bytes=options.max_chunk_bytes,
+                raise_on_error=False,
+                raise_on_exception=False,
+                **kwargs,
+            )
+        ]
+
+    if options.max_concurrency <= 1 or len(actions) <= options.chunk_size:
+        return await send(actions)
+
+    semaphore = asyncio.Semaphore(options.max_concurrency)
+
+    async def send_chunk(
+        chunk: List[Dict[str, Any]]
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        async with semaphore:
+            return await send(chunk)
+
+    chunks = [
+        actions[start : start + options.chunk_size]
+        for start in range(0, len(actions), options.chunk_size)
+    ]
+    responses = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+    return [response for chunk_responses in responses for response in chunk_responses]
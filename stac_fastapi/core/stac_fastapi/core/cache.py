@@ -0,0 +1,442 @@
+"""In-process caches."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import attr
+import orjson
+from pygeofilter.backends.cql2_json import to_cql2
+from pygeofilter.parsers.cql2_text import parse as parse_cql2_text
+
+from stac_fastapi.core.extensions import filter
+
+
+@attr.s
+class TTLCache:
+    """A size bounded least recently used cache, with a time to live for its entries.
+
+    Attributes:
+        max_size (int): The maximum number of entries, the least recently used entry is
+            evicted to make room for a new one. The cache is disabled if 0.
+        ttl (float): The number of seconds an entry is kept.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+        evictions (int): The number of entries evicted because the cache was full.
+    """
+
+    max_size: int = attr.ib(default=1024)
+    ttl: float = attr.ib(default=60.0)
+
+    hits: int = attr.ib(default=0, init=False)
+    misses: int = attr.ib(default=0, init=False)
+    evictions: int = attr.ib(default=0, init=False)
+
+    _entries: "OrderedDict[Hashable, Tuple[float, Any]]" = attr.ib(
+        factory=OrderedDict, init=False, repr=False
+    )
+    # bulk_sync writes from a worker thread
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can hold entries."""
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the value of a key.
+
+        Args:
+            key (Hashable): The key.
+            default (Any): The value returned if the key is not cached or has expired.
+
+        Returns:
+            Any: The cached value, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache the value of a key, evicting the least recently used entry if full.
+
+        Args:
+            key (Hashable): The key.
+            value (Any): The value.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Remove the entries matching a predicate.
+
+        Args:
+            predicate (Callable[[Hashable, Any], bool]): Called with the key and value of
+                every entry, the entry is removed if it returns True.
+        """
+        with self._lock:
+            for key in [k for k, (_, v) in self._entries.items() if predicate(k, v)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all of the entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size and the counters of the cache.
+
+        Returns:
+            Dict[str, int]: The `size`, `max_size`, `hits`, `misses` and `evictions`.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@attr.s
+class SearchCache:
+    """Cache of item search results, invalidated per collection.
+
+    Entries are keyed on the normalized search parameters, and tagged with the searched
+    collections so that a write to a collection only drops the searches that may return
+    its items. Results are cached serialized, so the cached items can't be modified by the
+    callers.
+
+    Attributes:
+        cache (TTLCache): The underlying cache.
+    """
+
+    cache: TTLCache = attr.ib()
+
+    @classmethod
+    def from_env(cls) -> "SearchCache":
+        """Create the cache from the environment.
+
+        `STAC_FASTAPI_SEARCH_CACHE_SIZE` sets the maximum number of cached searches, 0 (the
+        default) disables the cache. `STAC_FASTAPI_SEARCH_CACHE_TTL` sets the number of
+        seconds a search is cached, 60 by default.
+
+        Returns:
+            SearchCache: The search cache.
+
+        Raises:
+            ValueError: If a variable is not a number.
+        """
+        max_size = os.getenv("STAC_FASTAPI_SEARCH_CACHE_SIZE") or "0"
+        ttl = os.getenv("STAC_FASTAPI_SEARCH_CACHE_TTL") or "60"
+        try:
+            return cls(cache=TTLCache(max_size=int(max_size), ttl=float(ttl)))
+        except ValueError:
+            raise ValueError(
+                f"Invalid STAC_FASTAPI_SEARCH_CACHE_SIZE '{max_size}' or "
+                f"STAC_FASTAPI_SEARCH_CACHE_TTL '{ttl}', must be numbers"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether searches are cached."""
+        return self.cache.enabled
+
+    @staticmethod
+    def make_key(**params: Any) -> bytes:
+        """Create the key of a search.
+
+        Args:
+            params: The search parameters, e.g. the query, sort, token and limit.
+
+        Returns:
+            bytes: The parameters serialized with sorted keys and sets, so that equal
+            searches have equal keys.
+        """
+
+        def normalize(value: Any) -> Any:
+            if isinstance(value, (set, frozenset)):
+                return sorted(value)
+            return str(value)
+
+        return orjson.dumps(params, default=normalize, option=orjson.OPT_SORT_KEYS)
+
+    def get(
+        self, key: bytes
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]]:
+        """Get a cached search result.
+
+        Args:
+            key (bytes): The key of the search, see `make_key`.
+
+        Returns:
+            Optional[Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]]: The items,
+            matched count and next token of the search, or None if not cached.
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        _, items, matched, next_token = entry
+        return orjson.loads(items), matched, next_token
+
+    def set(
+        self,
+        key: bytes,
+        collection_ids: Optional[Iterable[str]],
+        items: List[Dict[str, Any]],
+        matched: Optional[int],
+        next_token: Optional[str],
+    ) -> None:
+        """Cache a search result.
+
+        Args:
+            key (bytes): The key of the search, see `make_key`.
+            collection_ids (Optional[Iterable[str]]): The searched collections, None if the
+                search is not limited to some collections.
+            items (List[Dict[str, Any]]): The items of the search.
+            matched (Optional[int]): The matched count of the search.
+            next_token (Optional[str]): The next token of the search.
+        """
+        collections = frozenset(collection_ids) if collection_ids else None
+        self.cache.set(key, (collections, orjson.dumps(items), matched, next_token))
+
+    def invalidate_collection(self, collection_id: str) -> None:
+        """Drop the cached searches that may return items of a collection.
+
+        Args:
+            collection_id (str): The id of the written collection.
+        """
+        self.cache.invalidate(
+            lambda _, entry: entry[0] is None or collection_id in entry[0]
+        )
+
+    def clear(self) -> None:
+        """Drop all of the cached searches."""
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size and the hit and miss counters of the cache."""
+        return self.cache.stats()
+
+
+@attr.s
+class FilterCache:
+    """Cache of CQL2 filters, parsed from cql2-text and compiled to queries.
+
+    Parsing cql2-text and compiling a filter to the query DSL only depend on the filter,
+    so the results are kept until they are evicted, without a time to live. The
+    filters are cached serialized, so the returned filters and queries can be modified
+    by the callers.
+
+    Attributes:
+        cache (TTLCache): The underlying cache.
+    """
+
+    cache: TTLCache = attr.ib()
+
+    @classmethod
+    def from_env(cls) -> "FilterCache":
+        """Create the cache from the environment.
+
+        `STAC_FASTAPI_FILTER_CACHE_SIZE` sets the maximum number of cached filters, 1024 by
+        default, 0 disables the cache.
+
+        Returns:
+            FilterCache: The filter cache.
+
+        Raises:
+            ValueError: If the variable is not a number.
+        """
+        max_size = os.getenv("STAC_FASTAPI_FILTER_CACHE_SIZE") or "1024"
+        try:
+            return cls(cache=TTLCache(max_size=int(max_size), ttl=float("inf")))
+        except ValueError:
+            raise ValueError(
+                f"Invalid STAC_FASTAPI_FILTER_CACHE_SIZE '{max_size}', must be a number"
+            )
+
+    def _get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get the cached value of a key, computing and caching it if missing."""
+        if not self.cache.enabled:
+            return compute()
+        value = self.cache.get(key)
+        if value is None:
+            value = orjson.dumps(compute())
+            self.cache.set(key, value)
+        return orjson.loads(value)
+
+    def parse_text(self, cql2_text: str) -> Dict[str, Any]:
+        """Parse a cql2-text filter to cql2-json.
+
+        Args:
+            cql2_text (str): The cql2-text filter.
+
+        Returns:
+            Dict[str, Any]: The cql2-json filter.
+        """
+        return self._get_or_set(
+            ("cql2-text", cql2_text),
+            lambda: orjson.loads(to_cql2(parse_cql2_text(cql2_text))),
+        )
+
+    def to_es(self, cql2_json: Dict[str, Any]) -> Dict[str, Any]:
+        """Compile a cql2-json filter to an Elasticsearch/OpenSearch query.
+
+        Args:
+            cql2_json (Dict[str, Any]): The cql2-json filter.
+
+        Returns:
+            Dict[str, Any]: The query, see `stac_fastapi.core.extensions.filter.to_es_filter`.
+        """
+        key = (
+            "cql2-json",
+            orjson.dumps(cql2_json, default=str, option=orjson.OPT_SORT_KEYS),
+        )
+        return self._get_or_set(key, lambda: filter.to_es_filter(cql2_json))
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size and the hit and miss counters of the cache."""
+        return self.cache.stats()
+
+
+# Cached in place of the collections that don't exist
+MISSING = object()
+
+
+@attr.s
+class CollectionCache:
+    """Cache of collection documents, including the collections that don't exist.
+
+    Every worker has its own cache. To see the collection writes of the other workers,
+    `revalidate` compares a version of the collections index, e.g. its write counters, at
+    most once per `version_check_interval` seconds, and drops all of the collections when
+    it has changed.
+
+    Attributes:
+        cache (TTLCache): The underlying cache.
+        version_check_interval (float): The minimum number of seconds between two version
+            checks.
+    """
+
+    cache: TTLCache = attr.ib()
+    version_check_interval: float = attr.ib(default=5.0)
+
+    _version: Any = attr.ib(default=None, init=False)
+    _checked_at: Optional[float] = attr.ib(default=None, init=False)
+
+    @classmethod
+    def from_env(cls) -> "CollectionCache":
+        """Create the cache from the environment.
+
+        `STAC_FASTAPI_COLLECTION_CACHE_SIZE` sets the maximum number of cached collections, 0
+        (the default) disables the cache. `STAC_FASTAPI_COLLECTION_CACHE_TTL` sets the
+        number of seconds a collection is cached, 300 by default.
+
+        Returns:
+            CollectionCache: The collection cache.
+
+        Raises:
+            ValueError: If a variable is not a number.
+        """
+        max_size = os.getenv("STAC_FASTAPI_COLLECTION_CACHE_SIZE") or "0"
+        ttl = os.getenv("STAC_FASTAPI_COLLECTION_CACHE_TTL") or "300"
+        try:
+            return cls(cache=TTLCache(max_size=int(max_size), ttl=float(ttl)))
+        except ValueError:
+            raise ValueError(
+                f"Invalid STAC_FASTAPI_COLLECTION_CACHE_SIZE '{max_size}' or "
+                f"STAC_FASTAPI_COLLECTION_CACHE_TTL '{ttl}', must be numbers"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether collections are cached."""
+        return self.cache.enabled
+
+    async def revalidate(self, get_version: Callable[[], Awaitable[Any]]) -> None:
+        """Drop all of the collections if the collections index has changed.
+
+        Args:
+            get_version (Callable[[], Awaitable[Any]]): Returns a value that changes with
+                every write to the collections index. It is only awaited if the last check
+                is older than `version_check_interval`.
+        """
+        now = time.monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self.version_check_interval
+        ):
+            return
+        self._checked_at = now
+        version = await get_version()
+        if version is None or version != self._version:
+            self.cache.clear()
+        self._version = version
+
+    def get(self, collection_id: str) -> Union[Dict[str, Any], object, None]:
+        """Get a cached collection.
+
+        Args:
+            collection_id (str): The id of the collection.
+
+        Returns:
+            Union[Dict[str, Any], object, None]: A copy of the collection, `MISSING` if the
+            collection doesn't exist, or None if it is not cached.
+        """
+        entry = self.cache.get(collection_id)
+        if entry is None or entry is MISSING:
+            return entry
+        return orjson.loads(entry)
+
+    def set(self, collection_id: str, collection: Optional[Dict[str, Any]]) -> None:
+        """Cache a collection.
+
+        Args:
+            collection_id (str): The id of the collection.
+            collection (Optional[Dict[str, Any]]): The collection, None if it doesn't exist.
+        """
+        self.cache.set(
+            collection_id, orjson.dumps(collection) if collection else MISSING
+        )
+
+    def invalidate(self, collection_id: str) -> None:
+        """Drop a cached collection.
+
+        Args:
+            collection_id (str): The id of the collection.
+        """
+        self.cache.invalidate(lambda key, _: key == collection_id)
+
+    def clear(self) -> None:
+        """Drop all of the cached collections."""
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size and the hit and miss counters of the cache."""
+        return self.cache.stats()
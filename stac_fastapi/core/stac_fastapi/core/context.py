@@ -0,0 +1,70 @@
+"""Request scoped context."""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import attr
+from starlette.requests import Request
+
+
+@attr.s
+class RequestContext:
+    """Request data computed once and shared by the clients, serializers and links.
+
+    Attributes:
+        request: The request.
+        base_url: The base url of the API.
+        url: The url of the request.
+        extensions: The class names of the enabled API extensions, set by the client
+            handling the request.
+        postbody: The JSON body of a POST request, read on first use.
+    """
+
+    request: Request = attr.ib()
+    base_url: str = attr.ib()
+    url: str = attr.ib()
+    extensions: Optional[List[str]] = attr.ib(default=None)
+    postbody: Optional[Dict[str, Any]] = attr.ib(default=None)
+
+    def set_extensions(self, extensions: Iterable[Any]) -> List[str]:
+        """Set the enabled extensions of the request, unless they are already set.
+
+        Args:
+            extensions (Iterable[Any]): The enabled extensions, or their class names.
+
+        Returns:
+            List[str]: The class names of the enabled extensions.
+        """
+        if self.extensions is None:
+            self.extensions = [
+                ext if isinstance(ext, str) else type(ext).__name__
+                for ext in extensions
+            ]
+        return self.extensions
+
+    async def get_postbody(self) -> Dict[str, Any]:
+        """Get the JSON body of the request."""
+        if self.postbody is None:
+            self.postbody = await self.request.json()
+        return self.postbody
+
+
+def get_request_context(request: Request) -> RequestContext:
+    """Get the context of a request, created on first use.
+
+    The context is kept in the request state, or on the request itself for requests
+    without a state, so every caller handling the same request shares it.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        RequestContext: The context of the request.
+    """
+    holder = getattr(request, "state", request)
+    context = getattr(holder, "stac_context", None)
+    if context is None:
+        context = RequestContext(
+            request=request, base_url=str(request.base_url), url=str(request.url)
+        )
+        holder.stac_context = context
+    return context
@@ -4,16 +4,26 @@ import logging
 from datetime import datetime as datetime_type
 from datetime import timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Type, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import unquote_plus, urljoin
 
 import attr
 import orjson
 from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
 from overrides import overrides
 from pydantic import ValidationError
-from pygeofilter.backends.cql2_json import to_cql2
-from pygeofilter.parsers.cql2_text import parse as parse_cql2_text
 from stac_pydantic import Collection, Item, ItemCollection
 from stac_pydantic.links import Relations
 from stac_pydantic.shared import BBox, MimeTypes
@@ -21,12 +31,39 @@ from stac_pydantic.version import STAC_VERSION
 
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
 from stac_fastapi.core.base_settings import ApiBaseSettings
+from stac_fastapi.core.bulk import (
+    BulkItemResult,
+    bulk_results_summary,
+    raise_for_bulk_results,
+)
+from stac_fastapi.core.context import get_request_context
+from stac_fastapi.core.envelope import ENVELOPE_FIELD
+from stac_fastapi.core.etag import (
+    PreconditionFailedError,
+    if_match_version,
+    set_item_etag,
+)
+from stac_fastapi.core.extensions.count import CountMode
+from stac_fastapi.core.extents import geometry_bbox
+from stac_fastapi.core.ingest import IngestSummary
+from stac_fastapi.core.metrics import count_items
 from stac_fastapi.core.models.links import PagingLinks
+from stac_fastapi.core.patch import ItemPatch, bulk_patch_summary
+from stac_fastapi.core.profiling import get_profiler, profile_stage
 from stac_fastapi.core.serializers import CollectionSerializer, ItemSerializer
 from stac_fastapi.core.session import Session
-from stac_fastapi.core.utilities import filter_fields
+from stac_fastapi.core.streaming import (
+    NDJSON_MEDIA_TYPE,
+    raw_item_collection,
+    raw_responses_enabled,
+    stream_ndjson,
+    streaming_item_collection,
+    streaming_media_type,
+)
+from stac_fastapi.core.utilities import filter_fields, source_filter_is_complete
 from stac_fastapi.extensions.core.filter.client import AsyncBaseFiltersClient
 from stac_fastapi.extensions.third_party.bulk_transactions import (
+    AsyncBaseBulkTransactionsClient,
     BaseBulkTransactionsClient,
     BulkTransactionMethod,
     Items,
@@ -44,6 +81,16 @@ logger = logging.getLogger(__name__)
 NumType = Union[float, int]
 
 
+def validation_error_detail(error: ValidationError) -> str:
+    """Condense the errors of an invalid item into `location: message` pairs."""
+    return "; ".join(
+        ".".join(map(str, detail["loc"])) + f": {detail['msg']}"
+        if detail["loc"]
+        else detail["msg"]
+        for detail in error.errors()
+    )
+
+
 @attr.s
 class CoreClient(AsyncBaseCoreClient):
     """Client for core endpoints defined by the STAC specification.
@@ -227,7 +274,7 @@ class CoreClient(AsyncBaseCoreClient):
             A Collections object containing all the collections in the database and links to various resources.
         """
         request = kwargs["request"]
-        base_url = str(request.base_url)
+        base_url = get_request_context(request).base_url
         limit = int(request.query_params.get("limit", 10))
         token = request.query_params.get("token")
 
@@ -271,7 +318,7 @@ class CoreClient(AsyncBaseCoreClient):
         return self.collection_serializer.db_to_stac(
             collection=collection,
             request=request,
-            extensions=[type(ext).__name__ for ext in self.extensions],
+            extensions=get_request_context(request).set_extensions(self.extensions),
         )
 
     async def item_collection(
@@ -281,6 +328,7 @@ class CoreClient(AsyncBaseCoreClient):
         datetime: Optional[DateTimeType] = None,
         limit: Optional[int] = 10,
         token: Optional[str] = None,
+        count: Optional[CountMode] = None,
         **kwargs,
     ) -> stac_types.ItemCollection:
         """Read items from a specific collection in the database.
@@ -291,11 +339,14 @@ class CoreClient(AsyncBaseCoreClient):
             datetime (Optional[DateTimeType]): The datetime range to filter items by.
             limit (int): The maximum number of items to return. The default value is 10.
             token (str): A token used for pagination.
+            count (Optional[CountMode]): How to count the matched items.
             request (Request): The incoming request.
 
         Returns:
             ItemCollection: An `ItemCollection` object containing the items from the specified collection that meet
-                the filter criteria and links to various resources.
+                the filter criteria and links to various resources. A streaming response is returned instead when
+                the request accepts `application/geo+json-seq` or streaming responses are enabled, and a raw
+                response when raw responses are enabled.
 
         Raises:
             HTTPException: If the specified collection is not found.
@@ -303,25 +354,58 @@ class CoreClient(AsyncBaseCoreClient):
         """
         request: Request = kwargs["request"]
         token = request.query_params.get("token")
+        profiler = get_profiler(request)
+        if profiler:
+            profiler.handled()
 
-        base_url = str(request.base_url)
+        base_url = get_request_context(request).base_url
 
-        collection = await self.get_collection(
-            collection_id=collection_id, request=request
-        )
+        with profile_stage(profiler, "collection"):
+            collection = await self.get_collection(
+                collection_id=collection_id, request=request
+            )
         collection_id = collection.get("id")
         if collection_id is None:
             raise HTTPException(status_code=404, detail="Collection not found")
 
+        with profile_stage(profiler, "build"):
+            search = self._item_collection_search(collection_id, bbox, datetime)
+        datetime_search = self._return_date(datetime) if datetime else None
+
+        with profile_stage(profiler, "search"):
+            items, maybe_count, next_token = await self.database.execute_search(
+                search=search,
+                limit=limit,
+                sort=None,
+                token=token,  # type: ignore
+                collection_ids=[collection_id],
+                count_mode=count,
+                datetime_search=datetime_search,
+                profiler=profiler,
+            )
+
+        features = (
+            self.item_serializer.db_to_stac(item, base_url=base_url) for item in items
+        )
+        return await self._item_collection_response(
+            request, features, next_token, maybe_count
+        )
+
+    def _item_collection_search(
+        self,
+        collection_id: str,
+        bbox: Optional[BBox],
+        datetime: Optional[DateTimeType],
+    ):
+        """Build the search of the items of a collection."""
         search = self.database.make_search()
         search = self.database.apply_collections_filter(
             search=search, collection_ids=[collection_id]
         )
 
         if datetime:
-            datetime_search = self._return_date(datetime)
             search = self.database.apply_datetime_filter(
-                search=search, datetime_search=datetime_search
+                search=search, datetime_search=self._return_date(datetime)
             )
 
         if bbox:
@@ -331,27 +415,54 @@ class CoreClient(AsyncBaseCoreClient):
 
             search = self.database.apply_bbox_filter(search=search, bbox=bbox)
 
-        items, maybe_count, next_token = await self.database.execute_search(
-            search=search,
-            limit=limit,
-            sort=None,
-            token=token,  # type: ignore
-            collection_ids=[collection_id],
-        )
+        return search
 
-        items = [
-            self.item_serializer.db_to_stac(item, base_url=base_url) for item in items
-        ]
+    async def _item_collection_response(
+        self,
+        request: Request,
+        features: Iterable[stac_types.Item],
+        next_token: Optional[str],
+        maybe_count: Optional[int],
+    ):
+        """Get the response of an item search.
+
+        A streaming response is returned when the request accepts
+        `application/geo+json-seq` or streaming responses are enabled, and a raw response
+        when raw responses are enabled, unless the request asked for the profile of the
+        cluster, which is attached to a regular response.
+        """
+        features = count_items(features)
+        profiler = get_profiler(request)
+        cluster_profile = profiler.cluster_profile if profiler else None
+
+        if cluster_profile is None:
+            if media_type := streaming_media_type(request):
+                return await streaming_item_collection(
+                    request, features, next_token, maybe_count, media_type
+                )
+            if raw_responses_enabled():
+                return await raw_item_collection(
+                    request, features, next_token, maybe_count
+                )
 
-        links = await PagingLinks(request=request, next=next_token).get_links()
+        with profile_stage(profiler, "serialize"):
+            items = list(features)
 
-        return stac_types.ItemCollection(
+        with profile_stage(profiler, "links"):
+            links = await PagingLinks(request=request, next=next_token).get_links()
+
+        item_collection = stac_types.ItemCollection(
             type="FeatureCollection",
             features=items,
             links=links,
             numReturned=len(items),
             numMatched=maybe_count,
         )
+        if cluster_profile is not None:
+            item_collection["profile"] = cluster_profile  # type: ignore
+        if profiler:
+            profiler.returned()
+        return item_collection
 
     async def get_item(
         self, item_id: str, collection_id: str, **kwargs
@@ -368,11 +479,16 @@ class CoreClient(AsyncBaseCoreClient):
         Raises:
             Exception: If any error occurs while getting the item from the database.
             NotFoundError: If the item does not exist in the specified collection.
+
+        Notes:
+            The version of the item is sent in the `ETag` header of the response, for conditional updates.
         """
-        base_url = str(kwargs["request"].base_url)
-        item = await self.database.get_one_item(
+        request = kwargs["request"]
+        base_url = get_request_context(request).base_url
+        item, version = await self.database.get_one_item_version(
             item_id=item_id, collection_id=collection_id
         )
+        set_item_etag(request, version)
         return self.item_serializer.db_to_stac(item, base_url)
 
     @staticmethod
@@ -461,6 +577,7 @@ class CoreClient(AsyncBaseCoreClient):
         intersects: Optional[str] = None,
         filter: Optional[str] = None,
         filter_lang: Optional[str] = None,
+        count: Optional[CountMode] = None,
         **kwargs,
     ) -> stac_types.ItemCollection:
         """Get search results from the database.
@@ -477,6 +594,7 @@ class CoreClient(AsyncBaseCoreClient):
             sortby (Optional[str]): Sorting options for the results.
             q (Optional[List[str]]): Free text query to filter the results.
             intersects (Optional[str]): GeoJSON geometry to search in.
+            count (Optional[CountMode]): How to count the matched items.
             kwargs: Additional parameters to be passed to the API.
 
         Returns:
@@ -509,10 +627,10 @@ class CoreClient(AsyncBaseCoreClient):
 
         if filter:
             base_args["filter-lang"] = "cql2-json"
-            base_args["filter"] = orjson.loads(
-                unquote_plus(filter)
+            base_args["filter"] = (
+                orjson.loads(unquote_plus(filter))
                 if filter_lang == "cql2-json"
-                else to_cql2(parse_cql2_text(filter))
+                else self.database.filter_cache.parse_text(filter)
             )
 
         if fields:
@@ -524,6 +642,9 @@ class CoreClient(AsyncBaseCoreClient):
                     includes.add(field[1:] if field[0] in "+ " else field)
             base_args["fields"] = {"include": includes, "exclude": excludes}
 
+        if count:
+            base_args["count"] = count
+
         # Do the request
         try:
             search_request = self.post_request_model(**base_args)
@@ -535,24 +656,18 @@ class CoreClient(AsyncBaseCoreClient):
 
         return resp
 
-    async def post_search(
-        self, search_request: BaseSearchPostRequest, request: Request
-    ) -> stac_types.ItemCollection:
-        """
-        Perform a POST search on the catalog.
+    def _search_from_request(self, search_request: BaseSearchPostRequest):
+        """Build the database search for the filters of a search request.
 
         Args:
             search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
-            kwargs: Keyword arguments passed to the function.
 
         Returns:
-            ItemCollection: A collection of items matching the search criteria.
+            The search object with all of the filters of the request applied.
 
         Raises:
-            HTTPException: If there is an error with the cql2_json filter.
+            HTTPException: If there is an error with the cql2_json filter or the free text query.
         """
-        base_url = str(request.base_url)
-
         search = self.database.make_search()
 
         if search_request.ids:
@@ -565,8 +680,7 @@ class CoreClient(AsyncBaseCoreClient):
                 search=search, collection_ids=search_request.collections
             )
 
-        if search_request.datetime:
-            datetime_search = self._return_date(search_request.datetime)
+        if datetime_search := self._datetime_search_from_request(search_request):
             search = self.database.apply_datetime_filter(
                 search=search, datetime_search=datetime_search
             )
@@ -612,6 +726,92 @@ class CoreClient(AsyncBaseCoreClient):
                     status_code=400, detail=f"Error with free text query: {e}"
                 )
 
+        return search
+
+    def _datetime_search_from_request(
+        self, search_request: BaseSearchPostRequest
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Get the datetime filter of a search request.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+
+        Returns:
+            Optional[Dict[str, Optional[str]]]: The datetime filter, see `_return_date`, or None if the request
+                has no datetime.
+        """
+        if not search_request.datetime:
+            return None
+        return self._return_date(search_request.datetime)
+
+    def _bbox_from_request(
+        self, search_request: BaseSearchPostRequest
+    ) -> Optional[List[float]]:
+        """Get the 2D bbox of the spatial filter of a search request.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+
+        Returns:
+            Optional[List[float]]: The `bbox` of the request, or the bbox of its `intersects` geometry, None if
+                the request has no spatial filter.
+        """
+        if search_request.bbox:
+            bbox = list(search_request.bbox)
+            if len(bbox) == 6:
+                bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+            return bbox
+        if search_request.intersects:
+            return geometry_bbox(search_request.intersects)
+        return None
+
+    def _fields_from_request(
+        self, search_request: BaseSearchPostRequest
+    ) -> Tuple[Set[str], Set[str]]:
+        """Get the fields extension include and exclude sets of a search request.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: The fields to include and to exclude, empty when the
+            fields extension is not enabled.
+        """
+        fields = (
+            getattr(search_request, "fields", None)
+            if self.extension_is_enabled("FieldsExtension")
+            else None
+        )
+        include: Set[str] = fields.include if fields and fields.include else set()
+        exclude: Set[str] = fields.exclude if fields and fields.exclude else set()
+        return include, exclude
+
+    async def post_search(
+        self, search_request: BaseSearchPostRequest, request: Request
+    ) -> stac_types.ItemCollection:
+        """
+        Perform a POST search on the catalog.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search.
+            kwargs: Keyword arguments passed to the function.
+
+        Returns:
+            ItemCollection: A collection of items matching the search criteria. A streaming response is returned
+                instead when the request accepts `application/geo+json-seq` or streaming responses are enabled, and
+                a raw response when raw responses are enabled.
+
+        Raises:
+            HTTPException: If there is an error with the cql2_json filter.
+        """
+        base_url = get_request_context(request).base_url
+        profiler = get_profiler(request)
+        if profiler:
+            profiler.handled()
+
+        with profile_stage(profiler, "build"):
+            search = self._search_from_request(search_request)
+
         sort = None
         if search_request.sortby:
             sort = self.database.populate_sort(search_request.sortby)
@@ -620,40 +820,176 @@ class CoreClient(AsyncBaseCoreClient):
         if search_request.limit:
             limit = search_request.limit
 
-        items, maybe_count, next_token = await self.database.execute_search(
+        include, exclude = self._fields_from_request(search_request)
+
+        with profile_stage(profiler, "search"):
+            items, maybe_count, next_token = await self.database.execute_search(
+                search=search,
+                limit=limit,
+                token=search_request.token,  # type: ignore
+                sort=sort,
+                collection_ids=search_request.collections,
+                include=include,
+                exclude=exclude,
+                count_mode=getattr(search_request, "count", None),
+                datetime_search=self._datetime_search_from_request(search_request),
+                bbox=self._bbox_from_request(search_request),
+                profiler=profiler,
+            )
+
+        features = (
+            self.item_serializer.db_to_stac(item, base_url=base_url) for item in items
+        )
+        if not source_filter_is_complete(include, exclude):
+            features = (filter_fields(item, include, exclude) for item in features)
+
+        return await self._item_collection_response(
+            request, features, next_token, maybe_count
+        )
+
+    async def export_search(
+        self, search_request: BaseSearchPostRequest, request: Request
+    ) -> StreamingResponse:
+        """Export all of the items matching a search as newline delimited JSON.
+
+        Args:
+            search_request (BaseSearchPostRequest): Request object that includes the parameters for the search,
+                and the number of `slices` to read in parallel.
+            request (Request): The incoming request.
+
+        Returns:
+            StreamingResponse: One item per line, written as the items are read from the database. The `limit`
+                and `token` of the request are ignored, every matching item is exported.
+
+        Raises:
+            HTTPException: If there is an error with the cql2_json filter.
+            NotFoundError: If the searched collections do not exist.
+        """
+        base_url = get_request_context(request).base_url
+
+        search = self._search_from_request(search_request)
+
+        sort = None
+        if search_request.sortby:
+            sort = self.database.populate_sort(search_request.sortby)
+
+        include, exclude = self._fields_from_request(search_request)
+
+        items = await self.database.export_search(
             search=search,
-            limit=limit,
-            token=search_request.token,  # type: ignore
             sort=sort,
             collection_ids=search_request.collections,
+            include=include,
+            exclude=exclude,
+            slices=getattr(search_request, "slices", 1),
+            datetime_search=self._datetime_search_from_request(search_request),
+            bbox=self._bbox_from_request(search_request),
         )
 
-        fields = (
-            getattr(search_request, "fields", None)
-            if self.extension_is_enabled("FieldsExtension")
-            else None
+        features = (
+            self.item_serializer.db_to_stac(item, base_url=base_url)
+            async for item in items
         )
-        include: Set[str] = fields.include if fields and fields.include else set()
-        exclude: Set[str] = fields.exclude if fields and fields.exclude else set()
-
-        items = [
-            filter_fields(
-                self.item_serializer.db_to_stac(item, base_url=base_url),
-                include,
-                exclude,
+        if not source_filter_is_complete(include, exclude):
+            features = (
+                filter_fields(item, include, exclude) async for item in features
             )
-            for item in items
-        ]
-        links = await PagingLinks(request=request, next=next_token).get_links()
 
-        return stac_types.ItemCollection(
-            type="FeatureCollection",
-            features=items,
-            links=links,
-            numReturned=len(items),
-            numMatched=maybe_count,
+        return StreamingResponse(stream_ndjson(features), media_type=NDJSON_MEDIA_TYPE)
+
+    async def batch_search(
+        self, search_requests: List[BaseSearchPostRequest], request: Request
+    ) -> List[stac_types.ItemCollection]:
+        """Run several searches in a single round trip to the database.
+
+        Args:
+            search_requests (List[BaseSearchPostRequest]): The search requests, each with the parameters of a
+                `POST /search` request.
+            request (Request): The incoming request.
+
+        Returns:
+            List[ItemCollection]: The ItemCollection of each search, in order. The `next` link of a search
+                continues it with `POST /search`.
+
+        Raises:
+            HTTPException: If there is an error with the cql2_json filter or the free text query of a search.
+            InvalidQueryParameter: If a search is invalid.
+            NotFoundError: If the collections of a search do not exist.
+        """
+        base_url = get_request_context(request).base_url
+
+        fields = [
+            self._fields_from_request(search_request)
+            for search_request in search_requests
+        ]
+        results = await self.database.execute_searches(
+            [
+                dict(
+                    search=self._search_from_request(search_request),
+                    limit=search_request.limit or 10,
+                    token=search_request.token,  # type: ignore
+                    sort=(
+                        self.database.populate_sort(search_request.sortby)
+                        if search_request.sortby
+                        else None
+                    ),
+                    collection_ids=search_request.collections,
+                    include=include,
+                    exclude=exclude,
+                    count_mode=getattr(search_request, "count", None),
+                    datetime_search=self._datetime_search_from_request(search_request),
+                    bbox=self._bbox_from_request(search_request),
+                )
+                for search_request, (include, exclude) in zip(search_requests, fields)
+            ]
         )
 
+        item_collections = []
+        for search_request, (include, exclude), (items, maybe_count, next_token) in zip(
+            search_requests, fields, results
+        ):
+            features = [
+                self.item_serializer.db_to_stac(item, base_url=base_url)
+                for item in items
+            ]
+            if not source_filter_is_complete(include, exclude):
+                features = [filter_fields(item, include, exclude) for item in features]
+
+            links = [
+                {
+                    "rel": Relations.root.value,
+                    "type": MimeTypes.json.value,
+                    "href": base_url,
+                }
+            ]
+            if next_token:
+                links.append(
+                    {
+                        "rel": Relations.next.value,
+                        "type": MimeTypes.json.value,
+                        "method": "POST",
+                        "href": urljoin(base_url, "search"),
+                        "body": {
+                            **search_request.model_dump(
+                                mode="json", by_alias=True, exclude_none=True
+                            ),
+                            "token": next_token,
+                        },
+                    }
+                )
+
+            item_collections.append(
+                stac_types.ItemCollection(
+                    type="FeatureCollection",
+                    features=features,
+                    links=links,
+                    numReturned=len(features),
+                    numMatched=maybe_count,
+                )
+            )
+
+        return item_collections
+
 
 @attr.s
 class TransactionsClient(AsyncBaseTransactionsClient):
@@ -679,24 +1015,33 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         Raises:
             NotFound: If the specified collection is not found in the database.
-            ConflictError: If the item in the specified collection already exists.
+            ConflictError: If the item in the specified collection already exists. For a feature collection, if
+                any of the items already exists, the other items being added.
+            DatabaseError: If any item of a feature collection could not be added, the other items being added.
 
         """
         item = item.model_dump(mode="json")
-        base_url = str(kwargs["request"].base_url)
+        base_url = get_request_context(kwargs["request"]).base_url
 
         # If a feature collection is posted
         if item["type"] == "FeatureCollection":
-            bulk_client = BulkTransactionsClient(
-                database=self.database, settings=self.settings
-            )
+            features = item["features"]
+            for feature_collection_id in {
+                feature["collection"] for feature in features
+            }:
+                await self.database.check_collection_exists(feature_collection_id)
             processed_items = [
-                bulk_client.preprocess_item(item, base_url, BulkTransactionMethod.INSERT) for item in item["features"]  # type: ignore
+                self.database.item_serializer.stac_to_db(feature, base_url)
+                for feature in features
             ]
 
-            await self.database.bulk_async(
-                collection_id, processed_items, refresh=kwargs.get("refresh", False)
+            results = await self.database.bulk_async(
+                collection_id,
+                processed_items,
+                refresh=kwargs.get("refresh", False),
+                exist_ok=False,
             )
+            raise_for_bulk_results(results)
 
             return None
         else:
@@ -720,20 +1065,156 @@ class TransactionsClient(AsyncBaseTransactionsClient):
             stac_types.Item: The updated item object.
 
         Raises:
-            NotFound: If the specified collection is not found in the database.
-
+            NotFound: If the specified collection or item is not found in the database.
+            HTTPException: If the id or the collection of the item don't match the path.
+            PreconditionFailedError: If the item is not at the version of the `If-Match` header.
+
+        Notes:
+            The item is replaced in place with a single write, which fails if it does not exist. With an
+            `If-Match` header holding the `ETag` of the item, the write is only applied if the item was not
+            modified since. The new version of the item is sent in the `ETag` header of the response.
         """
         item = item.model_dump(mode="json")
-        base_url = str(kwargs["request"].base_url)
+        request = kwargs["request"]
+        base_url = get_request_context(request).base_url
         now = datetime_type.now(timezone.utc).isoformat().replace("+00:00", "Z")
         item["properties"]["updated"] = now
 
+        item["collection"] = item.get("collection") or collection_id
+        if item["id"] != item_id or item["collection"] != collection_id:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Item {item['id']} in collection {item['collection']} does not match "
+                f"the path item {item_id} in collection {collection_id}",
+            )
+
+        await self.database.check_collection_exists(collection_id)
+        version = await self.database.update_item(
+            self.database.item_serializer.stac_to_db(item, base_url),
+            refresh=kwargs.get("refresh", False),
+            version=if_match_version(request),
+        )
+        set_item_etag(request, version)
+
+        return ItemSerializer.db_to_stac(item, base_url)
+
+    async def patch_item(
+        self, collection_id: str, item_id: str, patch: ItemPatch, **kwargs
+    ) -> stac_types.Item:
+        """Apply a JSON Merge Patch or a JSON Patch to an item.
+
+        Args:
+            collection_id (str): The ID of the collection the item belongs to.
+            item_id (str): The ID of the item to be patched.
+            patch (ItemPatch): The patch.
+            kwargs: Other optional arguments, including the request object.
+
+        Returns:
+            stac_types.Item: The patched item.
+
+        Raises:
+            NotFoundError: If the collection or the item does not exist.
+            ConflictError: If the patch can't be applied to the item.
+            PreconditionFailedError: If the item is not at the version of the `If-Match` header.
+            HTTPException: If the patched item is not a valid item.
+
+        Notes:
+            A patch writing values valid on their own to the fields of the properties and the
+            assets is applied in the database with a single `_update` request, and sets
+            `properties.updated`. The other patches, e.g. of the geometry or the datetime, are
+            applied to the item read from the database instead, and the patched item is
+            validated and written back, conditional on the version read.
+        """
+        request = kwargs["request"]
+        base_url = get_request_context(request).base_url
+        now = datetime_type.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        version = if_match_version(request)
+        refresh = kwargs.get("refresh", False)
+
         await self.database.check_collection_exists(collection_id)
-        await self.delete_item(item_id=item_id, collection_id=collection_id)
-        await self.create_item(collection_id=collection_id, item=Item(**item), **kwargs)
+        if patch.in_place_error() is None:
+            item, version = await self.database.patch_item(
+                collection_id,
+                item_id,
+                patch,
+                updated=now,
+                refresh=refresh,
+                version=version,
+            )
+            set_item_etag(request, version)
+            return ItemSerializer.db_to_stac(item, base_url)
 
+        item, current_version = await self.database.get_one_item_version(
+            collection_id, item_id
+        )
+        if version is not None and version != current_version:
+            raise PreconditionFailedError(
+                f"Item {item_id} in collection {collection_id} is not at version {version.etag}"
+            )
+        item.pop(ENVELOPE_FIELD, None)
+        try:
+            item = Item.model_validate(patch.apply(item)).model_dump(mode="json")
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"The patched item is invalid: {validation_error_detail(e)}",
+            )
+        item["properties"]["updated"] = now
+
+        version = await self.database.update_item(
+            self.database.item_serializer.stac_to_db(item, base_url),
+            refresh=refresh,
+            version=current_version,
+        )
+        set_item_etag(request, version)
         return ItemSerializer.db_to_stac(item, base_url)
 
+    async def bulk_patch_items(
+        self, collection_id: str, patches: Dict[str, ItemPatch], **kwargs
+    ) -> Dict[str, Any]:
+        """Apply patches to many items of a collection.
+
+        Args:
+            collection_id (str): The ID of the collection the items belong to.
+            patches (Dict[str, ItemPatch]): The patches by item id.
+            kwargs: Other optional arguments, including the request object.
+
+        Returns:
+            Dict[str, Any]: The number of items patched and failed, and the reason of each failure.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+
+        Notes:
+            The patches are applied in the database in bulk, where the items are not validated,
+            so the patches that can't be applied in place are rejected: patch those items one
+            by one.
+        """
+        now = datetime_type.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        await self.database.check_collection_exists(collection_id)
+
+        rejected = {
+            item_id: BulkItemResult(id=item_id, status=400, error=error)
+            for item_id, patch in patches.items()
+            if (error := patch.in_place_error())
+        }
+        patches = {
+            item_id: patch
+            for item_id, patch in patches.items()
+            if item_id not in rejected
+        }
+        results = (
+            await self.database.bulk_patch_items(
+                collection_id,
+                patches,
+                updated=now,
+                refresh=kwargs.get("refresh", False),
+            )
+            if patches
+            else []
+        )
+        return bulk_patch_summary(list(rejected.values()) + results)
+
     @overrides
     async def delete_item(
         self, item_id: str, collection_id: str, **kwargs
@@ -773,7 +1254,9 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         return CollectionSerializer.db_to_stac(
             collection,
             request,
-            extensions=[type(ext).__name__ for ext in self.database.extensions],
+            extensions=get_request_context(request).set_extensions(
+                self.database.extensions
+            ),
         )
 
     @overrides
@@ -811,7 +1294,9 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         return CollectionSerializer.db_to_stac(
             collection,
             request,
-            extensions=[type(ext).__name__ for ext in self.database.extensions],
+            extensions=get_request_context(request).set_extensions(
+                self.database.extensions
+            ),
         )
 
     @overrides
@@ -884,27 +1369,171 @@ class BulkTransactionsClient(BaseBulkTransactionsClient):
             **kwargs: Additional keyword arguments, such as `request` and `refresh`.
 
         Returns:
-            A string indicating the number of items successfully added.
+            A string indicating the number of items successfully added, and the reason of each item that could
+            not be added, e.g. because it already exists with the `insert` method.
+
+        Notes:
+            The collections of the items are checked once, and the existence of the items is enforced by the bulk
+            request itself rather than checked item by item.
         """
         request = kwargs.get("request")
         if request:
-            base_url = str(request.base_url)
+            base_url = get_request_context(request).base_url
         else:
             base_url = ""
 
+        for collection_id in {item["collection"] for item in items.items.values()}:
+            self.database.sync_check_collection_exists(collection_id)
+
         processed_items = [
-            self.preprocess_item(item, base_url, items.method)
+            self.database.item_serializer.stac_to_db(item, base_url)
             for item in items.items.values()
         ]
 
         # not a great way to get the collection_id-- should be part of the method signature
         collection_id = processed_items[0]["collection"]
 
-        self.database.bulk_sync(
-            collection_id, processed_items, refresh=kwargs.get("refresh", False)
+        results = self.database.bulk_sync(
+            collection_id,
+            processed_items,
+            refresh=kwargs.get("refresh", False),
+            exist_ok=items.method == BulkTransactionMethod.UPSERT,
         )
 
-        return f"Successfully added {len(processed_items)} Items."
+        return bulk_results_summary(results)
+
+
+@attr.s
+class AsyncBulkTransactionsClient(AsyncBaseBulkTransactionsClient):
+    """A client for posting bulk transactions on the event loop of the API.
+
+    The items are written with the asynchronous client of the searches, in chunks of the
+    `bulk_options` of the database, several chunks being in flight at the same time.
+
+    Attributes:
+        session: An instance of `Session` to use for database connection.
+        database: An instance of `DatabaseLogic` to perform database operations.
+    """
+
+    database: BaseDatabaseLogic = attr.ib()
+    settings: ApiBaseSettings = attr.ib()
+    session: Session = attr.ib(default=attr.Factory(Session.create_from_env))
+
+    @overrides
+    async def bulk_item_insert(self, items: Items, **kwargs) -> str:
+        """Perform a bulk insertion of items into the database.
+
+        Args:
+            items: The items to insert.
+            **kwargs: Additional keyword arguments, such as `request` and `refresh`.
+
+        Returns:
+            A string indicating the number of items successfully added, and the reason of each item that could
+            not be added, e.g. because it already exists with the `insert` method.
+        """
+        request = kwargs.get("request")
+        if request:
+            base_url = get_request_context(request).base_url
+        else:
+            base_url = ""
+
+        for collection_id in {item["collection"] for item in items.items.values()}:
+            await self.database.check_collection_exists(collection_id)
+
+        processed_items = [
+            self.database.item_serializer.stac_to_db(item, base_url)
+            for item in items.items.values()
+        ]
+
+        # not a great way to get the collection_id-- should be part of the method signature
+        collection_id = processed_items[0]["collection"]
+
+        results = await self.database.bulk_async(
+            collection_id,
+            processed_items,
+            refresh=kwargs.get("refresh", False),
+            exist_ok=items.method == BulkTransactionMethod.UPSERT,
+        )
+
+        return bulk_results_summary(results)
+
+    async def ndjson_item_insert(
+        self,
+        collection_id: str,
+        lines: AsyncIterable[Tuple[int, bytes]],
+        method: BulkTransactionMethod = BulkTransactionMethod.INSERT,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Insert the items of a stream of newline delimited JSON lines.
+
+        Args:
+            collection_id: The id of the collection of the items.
+            lines: The numbered lines of the items, see `ndjson_lines`.
+            method: `insert` to only write new items, `upsert` to overwrite the existing items.
+            **kwargs: Additional keyword arguments, such as `request` and `refresh`.
+
+        Returns:
+            The number of items added and failed, and the reason of the first failures.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+
+        Notes:
+            The items are validated, prepared and written as the lines arrive, in batches of
+            `chunk_size * max_concurrency` items of the `bulk_options` of the database. An invalid
+            line is reported as a failure, the other items being written.
+        """
+        request = kwargs.get("request")
+        if request:
+            base_url = get_request_context(request).base_url
+        else:
+            base_url = ""
+
+        await self.database.check_collection_exists(collection_id)
+
+        bulk_options = self.database.bulk_options
+        batch_size = bulk_options.chunk_size * bulk_options.max_concurrency
+        exist_ok = method == BulkTransactionMethod.UPSERT
+        summary = IngestSummary()
+        batch: List[stac_types.Item] = []
+        batch_lines: List[int] = []
+
+        async def write_batch() -> None:
+            results = await self.database.bulk_async(
+                collection_id,
+                batch,
+                refresh=kwargs.get("refresh", False),
+                exist_ok=exist_ok,
+            )
+            summary.add_results(batch_lines, results)
+            batch.clear()
+            batch_lines.clear()
+
+        async for line_number, line in lines:
+            try:
+                item = Item.model_validate_json(line).model_dump(mode="json")
+            except ValidationError as e:
+                summary.add_error(line_number, None, validation_error_detail(e))
+                continue
+
+            item["collection"] = item.get("collection") or collection_id
+            if item["collection"] != collection_id:
+                summary.add_error(
+                    line_number,
+                    item["id"],
+                    f"Item collection {item['collection']} does not match {collection_id}",
+                )
+                continue
+
+            batch.append(self.database.item_serializer.stac_to_db(item, base_url))
+            batch_lines.append(line_number)
+            if len(batch) >= batch_size:
+                await write_batch()
+
+        if batch:
+            await write_batch()
+
+        return summary.to_dict()
 
 
 @attr.s
@@ -0,0 +1,87 @@
+"""Indexed bbox envelopes of the items.
+
+With envelope filtering enabled, the `bbox` of every item is also stored as an indexed
+envelope shape, and the bbox filter of searches intersects the envelopes instead of the
+full footprint geometries, which is cheaper for complex footprints.
+"""
+
+import os
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+
+ENVELOPE_FIELD = "bbox_envelope"
+
+ENVELOPE_MAPPING = {"type": "geo_shape"}
+
+# computes the envelope of the items indexed without one, see `bbox_envelope`
+ENVELOPE_SCRIPT = f"""
+def b = ctx._source.bbox;
+if (b == null || (b.size() != 4 && b.size() != 6)) {{
+    ctx.op = 'noop';
+    return;
+}}
+int n = b.size() / 2;
+ctx._source.{ENVELOPE_FIELD} = [
+    'type': 'envelope',
+    'coordinates': [[b[0], b[n + 1]], [b[n], b[1]]]
+];
+"""
+
+
+class BBoxFilterMode(str, Enum):
+    """How the bbox filter of searches is applied."""
+
+    # intersect the item geometries
+    GEOMETRY = "geometry"
+    # intersect the item bbox envelopes
+    ENVELOPE = "envelope"
+    # intersect the item bbox envelopes, then their geometries
+    EXACT = "exact"
+
+
+def get_bbox_filter_mode() -> BBoxFilterMode:
+    """Get the bbox filter mode from the `STAC_FASTAPI_BBOX_FILTER` environment variable.
+
+    Returns:
+        BBoxFilterMode: The bbox filter mode, `geometry` if the variable is not set.
+
+    Raises:
+        ValueError: If the variable is not a valid bbox filter mode.
+    """
+    mode = os.getenv("STAC_FASTAPI_BBOX_FILTER") or BBoxFilterMode.GEOMETRY.value
+    try:
+        return BBoxFilterMode(mode.lower())
+    except ValueError:
+        raise ValueError(
+            f"Invalid STAC_FASTAPI_BBOX_FILTER '{mode}', "
+            f"must be one of {[mode.value for mode in BBoxFilterMode]}"
+        )
+
+
+def envelope_coordinates(bbox: Sequence[float]) -> List[List[float]]:
+    """Get the envelope coordinates of a 2D or 3D bbox.
+
+    Args:
+        bbox (Sequence[float]): The bbox, [minx, miny, maxx, maxy] or
+            [minx, miny, minz, maxx, maxy, maxz].
+
+    Returns:
+        List[List[float]]: The upper left and lower right corners of the envelope.
+    """
+    n = len(bbox) // 2
+    return [[bbox[0], bbox[n + 1]], [bbox[n], bbox[1]]]
+
+
+def bbox_envelope(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Get the envelope shape of the bbox of an item.
+
+    Args:
+        item (Dict[str, Any]): The item.
+
+    Returns:
+        Optional[Dict[str, Any]]: The envelope shape, None if the item has no valid bbox.
+    """
+    bbox = item.get("bbox")
+    if not bbox or len(bbox) not in (4, 6):
+        return None
+    return {"type": "envelope", "coordinates": envelope_coordinates(bbox)}
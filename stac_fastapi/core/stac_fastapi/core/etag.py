@@ -0,0 +1,156 @@
+"""Versions of the items, for conditional updates.
+
+The version of an item is its `_seq_no` and `_primary_term` in Elasticsearch/OpenSearch,
+sent to clients in an `ETag` header. An update with an `If-Match` header is only applied
+if the item is still at that version, so that concurrent writers don't overwrite each
+other's changes.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+import attr
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from stac_fastapi.api.errors import exception_handler_factory
+from stac_fastapi.types.errors import StacApiError
+
+STATE_KEY = "stac_item_etag"
+
+# replaces an item in an `_update` request, which fails if the item does not exist
+REPLACE_SCRIPT = "ctx._source.clear(); ctx._source.putAll(params.item);"
+
+ETAG_PATTERN = re.compile(r'^"(\d+)-(\d+)"$')
+
+
+class PreconditionFailedError(StacApiError):
+    """The item is not at the version of the `If-Match` header."""
+
+    pass
+
+
+@attr.s(frozen=True)
+class ItemVersion:
+    """The version of an item.
+
+    Attributes:
+        seq_no (int): The `_seq_no` of the item document.
+        primary_term (int): The `_primary_term` of the item document.
+    """
+
+    seq_no: int = attr.ib()
+    primary_term: int = attr.ib()
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> Optional["ItemVersion"]:
+        """Read the version of a get, search hit or index response, None if it is missing."""
+        # not `get`, the Elasticsearch responses are not dictionaries
+        if "_seq_no" not in response or "_primary_term" not in response:
+            return None
+        return cls(seq_no=response["_seq_no"], primary_term=response["_primary_term"])
+
+    @classmethod
+    def from_etag(cls, etag: str) -> Optional["ItemVersion"]:
+        """Read the version of an `ETag`, None if it is not an item version."""
+        match = ETAG_PATTERN.match(etag.strip())
+        if match is None:
+            return None
+        return cls(seq_no=int(match.group(1)), primary_term=int(match.group(2)))
+
+    @property
+    def etag(self) -> str:
+        """Get the `ETag` of the version."""
+        return f'"{self.seq_no}-{self.primary_term}"'
+
+    def index_params(self) -> Dict[str, int]:
+        """Get the parameters of a write applied only to this version."""
+        return {"if_seq_no": self.seq_no, "if_primary_term": self.primary_term}
+
+
+def replace_script(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the script of an `_update` request replacing an item.
+
+    Args:
+        item (Dict[str, Any]): The new item.
+
+    Returns:
+        Dict[str, Any]: The script.
+    """
+    return {"source": REPLACE_SCRIPT, "lang": "painless", "params": {"item": item}}
+
+
+def if_match_version(request: Any) -> Optional[ItemVersion]:
+    """Get the version required by the `If-Match` header of a request.
+
+    Args:
+        request (Any): The request.
+
+    Returns:
+        Optional[ItemVersion]: The version, None if the request has no `If-Match` header
+        or accepts any version with `*`.
+
+    Raises:
+        PreconditionFailedError: If the header is not a single item version, which no
+            item can match.
+    """
+    headers = getattr(request, "headers", None) or {}
+    if_match = headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    version = ItemVersion.from_etag(if_match)
+    if version is None:
+        raise PreconditionFailedError(
+            f"If-Match {if_match} is not the ETag of an item version"
+        )
+    return version
+
+
+def set_item_etag(request: Any, version: Optional[ItemVersion]) -> None:
+    """Send the version of an item in the `ETag` header of the response.
+
+    Args:
+        request (Any): The request.
+        version (Optional[ItemVersion]): The version of the item, if known.
+    """
+    state = getattr(request, "state", None)
+    if state is not None and version is not None:
+        setattr(state, STATE_KEY, version.etag)
+
+
+class ETagMiddleware:
+    """Add the `ETag` set by `set_item_etag` to the response."""
+
+    def __init__(self, app: ASGIApp):
+        """Create the middleware.
+
+        Args:
+            app (ASGIApp): The application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add the `ETag` of an HTTP request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                etag = scope.get("state", {}).get(STATE_KEY)
+                if etag is not None:
+                    MutableHeaders(scope=message)["ETag"] = etag
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def setup_etags(app: FastAPI) -> None:
+    """Set up the `ETag` headers of the items and the `If-Match` errors.
+
+    Args:
+        app (FastAPI): The application.
+    """
+    app.add_exception_handler(PreconditionFailedError, exception_handler_factory(412))
+    app.add_middleware(ETagMiddleware)
@@ -1,5 +1,20 @@
 """elasticsearch extensions modifications."""
 
+from .batch import BatchSearchExtension
+from .count import CountExtension, CountMode
+from .export import ExportExtension
+from .ingest import IngestExtension
+from .patch import PatchExtension
 from .query import Operator, QueryableTypes, QueryExtension
 
-__all__ = ["Operator", "QueryableTypes", "QueryExtension"]
+__all__ = [
+    "BatchSearchExtension",
+    "CountExtension",
+    "CountMode",
+    "ExportExtension",
+    "IngestExtension",
+    "Operator",
+    "PatchExtension",
+    "QueryableTypes",
+    "QueryExtension",
+]
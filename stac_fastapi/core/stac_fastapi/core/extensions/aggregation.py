@@ -8,14 +8,13 @@ from urllib.parse import unquote_plus, urljoin
 import attr
 import orjson
 from fastapi import HTTPException, Path, Request
-from pygeofilter.backends.cql2_json import to_cql2
-from pygeofilter.parsers.cql2_text import parse as parse_cql2_text
 from stac_pydantic.shared import BBox
 from typing_extensions import Annotated
 
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
 from stac_fastapi.core.base_settings import ApiBaseSettings
 from stac_fastapi.core.datetime_utils import datetime_to_str
+from stac_fastapi.core.extents import geometry_bbox
 from stac_fastapi.core.session import Session
 from stac_fastapi.extensions.core.aggregation.client import AsyncBaseAggregationClient
 from stac_fastapi.extensions.core.aggregation.request import (
@@ -298,7 +297,7 @@ class EsAsyncAggregationClient(AsyncBaseAggregationClient):
     def get_filter(self, filter, filter_lang):
         """Format the filter parameter in cql2-json or cql2-text."""
         if filter_lang == "cql2-text":
-            return orjson.loads(to_cql2(parse_cql2_text(filter)))
+            return self.database.filter_cache.parse_text(filter)
         elif filter_lang == "cql2-json":
             if isinstance(filter, str):
                 return orjson.loads(unquote_plus(filter))
@@ -417,23 +416,27 @@ class EsAsyncAggregationClient(AsyncBaseAggregationClient):
                 search=search, item_ids=aggregate_request.ids
             )
 
+        datetime_search = None
         if aggregate_request.datetime:
             datetime_search = self._return_date(aggregate_request.datetime)
             search = self.database.apply_datetime_filter(
                 search=search, datetime_search=datetime_search
             )
 
+        search_bbox = None
         if aggregate_request.bbox:
             bbox = aggregate_request.bbox
             if len(bbox) == 6:
                 bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
 
             search = self.database.apply_bbox_filter(search=search, bbox=bbox)
+            search_bbox = list(bbox)
 
         if aggregate_request.intersects:
             search = self.database.apply_intersects_filter(
                 search=search, intersects=aggregate_request.intersects
             )
+            search_bbox = search_bbox or geometry_bbox(aggregate_request.intersects)
 
         if aggregate_request.collections:
             search = self.database.apply_collections_filter(
@@ -520,6 +523,8 @@ class EsAsyncAggregationClient(AsyncBaseAggregationClient):
                 geometry_geohash_grid_precision,
                 geometry_geotile_grid_precision,
                 datetime_frequency_interval,
+                datetime_search=datetime_search,
+                bbox=search_bbox,
             )
         except Exception as error:
             if not isinstance(error, IndexError):
@@ -0,0 +1,69 @@
+"""Batch search extension.
+
+Adds `POST /search/batch`, which runs an array of searches in a single round trip to the
+database instead of one `/search` request per search.
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Type
+
+import attr
+from fastapi import APIRouter, Body, FastAPI
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.search import BaseSearchPostRequest
+
+if TYPE_CHECKING:
+    from stac_fastapi.core.core import CoreClient
+
+
+@attr.s
+class BatchSearchExtension(ApiExtension):
+    """Run several item searches at once.
+
+    The batch endpoint takes an array of `POST /search` bodies, and returns the
+    ItemCollection of each search, in order:
+        POST /search/batch
+
+    Attributes:
+        client: The core client, which implements `batch_search`.
+        search_post_request_model: The POST request model of `/search`.
+        max_searches: The maximum number of searches of a batch.
+    """
+
+    client: "CoreClient" = attr.ib()
+    search_post_request_model: Type[BaseModel] = attr.ib(default=BaseSearchPostRequest)
+    max_searches: int = attr.ib(default=100)
+
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        search_model = self.search_post_request_model
+
+        async def batch_search(
+            request: Request,
+            searches: List[search_model] = Body(  # type: ignore
+                ..., min_length=1, max_length=self.max_searches
+            ),
+        ):
+            return await self.client.batch_search(searches, request=request)
+
+        self.router.prefix = app.state.router_prefix
+        self.router.add_api_route(
+            name="Batch Search",
+            path="/search/batch",
+            methods=["POST"],
+            endpoint=batch_search,
+        )
+        app.include_router(self.router, tags=["Batch Search Extension"])
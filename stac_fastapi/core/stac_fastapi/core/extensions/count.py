@@ -0,0 +1,121 @@
+"""Count extension.
+
+Lets a deployment, and each search request, choose how the number of matched items
+(`numMatched`) is computed.
+"""
+
+import os
+from enum import Enum
+from typing import List, Optional, Union
+
+import attr
+from fastapi import FastAPI, Query
+from pydantic import BaseModel
+from typing_extensions import Annotated
+
+from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.search import APIRequest
+
+
+class CountMode(str, Enum):
+    """Strategies to count the items matched by a search.
+
+    - `exact`: the search tracks the exact number of hits.
+    - `bounded`: the search tracks hits up to `STAC_FASTAPI_COUNT_BOUND`, and
+      `numMatched` is only returned when the total stays below that bound.
+    - `off`: hits are not counted and `numMatched` is not returned.
+    """
+
+    EXACT = "exact"
+    BOUNDED = "bounded"
+    OFF = "off"
+
+
+def get_count_mode() -> CountMode:
+    """Get the deployment count mode from the `STAC_FASTAPI_COUNT_MODE` environment variable.
+
+    Returns:
+        CountMode: The count mode, `exact` if the variable is not set.
+
+    Raises:
+        ValueError: If the variable is not a valid count mode.
+    """
+    count_mode = os.getenv("STAC_FASTAPI_COUNT_MODE") or CountMode.EXACT.value
+    try:
+        return CountMode(count_mode.lower())
+    except ValueError:
+        raise ValueError(
+            f"Invalid STAC_FASTAPI_COUNT_MODE '{count_mode}', "
+            f"must be one of {[mode.value for mode in CountMode]}"
+        )
+
+
+def get_count_bound() -> int:
+    """Get the count bound from the `STAC_FASTAPI_COUNT_BOUND` environment variable.
+
+    Returns:
+        int: The maximum number of hits counted in `bounded` mode, 10000 by default.
+
+    Raises:
+        ValueError: If the variable is not a positive integer.
+    """
+    count_bound = os.getenv("STAC_FASTAPI_COUNT_BOUND") or "10000"
+    if not count_bound.isdigit() or int(count_bound) < 1:
+        raise ValueError(
+            f"Invalid STAC_FASTAPI_COUNT_BOUND '{count_bound}', must be a positive integer"
+        )
+    return int(count_bound)
+
+
+def track_total_hits(count_mode: Optional[CountMode] = None) -> Union[bool, int]:
+    """Get the `track_total_hits` search parameter for a count mode.
+
+    Args:
+        count_mode (Optional[CountMode]): The count mode of the request. Defaults to
+            the deployment count mode, see `get_count_mode`.
+
+    Returns:
+        Union[bool, int]: `True` to count every hit, `False` to skip counting, or the
+        number of hits to count up to.
+    """
+    count_mode = count_mode or get_count_mode()
+    if count_mode == CountMode.OFF:
+        return False
+    if count_mode == CountMode.BOUNDED:
+        return get_count_bound()
+    return True
+
+
+@attr.s
+class CountExtensionGetRequest(APIRequest):
+    """Count mode query parameter for GET requests."""
+
+    count: Annotated[Optional[CountMode], Query()] = attr.ib(default=None)
+
+
+class CountExtensionPostRequest(BaseModel):
+    """Count mode field for POST requests."""
+
+    count: Optional[CountMode] = None
+
+
+@attr.s
+class CountExtension(ApiExtension):
+    """Add a `count` parameter to item searches to override the count mode."""
+
+    GET = CountExtensionGetRequest
+    POST = CountExtensionPostRequest
+
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        pass
@@ -0,0 +1,78 @@
+"""Export extension.
+
+Adds `POST /search/export`, which streams every item matching a search as newline
+delimited JSON instead of paginating through `/search`.
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Type
+
+import attr
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel, Field
+
+from stac_fastapi.api.models import create_request_model
+from stac_fastapi.api.routes import create_async_endpoint
+from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.search import BaseSearchPostRequest
+
+if TYPE_CHECKING:
+    from stac_fastapi.core.core import CoreClient
+
+
+class ExportExtensionPostRequest(BaseModel):
+    """Export specific fields of the POST request."""
+
+    # 1024 is the default index.max_slices_per_pit of Elasticsearch
+    slices: int = Field(
+        1,
+        ge=1,
+        le=1024,
+        description="Number of slices of the results read in parallel.",
+    )
+
+
+@attr.s
+class ExportExtension(ApiExtension):
+    """Export all of the items matching a search.
+
+    The export endpoint takes the same body as `POST /search`, plus the number of
+    `slices` to read in parallel, and returns every matching item without a page limit:
+        POST /search/export
+
+    Attributes:
+        client: The core client, which implements `export_search`.
+        search_post_request_model: The POST request model of `/search`.
+    """
+
+    POST = ExportExtensionPostRequest
+
+    client: "CoreClient" = attr.ib()
+    search_post_request_model: Type[BaseModel] = attr.ib(default=BaseSearchPostRequest)
+
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        request_model = create_request_model(
+            "ExportPostRequest",
+            base_model=self.search_post_request_model,
+            mixins=[self.POST],
+            request_type="POST",
+        )
+        self.router.prefix = app.state.router_prefix
+        self.router.add_api_route(
+            name="Export Search",
+            path="/search/export",
+            methods=["POST"],
+            endpoint=create_async_endpoint(self.client.export_search, request_model),
+        )
+        app.include_router(self.router, tags=["Export Extension"])
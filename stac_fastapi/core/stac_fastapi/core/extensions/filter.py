@@ -15,7 +15,7 @@
 
 import re
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 _cql2_like_patterns = re.compile(r"\\.|[%_]|\\$")
 _valid_like_substitutions = {
@@ -200,3 +200,124 @@ def to_es(query: Dict[str, Any]) -> Dict[str, Any]:
         return {"geo_shape": {field: {"shape": geometry, "relation": "intersects"}}}
 
     return {}
+
+
+_BOOL_CLAUSES = ("must", "filter", "should", "must_not")
+_LOWER_BOUNDS = {"gt", "gte"}
+_UPPER_BOUNDS = {"lt", "lte"}
+
+
+def _clause_list(clauses: Any) -> List[Dict[str, Any]]:
+    """Get the clauses of a `bool` occurrence, which can be a single query or a list."""
+    return clauses if isinstance(clauses, list) else [clauses]
+
+
+def _merge_ranges(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge the `range` queries on the same field of a conjunction into one range.
+
+    Ranges are only merged when they bound opposite ends, e.g. `gte` with `lt`, so that
+    no bound has to be picked over another.
+    """
+    merged: List[Dict[str, Any]] = []
+    ranges: Dict[str, Dict[str, Any]] = {}
+    for query in queries:
+        if list(query) == ["range"] and len(query["range"]) == 1:
+            ((field, bounds),) = query["range"].items()
+            previous = ranges.get(field)
+            if (
+                previous is not None
+                and set(previous) | set(bounds) <= _LOWER_BOUNDS | _UPPER_BOUNDS
+                and len((set(previous) | set(bounds)) & _LOWER_BOUNDS) <= 1
+                and len((set(previous) | set(bounds)) & _UPPER_BOUNDS) <= 1
+                and not set(previous) & set(bounds)
+            ):
+                previous.update(bounds)
+                continue
+            query = {"range": {field: dict(bounds)}}
+            ranges[field] = query["range"][field]
+        merged.append(query)
+    return merged
+
+
+def optimize(query: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Simplify an Elasticsearch query built by `to_es`, without changing the matched documents.
+
+    - `must` clauses are moved to the non-scoring `filter` context, which the shard
+      request cache can reuse.
+    - Nested conjunctions and disjunctions are flattened into their parent, e.g.
+      `a AND (b AND c)` becomes a single `bool` with three filters.
+    - A disjunction of a single query is replaced by the query.
+    - The ranges of a conjunction on the same field are merged into one range.
+    - A `terms` query with a single value is replaced by a `term` query.
+
+    Args:
+        query (Dict[str, Any]): The Elasticsearch query.
+
+    Returns:
+        Dict[str, Any]: The simplified query.
+    """
+    if "terms" in query and len(query) == 1 and len(query["terms"]) == 1:
+        ((field, values),) = query["terms"].items()
+        if isinstance(values, list) and len(values) == 1:
+            return {"term": {field: values[0]}}
+        return query
+
+    if list(query) != ["bool"] or not set(query["bool"]) <= set(_BOOL_CLAUSES):
+        return query
+
+    clauses: Dict[str, List[Dict[str, Any]]] = {}
+    for occur, sub_queries in query["bool"].items():
+        clauses.setdefault("filter" if occur == "must" else occur, []).extend(
+            optimize(sub_query) for sub_query in _clause_list(sub_queries)
+        )
+
+    if "should" in clauses:
+        if len(clauses) > 1:
+            return {"bool": clauses}
+        # a bool of should clauses only matches any of them
+        should: List[Dict[str, Any]] = []
+        for sub_query in clauses["should"]:
+            if list(sub_query) == ["bool"] and list(sub_query["bool"]) == ["should"]:
+                should.extend(sub_query["bool"]["should"])
+            else:
+                should.append(sub_query)
+        if len(should) == 1:
+            return should[0]
+        return {"bool": {"should": should}}
+
+    # a conjunction: the filter and must_not clauses of nested conjunctions are lifted
+    filters: List[Dict[str, Any]] = []
+    must_not: List[Dict[str, Any]] = []
+    for sub_query in clauses.get("filter", []):
+        if list(sub_query) == ["bool"] and "should" not in sub_query["bool"]:
+            filters.extend(sub_query["bool"].get("filter", []))
+            must_not.extend(sub_query["bool"].get("must_not", []))
+        else:
+            filters.append(sub_query)
+    for sub_query in clauses.get("must_not", []):
+        # NOT (a OR b) is NOT a AND NOT b
+        if list(sub_query) == ["bool"] and list(sub_query["bool"]) == ["should"]:
+            must_not.extend(sub_query["bool"]["should"])
+        else:
+            must_not.append(sub_query)
+
+    optimized: Dict[str, List[Dict[str, Any]]] = {}
+    if filters:
+        optimized["filter"] = _merge_ranges(filters)
+    if must_not:
+        optimized["must_not"] = must_not
+    return {"bool": optimized}
+
+
+def to_es_filter(query: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Transform a CQL2 query to an optimized Elasticsearch query, for the filter context.
+
+    Args:
+        query (Dict[str, Any]): The query dictionary containing 'op' and 'args'.
+
+    Returns:
+        Dict[str, Any]: The Elasticsearch query, see `to_es` and `optimize`.
+    """
+    return optimize(to_es(query))
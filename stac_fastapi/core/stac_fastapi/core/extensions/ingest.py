@@ -0,0 +1,83 @@
+"""Ingest extension.
+
+Adds `POST /collections/{collection_id}/ingest`, which inserts the items of a newline
+delimited JSON body as it is streamed, instead of parsing a whole FeatureCollection.
+"""
+
+from typing import TYPE_CHECKING, List, Optional
+
+import attr
+from fastapi import APIRouter, FastAPI, Path, Query
+from starlette.requests import Request
+
+from stac_fastapi.core.ingest import (
+    DEFAULT_MAX_LINE_BYTES,
+    NDJSON_MEDIA_TYPE,
+    ndjson_lines,
+)
+from stac_fastapi.extensions.third_party.bulk_transactions import BulkTransactionMethod
+from stac_fastapi.types.extension import ApiExtension
+
+if TYPE_CHECKING:
+    from stac_fastapi.core.core import AsyncBulkTransactionsClient
+
+
+@attr.s
+class IngestExtension(ApiExtension):
+    """Insert the items of a newline delimited JSON stream.
+
+    The ingest endpoint takes one item per line, and returns the number of items added
+    and failed, with the reason of the first failures:
+        POST /collections/{collection_id}/ingest?method=insert|upsert
+
+    Attributes:
+        client: The bulk transactions client, which implements `ndjson_item_insert`.
+        max_line_bytes: The maximum size of the line of an item.
+    """
+
+    client: "AsyncBulkTransactionsClient" = attr.ib()
+    max_line_bytes: int = attr.ib(default=DEFAULT_MAX_LINE_BYTES)
+
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+
+        async def ingest_items(
+            request: Request,
+            collection_id: str = Path(..., description="Collection ID"),
+            method: BulkTransactionMethod = Query(
+                BulkTransactionMethod.INSERT,
+                description="`insert` to only add new items, `upsert` to overwrite the existing items.",
+            ),
+        ):
+            return await self.client.ndjson_item_insert(
+                collection_id,
+                ndjson_lines(request.stream(), self.max_line_bytes),
+                method=method,
+                request=request,
+            )
+
+        self.router.prefix = app.state.router_prefix
+        self.router.add_api_route(
+            name="Ingest Items",
+            path="/collections/{collection_id}/ingest",
+            methods=["POST"],
+            endpoint=ingest_items,
+            openapi_extra={
+                "requestBody": {
+                    "required": True,
+                    "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+                }
+            },
+        )
+        app.include_router(self.router, tags=["Ingest Extension"])
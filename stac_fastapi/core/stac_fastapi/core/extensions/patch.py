@@ -0,0 +1,120 @@
+"""Patch extension.
+
+Adds `PATCH /collections/{collection_id}/items/{item_id}`, which applies a JSON Merge
+Patch or a JSON Patch to an item, and `PATCH /collections/{collection_id}/bulk_items`,
+which patches many items of a collection in one request.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+import attr
+from fastapi import APIRouter, FastAPI, HTTPException, Path
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from stac_fastapi.core.patch import (
+    JSON_PATCH_MEDIA_TYPE,
+    MERGE_PATCH_MEDIA_TYPE,
+    ItemPatch,
+)
+from stac_fastapi.types.extension import ApiExtension
+
+if TYPE_CHECKING:
+    from stac_fastapi.core.core import TransactionsClient
+
+
+class ItemPatches(BaseModel):
+    """The patches of a bulk patch, by item id.
+
+    A patch is a JSON Patch if it is an array of operations, else a JSON Merge Patch.
+    """
+
+    items: Dict[str, Union[Dict[str, Any], List[Dict[str, Any]]]]
+
+
+@attr.s
+class PatchExtension(ApiExtension):
+    """Patch items in place.
+
+    The patch endpoints take a JSON Merge Patch (RFC 7396), or a JSON Patch (RFC 6902)
+    with the `application/json-patch+json` content type:
+        PATCH /collections/{collection_id}/items/{item_id}
+        PATCH /collections/{collection_id}/bulk_items
+
+    Attributes:
+        client: The transactions client, which implements `patch_item` and
+            `bulk_patch_items`.
+    """
+
+    client: "TransactionsClient" = attr.ib()
+
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+
+        async def patch_item(
+            request: Request,
+            collection_id: str = Path(..., description="Collection ID"),
+            item_id: str = Path(..., description="Item ID"),
+        ):
+            try:
+                body = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid JSON body")
+            media_type = request.headers.get("content-type", "").split(";")[0]
+            return await self.client.patch_item(
+                collection_id,
+                item_id,
+                ItemPatch.from_body(body, media_type.strip().lower()),
+                request=request,
+            )
+
+        async def bulk_patch_items(
+            request: Request,
+            patches: ItemPatches,
+            collection_id: str = Path(..., description="Collection ID"),
+        ):
+            return await self.client.bulk_patch_items(
+                collection_id,
+                {
+                    item_id: ItemPatch.from_value(patch)
+                    for item_id, patch in patches.items.items()
+                },
+                request=request,
+            )
+
+        self.router.prefix = app.state.router_prefix
+        self.router.add_api_route(
+            name="Patch Item",
+            path="/collections/{collection_id}/items/{item_id}",
+            methods=["PATCH"],
+            endpoint=patch_item,
+            openapi_extra={
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        MERGE_PATCH_MEDIA_TYPE: {"schema": {"type": "object"}},
+                        JSON_PATCH_MEDIA_TYPE: {
+                            "schema": {"type": "array", "items": {"type": "object"}}
+                        },
+                    },
+                }
+            },
+        )
+        self.router.add_api_route(
+            name="Bulk Patch Items",
+            path="/collections/{collection_id}/bulk_items",
+            methods=["PATCH"],
+            endpoint=bulk_patch_items,
+        )
+        app.include_router(self.router, tags=["Patch Extension"])
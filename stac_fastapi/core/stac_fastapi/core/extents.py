@@ -0,0 +1,278 @@
+"""Collection extent based pruning of catalog-wide item searches.
+
+A search without collections targets the item indices of every collection. With extent
+pruning enabled, the spatial and temporal extents of the collections are kept in memory,
+and the collections whose extents can't match the bbox and datetime of a search are left
+out of the searched indices.
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import attr
+
+from stac_fastapi.types.rfc3339 import rfc3339_str_to_datetime
+
+# west, south, east, north
+BBox = Sequence[float]
+Interval = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 3339 datetime, None if the value is open ended."""
+    if not value or value == "..":
+        return None
+    return rfc3339_str_to_datetime(value)
+
+
+def _lon_ranges(west: float, east: float) -> List[Tuple[float, float]]:
+    """Split the longitudes of a bbox crossing the antimeridian in two ranges."""
+    if west <= east:
+        return [(west, east)]
+    return [(west, 180.0), (-180.0, east)]
+
+
+def bbox_intersects(a: BBox, b: BBox) -> bool:
+    """Check if two 2D bboxes intersect, including bboxes crossing the antimeridian.
+
+    Args:
+        a (BBox): A bbox, as west, south, east, north.
+        b (BBox): Another bbox, as west, south, east, north.
+
+    Returns:
+        bool: True if the bboxes share at least a point.
+    """
+    if a[1] > b[3] or b[1] > a[3]:
+        return False
+    return any(
+        a_west <= b_east and b_west <= a_east
+        for a_west, a_east in _lon_ranges(a[0], a[2])
+        for b_west, b_east in _lon_ranges(b[0], b[2])
+    )
+
+
+def geometry_bbox(geometry: Any) -> Optional[BBox]:
+    """Get the bbox of a GeoJSON geometry.
+
+    Args:
+        geometry (Any): A GeoJSON geometry, as a dictionary or a model with `coordinates`.
+
+    Returns:
+        Optional[BBox]: The bbox of the coordinates of the geometry, or None for a
+        geometry without coordinates, e.g. a GeometryCollection.
+    """
+    coordinates = (
+        geometry.get("coordinates")
+        if isinstance(geometry, dict)
+        else getattr(geometry, "coordinates", None)
+    )
+    if not coordinates:
+        return None
+
+    positions: List[Sequence[float]] = []
+
+    def collect(value: Any) -> None:
+        if isinstance(value[0], (int, float)):
+            positions.append(value)
+        else:
+            for child in value:
+                collect(child)
+
+    collect(coordinates)
+    lons = [position[0] for position in positions]
+    lats = [position[1] for position in positions]
+    return [min(lons), min(lats), max(lons), max(lats)]
+
+
+@attr.s(frozen=True)
+class CollectionExtent:
+    """The spatial and temporal extent of a collection.
+
+    Attributes:
+        bboxes (Optional[List[BBox]]): The 2D bboxes of the collection, None if unknown.
+        intervals (Optional[List[Interval]]): The time intervals of the collection, with
+            None for an open end, None if unknown.
+    """
+
+    bboxes: Optional[List[BBox]] = attr.ib(default=None)
+    intervals: Optional[List[Interval]] = attr.ib(default=None)
+
+    @classmethod
+    def from_collection(cls, collection: Dict[str, Any]) -> "CollectionExtent":
+        """Read the extent of a collection document.
+
+        Args:
+            collection (Dict[str, Any]): The collection, only its `extent` is used.
+
+        Returns:
+            CollectionExtent: The extent, a missing or invalid spatial or temporal extent
+            is left unknown so that it matches every search.
+        """
+        extent = collection.get("extent") or {}
+
+        bboxes: Optional[List[BBox]] = None
+        try:
+            bboxes = []
+            for bbox in extent["spatial"]["bbox"]:
+                if len(bbox) == 6:
+                    bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+                west, south, east, north = (float(value) for value in bbox)
+                bboxes.append([west, south, east, north])
+            bboxes = bboxes or None
+        except (KeyError, TypeError, ValueError):
+            bboxes = None
+
+        intervals: Optional[List[Interval]] = None
+        try:
+            intervals = [
+                (_parse_datetime(start), _parse_datetime(end))
+                for start, end in extent["temporal"]["interval"]
+            ] or None
+        except (KeyError, TypeError, ValueError):
+            intervals = None
+
+        return cls(bboxes=bboxes, intervals=intervals)
+
+    def matches(self, bbox: Optional[BBox], interval: Optional[Interval]) -> bool:
+        """Check if the collection can have items matching a search.
+
+        Args:
+            bbox (Optional[BBox]): The bbox of the search, None if not filtered by space.
+            interval (Optional[Interval]): The datetime interval of the search, None if
+                not filtered by time.
+
+        Returns:
+            bool: False if the extent doesn't overlap the bbox or the interval.
+        """
+        if bbox is not None and self.bboxes is not None:
+            if not any(bbox_intersects(bbox, extent) for extent in self.bboxes):
+                return False
+        if interval is not None and self.intervals is not None:
+            gte, lte = interval
+            if not any(
+                (start is None or lte is None or start <= lte)
+                and (end is None or gte is None or gte <= end)
+                for start, end in self.intervals
+            ):
+                return False
+        return True
+
+
+@attr.s
+class CollectionExtents:
+    """In-memory table of the extents of all of the collections.
+
+    The table is loaded on the first pruned search. It is dropped by the collection writes
+    of its worker, and, to see the collection writes of the other workers, when a version
+    of the collections index has changed, which is checked at most once per
+    `version_check_interval` seconds.
+
+    Attributes:
+        enabled (bool): Whether catalog-wide searches are pruned.
+        version_check_interval (float): The minimum number of seconds between two version
+            checks.
+    """
+
+    enabled: bool = attr.ib(default=False)
+    version_check_interval: float = attr.ib(default=5.0)
+
+    _extents: Optional[Dict[str, CollectionExtent]] = attr.ib(default=None, init=False)
+    _version: Any = attr.ib(default=None, init=False)
+    _checked_at: Optional[float] = attr.ib(default=None, init=False)
+
+    @classmethod
+    def from_env(cls) -> "CollectionExtents":
+        """Create the table from the environment.
+
+        `STAC_FASTAPI_EXTENT_PRUNING` enables the pruning, disabled by default.
+
+        Returns:
+            CollectionExtents: The collection extents table.
+        """
+        return cls(
+            enabled=os.getenv("STAC_FASTAPI_EXTENT_PRUNING", "false").lower() == "true"
+        )
+
+    def invalidate(self) -> None:
+        """Drop the table, it is reloaded by the next pruned search."""
+        self._extents = None
+
+    async def _revalidate(self, get_version: Callable[[], Awaitable[Any]]) -> None:
+        now = time.monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self.version_check_interval
+        ):
+            return
+        self._checked_at = now
+        version = await get_version()
+        if version is None or version != self._version:
+            self._extents = None
+        self._version = version
+
+    async def matching_collections(
+        self,
+        load_collections: Callable[[], Awaitable[Iterable[Dict[str, Any]]]],
+        get_version: Callable[[], Awaitable[Any]],
+        bbox: Optional[BBox] = None,
+        datetime_search: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Optional[List[str]]:
+        """Get the collections that can have items matching a search.
+
+        Args:
+            load_collections (Callable[[], Awaitable[Iterable[Dict[str, Any]]]]): Reads the
+                `id` and `extent` of all of the collections, awaited to (re)load the table.
+            get_version (Callable[[], Awaitable[Any]]): Returns a value that changes with
+                every write to the collections index.
+            bbox (Optional[BBox]): The bbox of the search.
+            datetime_search (Optional[Dict[str, Optional[str]]]): The datetime filter of the
+                search, with `gte` and `lte` bounds or an `eq` value.
+
+        Returns:
+            Optional[List[str]]: The ids of the matching collections, or None if the search
+            is not pruned, because pruning is disabled or the search has neither a bbox nor
+            a datetime.
+        """
+        interval: Optional[Interval] = None
+        if datetime_search:
+            try:
+                interval = (
+                    _parse_datetime(
+                        datetime_search.get("eq") or datetime_search.get("gte")
+                    ),
+                    _parse_datetime(
+                        datetime_search.get("eq") or datetime_search.get("lte")
+                    ),
+                )
+            except ValueError:
+                interval = None
+            if interval == (None, None):
+                interval = None
+
+        if not self.enabled or (bbox is None and interval is None):
+            return None
+
+        await self._revalidate(get_version)
+        if self._extents is None:
+            self._extents = {
+                collection["id"]: CollectionExtent.from_collection(collection)
+                for collection in await load_collections()
+            }
+
+        return [
+            collection_id
+            for collection_id, extent in self._extents.items()
+            if extent.matches(bbox, interval)
+        ]
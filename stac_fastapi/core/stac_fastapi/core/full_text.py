@@ -0,0 +1,98 @@
+"""Full text field of the free text search.
+
+With full text properties configured, the item mappings copy the chosen properties
+into a single analyzed `full_text` field, and the `q` parameter of the free text
+extension is matched against that field instead of a `query_string` over every
+property of the items.
+"""
+
+import os
+from copy import deepcopy
+from typing import Any, Dict, List, Optional
+
+FULL_TEXT_FIELD = "full_text"
+
+# mapped as text by the dynamic templates, every other property is mapped as keyword
+TEXT_PROPERTIES = {"title", "description"}
+
+
+def get_full_text_properties() -> List[str]:
+    """Get the properties copied to the full text field.
+
+    Reads the comma separated `STAC_FASTAPI_FULL_TEXT_PROPERTIES` environment variable,
+    e.g. `title,description,keywords,platform`.
+
+    Returns:
+        List[str]: The item properties, empty if the full text field is disabled.
+    """
+    properties = os.getenv("STAC_FASTAPI_FULL_TEXT_PROPERTIES") or ""
+    return [name.strip() for name in properties.split(",") if name.strip()]
+
+
+def full_text_property_mappings(properties: List[str]) -> Dict[str, Any]:
+    """Get the mappings of the properties copied to the full text field.
+
+    Args:
+        properties (List[str]): The item properties.
+
+    Returns:
+        Dict[str, Any]: The mappings of the properties, and of the full text field.
+    """
+    if not properties:
+        return {}
+    return {
+        FULL_TEXT_FIELD: {"type": "text"},
+        "properties": {
+            "properties": {
+                name: {
+                    "type": "text" if name in TEXT_PROPERTIES else "keyword",
+                    "copy_to": FULL_TEXT_FIELD,
+                }
+                for name in properties
+            }
+        },
+    }
+
+
+def with_full_text_mappings(
+    mappings: Dict[str, Any], properties: List[str]
+) -> Dict[str, Any]:
+    """Add the full text field to the item mappings.
+
+    Args:
+        mappings (Dict[str, Any]): The item mappings, left unchanged.
+        properties (List[str]): The item properties copied to the full text field.
+
+    Returns:
+        Dict[str, Any]: The item mappings, with the full text field if any property is
+        given.
+    """
+    mappings = deepcopy(mappings)
+    additions = full_text_property_mappings(properties)
+    if additions:
+        mappings["properties"][FULL_TEXT_FIELD] = additions[FULL_TEXT_FIELD]
+        mappings["properties"]["properties"]["properties"].update(
+            additions["properties"]["properties"]
+        )
+    return mappings
+
+
+def full_text_query(free_text_queries: List[str]) -> Optional[Dict[str, Any]]:
+    """Get the query matching any of the free text queries on the full text field.
+
+    Args:
+        free_text_queries (List[str]): The terms or phrases of the `q` parameter.
+
+    Returns:
+        Optional[Dict[str, Any]]: The query, None if there is no query.
+    """
+    should = [
+        {"match_phrase": {FULL_TEXT_FIELD: query}}
+        for query in free_text_queries
+        if query
+    ]
+    if not should:
+        return None
+    if len(should) == 1:
+        return should[0]
+    return {"bool": {"should": should}}
@@ -0,0 +1,95 @@
+"""Streaming ingest of newline delimited JSON items.
+
+The request body is read as it arrives, one item per line. Each item is validated and
+prepared as soon as its line is complete, and written with the next bulk write once
+`chunk_size * max_concurrency` items of the `bulk_options` of the database are pending.
+Only one line and one batch of items are held in memory, whatever the size of the body.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+import attr
+from fastapi import HTTPException
+
+from stac_fastapi.core.bulk import BulkItemResult
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# the maximum size of the line of an item
+DEFAULT_MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+async def ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int = DEFAULT_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a stream of bytes into lines.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The body of the request, e.g. `request.stream()`.
+        max_line_bytes (int): The maximum size of a line.
+
+    Yields:
+        Tuple[int, bytes]: The number of each line, starting at 1, and the line. Blank
+        lines are skipped.
+
+    Raises:
+        HTTPException: 413 if a line is larger than `max_line_bytes`.
+    """
+    buffer = bytearray()
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line_number += 1
+            line = bytes(buffer[start:end]).strip()
+            if line:
+                yield line_number, line
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Line {line_number + 1} is larger than {max_line_bytes} bytes",
+            )
+    line = bytes(buffer).strip()
+    if line:
+        yield line_number + 1, line
+
+
+@attr.s
+class IngestSummary:
+    """The outcome of a streaming ingest.
+
+    Only the first `max_errors` failures are kept with their reason, the others are
+    counted.
+
+    Attributes:
+        max_errors (int): The maximum number of failures reported with their reason.
+        added (int): The number of items written.
+        failed (int): The number of lines that could not be written.
+        errors (List[Dict[str, Any]]): The `line`, `id` and `error` of the failures.
+    """
+
+    max_errors: int = attr.ib(default=100)
+    added: int = attr.ib(default=0)
+    failed: int = attr.ib(default=0)
+    errors: List[Dict[str, Any]] = attr.ib(factory=list)
+
+    def add_error(self, line: int, item_id: Optional[str], error: str) -> None:
+        """Add the failure of a line."""
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "id": item_id, "error": error})
+
+    def add_results(self, lines: List[int], results: List[BulkItemResult]) -> None:
+        """Add the results of a bulk write, in the order of the lines of the items."""
+        for line, result in zip(lines, results):
+            if result.ok:
+                self.added += 1
+            else:
+                self.add_error(line, result.id, result.error or "Unknown error")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the response body of the ingest."""
+        return {"added": self.added, "failed": self.failed, "errors": self.errors}
@@ -0,0 +1,290 @@
+"""Prometheus metrics of the API and of its calls to the cluster.
+
+The metrics are always collected, and exposed on a `/metrics` scrape endpoint when
+`STAC_FASTAPI_METRICS` is `true`:
+
+- the latency of the requests, per route,
+- the latency and the errors of the `DatabaseLogic` methods calling the cluster,
+- the items returned by the searches and the bytes of the responses,
+- the outcomes of the search counts,
+- the sizes, hits and misses of the search, collection and filter caches.
+"""
+
+import functools
+import inspect
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from fastapi import FastAPI
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "stac_fastapi"
+
+METRICS_PATH = "/metrics"
+
+REQUEST_DURATION = Histogram(
+    "request_duration_seconds",
+    "Latency of the API requests.",
+    ["method", "route", "status"],
+    namespace=NAMESPACE,
+)
+
+RESPONSE_BYTES = Counter(
+    "response_bytes",
+    "Bytes of the serialized API responses.",
+    ["method", "route"],
+    namespace=NAMESPACE,
+)
+
+CLUSTER_CALL_DURATION = Histogram(
+    "cluster_call_duration_seconds",
+    "Latency of the database logic methods calling the cluster.",
+    ["method"],
+    namespace=NAMESPACE,
+)
+
+CLUSTER_CALL_ERRORS = Counter(
+    "cluster_call_errors",
+    "Errors raised by the database logic methods calling the cluster.",
+    ["method", "error"],
+    namespace=NAMESPACE,
+)
+
+ITEMS_RETURNED = Counter(
+    "items_returned",
+    "Items returned by the item searches.",
+    namespace=NAMESPACE,
+)
+
+SEARCH_COUNTS = Counter(
+    "search_counts",
+    "Outcomes of the counts of matched items: completed, discarded above the count "
+    "bound, or disabled.",
+    ["outcome"],
+    namespace=NAMESPACE,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+T = TypeVar("T")
+
+
+def metrics_enabled(metrics: Optional[str] = None) -> bool:
+    """Check whether the metrics endpoint is enabled.
+
+    Args:
+        metrics (Optional[str]): `true` to enable the endpoint, read from the
+            `STAC_FASTAPI_METRICS` environment variable if not given.
+
+    Returns:
+        bool: True if the metrics are exposed, False by default.
+    """
+    metrics = metrics or os.getenv("STAC_FASTAPI_METRICS", "false")
+    return metrics.lower() == "true"
+
+
+def cluster_call(func: F) -> F:
+    """Observe the latency and the errors of a database logic method.
+
+    Args:
+        func (F): The method, a coroutine function or a function.
+
+    Returns:
+        F: The method, observed under its name.
+    """
+    method = func.__name__
+    duration = CLUSTER_CALL_DURATION.labels(method=method)
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def observed_coroutine(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                CLUSTER_CALL_ERRORS.labels(method=method, error=type(e).__name__).inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - start)
+
+        return observed_coroutine  # type: ignore
+
+    @functools.wraps(func)
+    def observed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            CLUSTER_CALL_ERRORS.labels(method=method, error=type(e).__name__).inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+
+    return observed  # type: ignore
+
+
+def count_items(items: Iterable[T]) -> Iterator[T]:
+    """Count the items returned by a search as they are consumed.
+
+    Args:
+        items (Iterable[T]): The items, possibly lazy.
+
+    Yields:
+        T: The items.
+    """
+    returned = ITEMS_RETURNED
+    for item in items:
+        returned.inc()
+        yield item
+
+
+def observe_count(total: Optional[Dict[str, Any]]) -> None:
+    """Observe the outcome of the count of a search.
+
+    Args:
+        total (Optional[Dict[str, Any]]): The `hits.total` of the search response,
+            missing when the count is disabled.
+    """
+    if not total:
+        outcome = "disabled"
+    elif total["relation"] == "eq":
+        outcome = "completed"
+    else:
+        outcome = "discarded"
+    SEARCH_COUNTS.labels(outcome=outcome).inc()
+
+
+class CacheCollector(Collector):
+    """Collect the sizes and the counters of the caches of a database logic."""
+
+    def __init__(self, database: Any):
+        """Create the collector.
+
+        Args:
+            database (Any): The database logic, with `search_cache`,
+                `collection_cache` and `filter_cache` attributes.
+        """
+        self.database = database
+
+    def collect(self) -> Iterator[Any]:
+        """Collect the cache metrics, labeled with the name of the cache."""
+        size = GaugeMetricFamily(
+            f"{NAMESPACE}_cache_size", "Entries of the caches.", labels=["cache"]
+        )
+        hits = CounterMetricFamily(
+            f"{NAMESPACE}_cache_hits", "Hits of the caches.", labels=["cache"]
+        )
+        misses = CounterMetricFamily(
+            f"{NAMESPACE}_cache_misses", "Misses of the caches.", labels=["cache"]
+        )
+        evictions = CounterMetricFamily(
+            f"{NAMESPACE}_cache_evictions", "Evictions of the caches.", labels=["cache"]
+        )
+        hit_ratio = GaugeMetricFamily(
+            f"{NAMESPACE}_cache_hit_ratio",
+            "Ratio of the lookups of the caches that were hits.",
+            labels=["cache"],
+        )
+        for name in ("search", "collection", "filter"):
+            cache = getattr(self.database, f"{name}_cache", None)
+            if cache is None:
+                continue
+            stats = cache.stats()
+            lookups = stats["hits"] + stats["misses"]
+            size.add_metric([name], stats["size"])
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            evictions.add_metric([name], stats["evictions"])
+            hit_ratio.add_metric([name], stats["hits"] / lookups if lookups else 0.0)
+        yield from (size, hits, misses, evictions, hit_ratio)
+
+
+class MetricsMiddleware:
+    """Observe the latency and the response bytes of the requests."""
+
+    def __init__(self, app: ASGIApp):
+        """Create the middleware.
+
+        Args:
+            app (ASGIApp): The application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Observe an HTTP request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        body_bytes = 0
+
+        async def send_observed(message: Message) -> None:
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_observed)
+        finally:
+            # the route is set by the router, the requests matching no route share a label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_DURATION.labels(
+                method=scope["method"], route=route, status=str(status)
+            ).observe(time.perf_counter() - start)
+            RESPONSE_BYTES.labels(method=scope["method"], route=route).inc(body_bytes)
+
+
+def setup_metrics(
+    app: FastAPI, metrics: Optional[str] = None, database: Optional[Any] = None
+) -> None:
+    """Set up the metrics middleware and the `/metrics` scrape endpoint.
+
+    Args:
+        app (FastAPI): The application.
+        metrics (Optional[str]): `true` to expose the metrics, read from the
+            `STAC_FASTAPI_METRICS` environment variable if not given.
+        database (Optional[Any]): The database logic whose caches are collected.
+    """
+    if not metrics_enabled(metrics):
+        logger.info("Metrics are disabled")
+        return
+
+    logger.info(f"Setting up metrics on {METRICS_PATH}")
+
+    # collectors of this application, the module metrics are in the default registry
+    registry = CollectorRegistry(auto_describe=True)
+    if database is not None:
+        registry.register(CacheCollector(database))
+
+    async def scrape_metrics(request: Request) -> Response:
+        return Response(
+            generate_latest(REGISTRY) + generate_latest(registry),
+            media_type=CONTENT_TYPE_LATEST,
+        )
+
+    app.add_route(
+        METRICS_PATH, scrape_metrics, methods=["GET"], include_in_schema=False
+    )
+    app.add_middleware(MetricsMiddleware)
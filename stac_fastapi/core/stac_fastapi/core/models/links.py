@@ -1,6 +1,7 @@
 """link helpers."""
 
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
 from urllib.parse import ParseResult, parse_qs, urlencode, urljoin, urlparse
 
 import attr
@@ -8,6 +9,8 @@ from stac_pydantic.links import Relations
 from stac_pydantic.shared import MimeTypes
 from starlette.requests import Request
 
+from stac_fastapi.core.context import get_request_context
+
 # Copied from pgstac links
 
 # These can be inferred from the item/collection, so they aren't included in the database
@@ -33,6 +36,20 @@ def merge_params(url: str, newparams: Dict) -> str:
     return href
 
 
+@lru_cache(maxsize=None)
+def link_method_names(links_class: Type["BaseLinks"]) -> List[str]:
+    """Get the names of the `link_` methods of a links class.
+
+    The methods of a class don't change, so they are only looked up once per class
+    instead of walking `dir()` every time links are created.
+    """
+    return [
+        name
+        for name in dir(links_class)
+        if name.startswith("link_") and callable(getattr(links_class, name))
+    ]
+
+
 @attr.s
 class BaseLinks:
     """Create inferred links common to collections and items."""
@@ -42,12 +59,12 @@ class BaseLinks:
     @property
     def base_url(self):
         """Get the base url."""
-        return str(self.request.base_url)
+        return get_request_context(self.request).base_url
 
     @property
     def url(self):
         """Get the current request url."""
-        return str(self.request.url)
+        return get_request_context(self.request).url
 
     def resolve(self, url):
         """Resolve url to the current request url."""
@@ -66,11 +83,10 @@ class BaseLinks:
     def create_links(self) -> List[Dict[str, Any]]:
         """Return all inferred links."""
         links = []
-        for name in dir(self):
-            if name.startswith("link_") and callable(getattr(self, name)):
-                link = getattr(self, name)()
-                if link is not None:
-                    links.append(link)
+        for name in link_method_names(type(self)):
+            link = getattr(self, name)()
+            if link is not None:
+                links.append(link)
         return links
 
     async def get_links(
@@ -82,9 +98,9 @@ class BaseLinks:
         Get the links object for a stac resource by iterating through
         available methods on this class that start with link_.
         """
-        # TODO: Pass request.json() into function so this doesn't need to be coroutine
         if self.request.method == "POST":
-            self.request.postbody = await self.request.json()
+            # read the body once per request, for `link_next`
+            await get_request_context(self.request).get_postbody()
         # join passed in links with generated links
         # and update relative paths
         links = self.create_links()
@@ -107,6 +123,55 @@ class BaseLinks:
         return links
 
 
+@attr.s
+class ItemLinksTemplate:
+    """Create the inferred links of items from pre-rendered urls.
+
+    The base url and collection prefixes are joined once per template, so the links
+    of each item are filled in with string formatting instead of several `urljoin`
+    calls. The links are the same as the ones of `stac_fastapi.types.links.ItemLinks`.
+    """
+
+    base_url: str = attr.ib()
+    collections_url: str = attr.ib(init=False)
+    root_link: Dict[str, str] = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        """Pre-render the urls shared by all items."""
+        self.collections_url = urljoin(self.base_url, "collections/")
+        self.root_link = dict(
+            rel=Relations.root.value, type=MimeTypes.json.value, href=self.base_url
+        )
+
+    def create_links(self, collection_id: str, item_id: str) -> List[Dict[str, Any]]:
+        """Return the `self`, `parent`, `collection` and `root` links of an item."""
+        collection_url = self.collections_url + collection_id
+        return [
+            dict(
+                rel=Relations.self.value,
+                type=MimeTypes.geojson.value,
+                href=f"{collection_url}/items/{item_id}",
+            ),
+            dict(
+                rel=Relations.parent.value,
+                type=MimeTypes.json.value,
+                href=collection_url,
+            ),
+            dict(
+                rel=Relations.collection.value,
+                type=MimeTypes.json.value,
+                href=collection_url,
+            ),
+            dict(self.root_link),
+        ]
+
+
+@lru_cache(maxsize=64)
+def item_links_template(base_url: str) -> ItemLinksTemplate:
+    """Get the item links template of a base url."""
+    return ItemLinksTemplate(base_url=base_url)
+
+
 @attr.s
 class CollectionLinks(BaseLinks):
     """Create inferred links specific to collections."""
@@ -198,8 +263,11 @@ class PagingLinks(BaseLinks):
                     "rel": Relations.next,
                     "type": MimeTypes.json,
                     "method": method,
-                    "href": f"{self.request.url}",
-                    "body": {**self.request.postbody, "token": self.next},
+                    "href": self.url,
+                    "body": {
+                        **get_request_context(self.request).postbody,
+                        "token": self.next,
+                    },
                 }
 
         return None
@@ -0,0 +1,101 @@
+"""Time partitioned item indices.
+
+With partitioning enabled, the items of a collection are written to one index per year
+or month of their `properties.datetime`, all behind the alias of the collection. Items
+without a datetime stay in the first index of the collection. Searches with a bounded
+datetime interval then only target the partitions overlapping the interval.
+"""
+
+import os
+from datetime import timezone
+from enum import Enum
+from typing import Dict, List, Optional
+
+from stac_fastapi.types.rfc3339 import rfc3339_str_to_datetime
+
+
+class PartitionInterval(str, Enum):
+    """Time span of the item index partitions."""
+
+    NONE = "none"
+    YEAR = "year"
+    MONTH = "month"
+
+
+def get_partition_interval() -> PartitionInterval:
+    """Get the partition interval from the `STAC_FASTAPI_ITEMS_PARTITION` environment variable.
+
+    Returns:
+        PartitionInterval: The partition interval, `none` if the variable is not set.
+
+    Raises:
+        ValueError: If the variable is not a valid partition interval.
+    """
+    interval = os.getenv("STAC_FASTAPI_ITEMS_PARTITION") or PartitionInterval.NONE.value
+    try:
+        return PartitionInterval(interval.lower())
+    except ValueError:
+        raise ValueError(
+            f"Invalid STAC_FASTAPI_ITEMS_PARTITION '{interval}', "
+            f"must be one of {[interval.value for interval in PartitionInterval]}"
+        )
+
+
+def partition_suffix(
+    item_datetime: Optional[str], interval: PartitionInterval
+) -> Optional[str]:
+    """Get the index name suffix of the partition of an item.
+
+    Args:
+        item_datetime (Optional[str]): The `properties.datetime` of the item.
+        interval (PartitionInterval): The partition interval.
+
+    Returns:
+        Optional[str]: `YYYY` or `YYYY-MM` in UTC, or None if the item goes to the first
+        index of the collection, because it has no datetime or partitioning is disabled.
+    """
+    if interval == PartitionInterval.NONE or not item_datetime:
+        return None
+    dt = rfc3339_str_to_datetime(item_datetime).astimezone(timezone.utc)
+    if interval == PartitionInterval.YEAR:
+        return f"{dt.year}"
+    return f"{dt.year}-{dt.month:02d}"
+
+
+def partition_suffixes(
+    datetime_search: Optional[Dict[str, Optional[str]]]
+) -> Optional[List[str]]:
+    """Get the index name suffixes of the partitions overlapping a datetime interval.
+
+    The suffixes cover both yearly and monthly partitions, so that the partitions written
+    before a change of the partition interval are still searched.
+
+    Args:
+        datetime_search (Optional[Dict[str, Optional[str]]]): The datetime filter, with
+            `gte` and `lte` bounds or an `eq` value.
+
+    Returns:
+        Optional[List[str]]: Index name suffixes, which can be patterns, or None if the
+        interval is not bounded on both ends.
+    """
+    if not datetime_search:
+        return None
+    gte = datetime_search.get("eq") or datetime_search.get("gte")
+    lte = datetime_search.get("eq") or datetime_search.get("lte")
+    if not gte or not lte:
+        return None
+    start = rfc3339_str_to_datetime(gte).astimezone(timezone.utc)
+    end = rfc3339_str_to_datetime(lte).astimezone(timezone.utc)
+
+    suffixes: List[str] = []
+    for year in range(start.year, end.year + 1):
+        first_month = start.month if year == start.year else 1
+        last_month = end.month if year == end.year else 12
+        if first_month == 1 and last_month == 12:
+            suffixes.append(f"{year}*")
+        else:
+            suffixes.append(f"{year}")
+            suffixes.extend(
+                f"{year}-{month:02d}" for month in range(first_month, last_month + 1)
+            )
+    return suffixes
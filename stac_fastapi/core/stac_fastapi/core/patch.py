@@ -0,0 +1,586 @@
+"""Partial updates of items with JSON Merge Patch and JSON Patch.
+
+A patch is applied by Elasticsearch/OpenSearch with an `_update` request, so the item is
+not sent back and forth: a merge patch without `null` values is merged as a partial
+document, and the other patches are applied by a Painless script. `properties.updated`
+is set by the update.
+
+The item is not validated by an update, so only the patches writing values valid on their
+own to the fields of the properties and the assets are applied in place. The other patches,
+e.g. of the `geometry` the database derives the envelope of the bbox filter from, or of
+`properties.datetime` which is validated with the datetime range, are applied to the item
+read from the database, which is validated and written back.
+
+See https://www.rfc-editor.org/rfc/rfc7396 and https://www.rfc-editor.org/rfc/rfc6902.
+"""
+
+import copy
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import attr
+from fastapi import HTTPException
+from pydantic import ValidationError
+from stac_pydantic.item import ItemProperties
+from stac_pydantic.shared import Asset
+
+from stac_fastapi.core.bulk import BulkItemResult, bulk_item_result
+from stac_fastapi.core.envelope import ENVELOPE_FIELD
+
+MERGE_PATCH_MEDIA_TYPE = "application/merge-patch+json"
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+
+# the fields that identify the item, and the fields only the database writes
+IMMUTABLE_FIELDS = {"type", "id", "collection", ENVELOPE_FIELD}
+
+# the fields required by STAC that the item model defaults when they are missing
+DEFAULTED_FIELDS = ("stac_version",)
+
+# the properties typed by the item model, and the ones only valid together
+TYPED_PROPERTIES = frozenset(ItemProperties.model_fields)
+DATETIME_PROPERTIES = frozenset({"datetime", "start_datetime", "end_datetime"})
+
+# the values of the writes removing a field, or writing a value that depends on the item
+_REMOVED = object()
+_UNKNOWN = object()
+
+# the paths of the fields are lists of keys or list indices, see `parse_pointer`
+PATCH_SCRIPT = """
+def child(def node, String key) {
+  if (node instanceof Map) {
+    if (!node.containsKey(key)) {
+      throw new IllegalArgumentException('Path not found: ' + key);
+    }
+    return node.get(key);
+  }
+  if (node instanceof List) {
+    return node.get(listIndex(node, key, false));
+  }
+  throw new IllegalArgumentException('Path not found: ' + key);
+}
+
+int listIndex(List list, String key, boolean adding) {
+  if (adding && key == '-') {
+    return list.size();
+  }
+  int index = Integer.parseInt(key);
+  if (index < 0 || index > list.size() || (!adding && index == list.size())) {
+    throw new IllegalArgumentException('Index out of bounds: ' + key);
+  }
+  return index;
+}
+
+def parent(def root, List path) {
+  def node = root;
+  for (int i = 0; i < path.size() - 1; i++) {
+    node = child(node, path.get(i));
+  }
+  return node;
+}
+
+def getValue(def root, List path) {
+  def node = root;
+  for (String key : path) {
+    node = child(node, key);
+  }
+  return node;
+}
+
+void addValue(def root, List path, def value) {
+  def node = parent(root, path);
+  String key = path.get(path.size() - 1);
+  if (node instanceof Map) {
+    node.put(key, value);
+  } else if (node instanceof List) {
+    node.add(listIndex(node, key, true), value);
+  } else {
+    throw new IllegalArgumentException('Path not found: ' + key);
+  }
+}
+
+def removeValue(def root, List path) {
+  def node = parent(root, path);
+  String key = path.get(path.size() - 1);
+  if (node instanceof Map) {
+    if (!node.containsKey(key)) {
+      throw new IllegalArgumentException('Path not found: ' + key);
+    }
+    return node.remove(key);
+  }
+  if (node instanceof List) {
+    return node.remove(listIndex(node, key, false));
+  }
+  throw new IllegalArgumentException('Path not found: ' + key);
+}
+
+void mergePatch(Map target, Map patch) {
+  for (def entry : patch.entrySet()) {
+    def value = entry.getValue();
+    if (value == null) {
+      target.remove(entry.getKey());
+    } else if (value instanceof Map) {
+      def current = target.get(entry.getKey());
+      if (!(current instanceof Map)) {
+        current = new HashMap();
+        target.put(entry.getKey(), current);
+      }
+      mergePatch(current, value);
+    } else {
+      target.put(entry.getKey(), value);
+    }
+  }
+}
+
+for (def operation : params.operations) {
+  String op = operation.op;
+  if (op == 'merge') {
+    mergePatch(ctx._source, operation.value);
+  } else if (op == 'add') {
+    addValue(ctx._source, operation.path, operation.value);
+  } else if (op == 'remove') {
+    removeValue(ctx._source, operation.path);
+  } else if (op == 'replace') {
+    removeValue(ctx._source, operation.path);
+    addValue(ctx._source, operation.path, operation.value);
+  } else if (op == 'move') {
+    addValue(ctx._source, operation.path, removeValue(ctx._source, operation['from']));
+  } else if (op == 'copy') {
+    addValue(ctx._source, operation.path, getValue(ctx._source, operation['from']));
+  } else if (op == 'test') {
+    if (getValue(ctx._source, operation.path) != operation.value) {
+      throw new IllegalArgumentException('Test failed: ' + String.join('/', operation.path));
+    }
+  }
+}
+ctx._source.properties.updated = params.updated;
+"""
+
+# the members of the operations of a JSON patch
+OPERATION_MEMBERS = {
+    "add": ("path", "value"),
+    "remove": ("path",),
+    "replace": ("path", "value"),
+    "move": ("from", "path"),
+    "copy": ("from", "path"),
+    "test": ("path", "value"),
+}
+
+
+def invalid_patch(detail: str) -> HTTPException:
+    """Get the error of an invalid patch."""
+    return HTTPException(status_code=400, detail=f"Invalid patch: {detail}")
+
+
+def parse_pointer(pointer: Any) -> List[str]:
+    """Parse a JSON pointer into the keys of its path.
+
+    Args:
+        pointer (Any): The JSON pointer, e.g. `/properties/eo:cloud_cover`.
+
+    Returns:
+        List[str]: The keys, e.g. `["properties", "eo:cloud_cover"]`.
+
+    Raises:
+        HTTPException: 400 if the pointer is not a JSON pointer of a field of the item.
+    """
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise invalid_patch(f"{pointer!r} is not a JSON pointer of a field")
+    path = [key.replace("~1", "/").replace("~0", "~") for key in pointer[1:].split("/")]
+    if path[0] in IMMUTABLE_FIELDS:
+        raise invalid_patch(f"{path[0]} can't be patched")
+    return path
+
+
+def merge_patch_writes(patch: Dict[str, Any]) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """Get the fields of the properties or the assets a merge patch sets or removes, with their value.
+
+    An object merged into an asset that does not set its `href` may create an asset without
+    one, so its value depends on the item.
+    """
+    for key, value in patch.items():
+        if value is None:
+            yield (key,), _REMOVED
+        elif key not in ("properties", "assets") or not isinstance(value, dict):
+            yield (key,), value
+        else:
+            for field, field_value in value.items():
+                if field_value is None:
+                    yield (key, field), _REMOVED
+                elif (
+                    key == "assets"
+                    and isinstance(field_value, dict)
+                    and "href" not in field_value
+                ):
+                    yield (key, field), _UNKNOWN
+                else:
+                    yield (key, field), apply_merge_patch(None, field_value)
+
+
+def write_error(path: Tuple[str, ...], value: Any) -> Optional[str]:
+    """Check a write of a patch applied in place, where the item is not validated.
+
+    Args:
+        path (Tuple[str, ...]): The path of the written field.
+        value (Any): The value written, `_REMOVED` for a removal, or `_UNKNOWN` for a value
+            that depends on the item, e.g. a copy of another field.
+
+    Returns:
+        Optional[str]: Why the write can't be applied in place, `None` if it can.
+    """
+    field = "/".join(path)
+    unchecked = f"{field} can't be patched in place"
+    if len(path) < 2 or path[0] not in ("properties", "assets"):
+        return unchecked
+
+    if path[0] == "properties":
+        if path[1] not in TYPED_PROPERTIES:
+            return None
+        if path[1] in DATETIME_PROPERTIES or len(path) > 2 or value is _UNKNOWN:
+            return unchecked
+        if value is _REMOVED:
+            return None
+        candidate = {"datetime": "2000-01-01T00:00:00Z", path[1]: value}
+        model: Any = ItemProperties
+    else:
+        if value is _UNKNOWN or len(path) > 3:
+            return unchecked
+        if value is _REMOVED:
+            return unchecked if path[2:] == ("href",) else None
+        candidate = value if len(path) == 2 else {"href": "asset", path[2]: value}
+        model = Asset
+
+    try:
+        model.model_validate(candidate)
+    except ValidationError as e:
+        return f"{field} is invalid: {e.errors()[0]['msg']}"
+    return None
+
+
+def has_null(value: Any) -> bool:
+    """Check whether a merge patch removes fields."""
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return any(has_null(child) for child in value.values())
+    return False
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a JSON Merge Patch."""
+    if not isinstance(patch, dict):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = apply_merge_patch(target.get(key), value)
+    return target
+
+
+def _child(node: Any, key: str) -> Any:
+    if isinstance(node, dict):
+        if key not in node:
+            raise KeyError(key)
+        return node[key]
+    if isinstance(node, list):
+        return node[_list_index(node, key)]
+    raise KeyError(key)
+
+
+def _list_index(node: List[Any], key: str, adding: bool = False) -> int:
+    if adding and key == "-":
+        return len(node)
+    if not key.isdigit() or int(key) > len(node) - (0 if adding else 1):
+        raise KeyError(key)
+    return int(key)
+
+
+def _get(root: Any, path: List[str]) -> Any:
+    for key in path:
+        root = _child(root, key)
+    return root
+
+
+def _add(root: Any, path: List[str], value: Any) -> None:
+    node = _get(root, path[:-1])
+    if isinstance(node, dict):
+        node[path[-1]] = value
+    elif isinstance(node, list):
+        node.insert(_list_index(node, path[-1], adding=True), value)
+    else:
+        raise KeyError(path[-1])
+
+
+def _remove(root: Any, path: List[str]) -> Any:
+    node = _get(root, path[:-1])
+    if isinstance(node, dict):
+        if path[-1] not in node:
+            raise KeyError(path[-1])
+        return node.pop(path[-1])
+    if isinstance(node, list):
+        return node.pop(_list_index(node, path[-1]))
+    raise KeyError(path[-1])
+
+
+@attr.s(frozen=True)
+class ItemPatch:
+    """A JSON Merge Patch or a JSON Patch of an item.
+
+    Attributes:
+        merge (Optional[Dict[str, Any]]): The merge patch.
+        operations (Optional[List[Dict[str, Any]]]): The operations of the JSON patch, with
+            their `path` and `from` parsed into lists of keys.
+    """
+
+    merge: Optional[Dict[str, Any]] = attr.ib(default=None)
+    operations: Optional[List[Dict[str, Any]]] = attr.ib(default=None)
+
+    @classmethod
+    def from_merge_patch(cls, patch: Any) -> "ItemPatch":
+        """Create a patch from a JSON Merge Patch.
+
+        Raises:
+            HTTPException: 400 if the merge patch is not an object, or patches the id,
+                the collection or the type of the item.
+        """
+        if not isinstance(patch, dict):
+            raise invalid_patch("a merge patch of an item must be an object")
+        if fields := IMMUTABLE_FIELDS & set(patch):
+            raise invalid_patch(f"{', '.join(sorted(fields))} can't be patched")
+        return cls(merge=patch)
+
+    @classmethod
+    def from_json_patch(cls, patch: Any) -> "ItemPatch":
+        """Create a patch from a JSON Patch.
+
+        Raises:
+            HTTPException: 400 if the JSON patch is not an array of valid operations.
+        """
+        if not isinstance(patch, list):
+            raise invalid_patch("a JSON patch must be an array of operations")
+        operations = []
+        for operation in patch:
+            if not isinstance(operation, dict):
+                raise invalid_patch(f"{operation!r} is not an operation")
+            members = OPERATION_MEMBERS.get(operation.get("op"))
+            if members is None:
+                raise invalid_patch(f"unknown operation {operation.get('op')!r}")
+            if missing := [member for member in members if member not in operation]:
+                raise invalid_patch(
+                    f"{operation['op']} operation without {', '.join(missing)}"
+                )
+            parsed = {"op": operation["op"], "path": parse_pointer(operation["path"])}
+            if "from" in members:
+                parsed["from"] = parse_pointer(operation["from"])
+            if "value" in members:
+                parsed["value"] = operation["value"]
+            operations.append(parsed)
+        return cls(operations=operations)
+
+    @classmethod
+    def from_body(cls, body: Any, media_type: str) -> "ItemPatch":
+        """Create a patch from a request body.
+
+        Args:
+            body (Any): The parsed JSON body.
+            media_type (str): The media type of the body, a JSON Patch for
+                `application/json-patch+json`, a JSON Merge Patch otherwise.
+
+        Returns:
+            ItemPatch: The patch.
+        """
+        if media_type == JSON_PATCH_MEDIA_TYPE:
+            return cls.from_json_patch(body)
+        return cls.from_merge_patch(body)
+
+    @classmethod
+    def from_value(cls, patch: Any) -> "ItemPatch":
+        """Create a patch of a bulk patch, a JSON Patch if it is an array, else a JSON Merge Patch."""
+        if isinstance(patch, list):
+            return cls.from_json_patch(patch)
+        return cls.from_merge_patch(patch)
+
+    def writes(self) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+        """Get the paths of the fields the patch modifies, with their new value."""
+        if self.merge is not None:
+            yield from merge_patch_writes(self.merge)
+        for operation in self.operations or []:
+            op, path = operation["op"], tuple(operation["path"])
+            if op == "remove":
+                yield path, _REMOVED
+            elif op in ("add", "replace"):
+                yield path, operation["value"]
+            elif op in ("move", "copy"):
+                if op == "move":
+                    yield tuple(operation["from"]), _REMOVED
+                yield path, _UNKNOWN
+
+    def in_place_error(self) -> Optional[str]:
+        """Check whether the patch can be applied in place, without validating the item.
+
+        Returns:
+            Optional[str]: Why the patch can't be applied in place, `None` if it can.
+        """
+        for path, value in self.writes():
+            if error := write_error(path, value):
+                return error
+        return None
+
+    def update_body(self, updated: str) -> Dict[str, Any]:
+        """Get the body of the `_update` request applying the patch.
+
+        Args:
+            updated (str): The new `properties.updated` of the item.
+
+        Returns:
+            Dict[str, Any]: The partial `doc` of a merge patch without `null` values,
+            otherwise the `script` applying the patch.
+        """
+        if self.merge is not None and not has_null(self.merge):
+            return {
+                "doc": apply_merge_patch(
+                    copy.deepcopy(self.merge), {"properties": {"updated": updated}}
+                )
+            }
+        operations = (
+            [{"op": "merge", "path": [], "value": self.merge}]
+            if self.merge is not None
+            else self.operations
+        )
+        return {
+            "script": {
+                "source": PATCH_SCRIPT,
+                "lang": "painless",
+                "params": {"operations": operations, "updated": updated},
+            }
+        }
+
+    def apply(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the patch to an item.
+
+        Args:
+            item (Dict[str, Any]): The item, left unchanged.
+
+        Returns:
+            Dict[str, Any]: The patched item.
+
+        Raises:
+            HTTPException: 409 if an operation of the patch can't be applied to the item,
+                400 if the patch removes a field the item model would default.
+        """
+        patched = self._apply(copy.deepcopy(item))
+        if removed := [f for f in DEFAULTED_FIELDS if f in item and f not in patched]:
+            raise invalid_patch(f"{', '.join(removed)} can't be removed")
+        return patched
+
+    def _apply(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if self.merge is not None:
+            return apply_merge_patch(item, copy.deepcopy(self.merge))
+        for operation in self.operations or []:
+            op, path = operation["op"], operation["path"]
+            try:
+                if op == "add":
+                    _add(item, path, copy.deepcopy(operation["value"]))
+                elif op == "remove":
+                    _remove(item, path)
+                elif op == "replace":
+                    _remove(item, path)
+                    _add(item, path, copy.deepcopy(operation["value"]))
+                elif op == "move":
+                    _add(item, path, _remove(item, operation["from"]))
+                elif op == "copy":
+                    _add(item, path, copy.deepcopy(_get(item, operation["from"])))
+                elif _get(item, path) != operation["value"]:
+                    raise HTTPException(
+                        status_code=409, detail=f"Test failed: {'/'.join(path)}"
+                    )
+            except KeyError as e:
+                raise HTTPException(status_code=409, detail=f"Path not found: {e}")
+        return item
+
+
+def patch_error_reason(error: Any) -> str:
+    """Get the reason of an `_update` request that failed to apply a patch.
+
+    Args:
+        error (Any): The error body of the response, e.g. of a failed script.
+
+    Returns:
+        str: The reason of the innermost cause of the error.
+    """
+    while isinstance(error, dict):
+        cause = error.get("caused_by") or error.get("error")
+        if not isinstance(cause, dict):
+            return str(error.get("reason") or error)
+        error = cause
+    return str(error)
+
+
+def patch_error_status(error: Any) -> int:
+    """Get the status of an `_update` request that failed to apply a patch.
+
+    Args:
+        error (Any): The error body of the response.
+
+    Returns:
+        int: 409 if the patch script failed, e.g. a path is missing or a test fails, else
+        400, e.g. for a value that does not match the mapping of its field.
+    """
+    while isinstance(error, dict):
+        if error.get("type") == "script_exception":
+            return 409
+        error = error.get("caused_by") or error.get("error")
+    return 400
+
+
+def not_found_result(item_id: str, collection_id: str) -> BulkItemResult:
+    """Get the result of the patch of an item that does not exist."""
+    return BulkItemResult(
+        id=item_id,
+        status=404,
+        error=f"Item {item_id} does not exist in Collection {collection_id}",
+    )
+
+
+def bulk_patch_result(
+    item_id: str, collection_id: str, response: Tuple[bool, Dict[str, Any]]
+) -> BulkItemResult:
+    """Read the result of an item from a streaming bulk response of update actions.
+
+    Unlike `bulk_item_result`, the reason of a failed patch is its innermost cause, e.g.
+    `Path not found: eo:cloud_cover` rather than `failed to execute script`, and its status
+    tells the failed patch scripts (409) from the invalid values (400).
+    """
+    result = bulk_item_result(item_id, response)
+    if result.ok:
+        return result
+    if result.status == 404:
+        return not_found_result(item_id, collection_id)
+    info = next(iter(response[1].values()), {})
+    error = info.get("error")
+    if isinstance(error, dict):
+        return attr.evolve(
+            result,
+            status=patch_error_status(error),
+            error=patch_error_reason(error),
+        )
+    return result
+
+
+def bulk_patch_summary(results: List[BulkItemResult]) -> Dict[str, Any]:
+    """Summarize the results of a bulk patch.
+
+    Args:
+        results (List[BulkItemResult]): The results of the items.
+
+    Returns:
+        Dict[str, Any]: The number of items patched and failed, and the reason of each
+        failure.
+    """
+    failures = [result for result in results if not result.ok]
+    return {
+        "patched": len(results) - len(failures),
+        "failed": len(failures),
+        "errors": [{"id": result.id, "error": result.error} for result in failures],
+    }
@@ -0,0 +1,239 @@
+"""Per-request profiling of item searches.
+
+A profiled request gets the time spent in each stage of the search, e.g. building the
+query or waiting for the cluster, in a `Server-Timing` response header. Profiling is
+enabled with `STAC_FASTAPI_PROFILING`, either for every request or only for the requests
+sending an `X-Profile` header.
+
+The cluster profile of `X-Profile: cluster` is expensive for the cluster and exposes the
+indices and shards of the searches, so it is only honoured with the separate
+`STAC_FASTAPI_CLUSTER_PROFILING` opt-in.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+import attr
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+# the value of the profile header that also attaches the profile of the cluster
+CLUSTER_PROFILE = b"cluster"
+
+STATE_KEY = "stac_profiler"
+
+
+class ProfilingMode(str, Enum):
+    """Which requests are profiled."""
+
+    OFF = "off"
+    # the requests sending the profile header
+    HEADER = "header"
+    ALWAYS = "always"
+
+
+def get_profiling_mode(profiling: Optional[str] = None) -> ProfilingMode:
+    """Get the profiling mode.
+
+    Args:
+        profiling (Optional[str]): The profiling mode, read from the
+            `STAC_FASTAPI_PROFILING` environment variable if not given.
+
+    Returns:
+        ProfilingMode: The profiling mode, `off` by default.
+
+    Raises:
+        ValueError: If the mode is not a valid profiling mode.
+    """
+    mode = profiling or os.getenv("STAC_FASTAPI_PROFILING") or ProfilingMode.OFF.value
+    try:
+        return ProfilingMode(mode.lower())
+    except ValueError:
+        raise ValueError(
+            f"Invalid STAC_FASTAPI_PROFILING '{mode}', "
+            f"must be one of {[mode.value for mode in ProfilingMode]}"
+        )
+
+
+def cluster_profiling_enabled(cluster_profiling: Optional[str] = None) -> bool:
+    """Check whether requests can ask for the cluster profile of their searches.
+
+    Args:
+        cluster_profiling (Optional[str]): `true` to honour `X-Profile: cluster`, read from
+            the `STAC_FASTAPI_CLUSTER_PROFILING` environment variable if not given.
+
+    Returns:
+        bool: True if the cluster profile is allowed, False by default.
+    """
+    cluster_profiling = cluster_profiling or os.getenv(
+        "STAC_FASTAPI_CLUSTER_PROFILING", "false"
+    )
+    return cluster_profiling.lower() == "true"
+
+
+@attr.s
+class Profiler:
+    """The stage timings of a request.
+
+    Attributes:
+        cluster (bool): Whether the cluster profiles the searches of the request.
+        timings (Dict[str, float]): The milliseconds spent in each stage, in order.
+        cluster_profile (Optional[Dict[str, Any]]): The `profile` of the search response.
+        started_at (float): When the request was received, see `time.perf_counter`.
+        returned_at (Optional[float]): When the client returned the response body.
+    """
+
+    cluster: bool = attr.ib(default=False)
+    timings: Dict[str, float] = attr.ib(factory=dict)
+    cluster_profile: Optional[Dict[str, Any]] = attr.ib(default=None)
+    started_at: float = attr.ib(factory=time.perf_counter)
+    returned_at: Optional[float] = attr.ib(default=None)
+
+    def add(self, name: str, duration: float) -> None:
+        """Add milliseconds to a stage."""
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def handled(self) -> None:
+        """Time the `validate` stage, from the start of the request to its handler.
+
+        Only the first call counts, e.g. when a GET search is handled as a POST search.
+        """
+        if "validate" not in self.timings:
+            self.add("validate", (time.perf_counter() - self.started_at) * 1000)
+
+    def returned(self) -> None:
+        """Mark the response body as returned by the client, before it is encoded."""
+        self.returned_at = time.perf_counter()
+
+    def add_cluster_response(self, response: Dict[str, Any]) -> None:
+        """Add the `took` time and the profile of a search response."""
+        if "took" in response:
+            self.add("took", float(response["took"]))
+        if response.get("profile") is not None:
+            self.cluster_profile = response["profile"]
+
+    def server_timing(self) -> str:
+        """Get the `Server-Timing` header value of the timings, adding the `encode` and `total` stages."""
+        now = time.perf_counter()
+        timings = dict(self.timings)
+        if self.returned_at is not None:
+            timings["encode"] = (now - self.returned_at) * 1000
+        timings["total"] = (now - self.started_at) * 1000
+        return ", ".join(
+            f"{name};dur={duration:.3f}" for name, duration in timings.items()
+        )
+
+
+def get_profiler(request: Request) -> Optional[Profiler]:
+    """Get the profiler of a request.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        Optional[Profiler]: The profiler, None if the request is not profiled.
+    """
+    return getattr(getattr(request, "state", None), STATE_KEY, None)
+
+
+def profile_stage(profiler: Optional[Profiler], name: str) -> ContextManager[None]:
+    """Time a stage if the request is profiled.
+
+    Args:
+        profiler (Optional[Profiler]): The profiler of the request, if any.
+        name (str): The name of the stage.
+
+    Returns:
+        ContextManager[None]: The context manager timing the stage.
+    """
+    return profiler.stage(name) if profiler else nullcontext()
+
+
+class ProfilingMiddleware:
+    """Profile requests, and send their timings in a `Server-Timing` header."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        mode: ProfilingMode = ProfilingMode.HEADER,
+        cluster_profiling: bool = False,
+    ):
+        """Create the middleware.
+
+        Args:
+            app (ASGIApp): The application.
+            mode (ProfilingMode): Which requests are profiled.
+            cluster_profiling (bool): Whether `X-Profile: cluster` attaches the profile of
+                the cluster, otherwise it only gets the `Server-Timing` header.
+        """
+        self.app = app
+        self.mode = mode
+        self.cluster_profiling = cluster_profiling
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profile an HTTP request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = dict(scope["headers"]).get(PROFILE_HEADER)
+        if self.mode == ProfilingMode.HEADER and header is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = Profiler(
+            cluster=self.cluster_profiling and header == CLUSTER_PROFILE
+        )
+        scope.setdefault("state", {})[STATE_KEY] = profiler
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profiler.server_timing())
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+def setup_profiling(
+    app: FastAPI,
+    profiling: Optional[str] = None,
+    cluster_profiling: Optional[str] = None,
+) -> None:
+    """Set up the profiling middleware.
+
+    Args:
+        app (FastAPI): The application.
+        profiling (Optional[str]): The profiling mode, read from the
+            `STAC_FASTAPI_PROFILING` environment variable if not given.
+        cluster_profiling (Optional[str]): `true` to honour `X-Profile: cluster`, read
+            from the `STAC_FASTAPI_CLUSTER_PROFILING` environment variable if not given.
+    """
+    mode = get_profiling_mode(profiling)
+    if mode == ProfilingMode.OFF:
+        return
+    cluster = cluster_profiling_enabled(cluster_profiling)
+    logger.info(
+        f"Setting up profiling with STAC_FASTAPI_PROFILING={mode.value}, "
+        f"cluster profiles {'allowed' if cluster else 'disabled'}"
+    )
+    app.add_middleware(ProfilingMiddleware, mode=mode, cluster_profiling=cluster)
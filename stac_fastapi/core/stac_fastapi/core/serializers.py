@@ -6,10 +6,17 @@ from typing import Any, List, Optional
 import attr
 from starlette.requests import Request
 
+from stac_fastapi.core.context import get_request_context
 from stac_fastapi.core.datetime_utils import now_to_rfc3339_str
-from stac_fastapi.core.models.links import CollectionLinks
+from stac_fastapi.core.envelope import (
+    ENVELOPE_FIELD,
+    BBoxFilterMode,
+    bbox_envelope,
+    get_bbox_filter_mode,
+)
+from stac_fastapi.core.models.links import CollectionLinks, item_links_template
 from stac_fastapi.types import stac as stac_types
-from stac_fastapi.types.links import ItemLinks, resolve_links
+from stac_fastapi.types.links import resolve_links
 
 
 @attr.s
@@ -69,6 +76,12 @@ class ItemSerializer(Serializer):
         if "created" not in stac_data["properties"]:
             stac_data["properties"]["created"] = now
         stac_data["properties"]["updated"] = now
+
+        # indexed for the envelope bbox filter, see `stac_fastapi.core.envelope`
+        if get_bbox_filter_mode() != BBoxFilterMode.GEOMETRY:
+            envelope = bbox_envelope(stac_data)
+            if envelope is not None:
+                stac_data[ENVELOPE_FIELD] = envelope
         return stac_data
 
     @classmethod
@@ -84,9 +97,9 @@ class ItemSerializer(Serializer):
         """
         item_id = item["id"]
         collection_id = item["collection"]
-        item_links = ItemLinks(
-            collection_id=collection_id, item_id=item_id, base_url=base_url
-        ).create_links()
+        item_links = item_links_template(base_url).create_links(
+            collection_id=collection_id, item_id=item_id
+        )
 
         original_links = item.get("links", [])
         if original_links:
@@ -125,7 +138,7 @@ class CollectionSerializer(Serializer):
         """
         collection = deepcopy(collection)
         collection["links"] = resolve_links(
-            collection.get("links", []), str(request.base_url)
+            collection.get("links", []), get_request_context(request).base_url
         )
         return collection
 
@@ -170,7 +183,9 @@ class CollectionSerializer(Serializer):
         # Add any additional links from the collection dictionary
         original_links = collection.get("links")
         if original_links:
-            collection_links += resolve_links(original_links, str(request.base_url))
+            collection_links += resolve_links(
+                original_links, get_request_context(request).base_url
+            )
         collection["links"] = collection_links
 
         # Return the stac_types.Collection object
@@ -0,0 +1,205 @@
+"""Streaming and raw item search responses."""
+
+import os
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from stac_fastapi.core.models.links import PagingLinks
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+GEOJSON_SEQ_MEDIA_TYPE = "application/geo+json-seq"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# RFC 8142 prefixes every GeoJSON text of a sequence with a record separator
+RECORD_SEPARATOR = b"\x1e"
+
+FEATURE_COLLECTION_HEAD = b'{"type":"FeatureCollection","features":['
+
+
+def streaming_enabled() -> bool:
+    """Check the `STAC_FASTAPI_STREAMING_RESPONSES` environment variable.
+
+    Returns:
+        bool: True if item searches stream their FeatureCollection, False by default.
+    """
+    return os.getenv("STAC_FASTAPI_STREAMING_RESPONSES", "false").lower() == "true"
+
+
+def raw_responses_enabled() -> bool:
+    """Check the `STAC_FASTAPI_RAW_RESPONSES` environment variable.
+
+    Returns:
+        bool: True if item searches encode their FeatureCollection to a raw response,
+        False by default.
+    """
+    return os.getenv("STAC_FASTAPI_RAW_RESPONSES", "false").lower() == "true"
+
+
+def streaming_media_type(request: Request) -> Optional[str]:
+    """Get the media type of the streaming response for an item search request.
+
+    Args:
+        request (Request): The item search request.
+
+    Returns:
+        Optional[str]: `application/geo+json-seq` if the request accepts it,
+        `application/geo+json` if streaming responses are enabled, or None to return a
+        regular response.
+    """
+    accept = request.headers.get("accept", "")
+    if GEOJSON_SEQ_MEDIA_TYPE in (
+        media_range.split(";")[0].strip() for media_range in accept.split(",")
+    ):
+        return GEOJSON_SEQ_MEDIA_TYPE
+    if streaming_enabled():
+        return GEOJSON_MEDIA_TYPE
+    return None
+
+
+def feature_collection_chunks(
+    features: Iterable[Dict[str, Any]],
+    links: List[Dict[str, Any]],
+    matched: Optional[int],
+) -> Iterator[bytes]:
+    """Serialize a FeatureCollection one feature at a time.
+
+    Args:
+        features (Iterable[Dict[str, Any]]): The features, serialized as they are consumed.
+        links (List[Dict[str, Any]]): The links of the FeatureCollection.
+        matched (Optional[int]): The number of matched items, left out if None.
+
+    Yields:
+        bytes: The chunks of the FeatureCollection JSON document.
+    """
+    yield FEATURE_COLLECTION_HEAD
+    returned = 0
+    for feature in features:
+        yield (b"," if returned else b"") + orjson.dumps(feature)
+        returned += 1
+    tail: Dict[str, Any] = {"links": links, "numReturned": returned}
+    if matched is not None:
+        tail["numMatched"] = matched
+    # splice the remaining members into the open FeatureCollection object
+    yield b"]," + orjson.dumps(tail)[1:]
+
+
+async def stream_feature_collection(
+    features: Iterable[Dict[str, Any]],
+    links: List[Dict[str, Any]],
+    matched: Optional[int],
+) -> AsyncIterator[bytes]:
+    """Serialize a FeatureCollection one feature at a time, see `feature_collection_chunks`.
+
+    Yields:
+        bytes: The chunks of the FeatureCollection JSON document.
+    """
+    for chunk in feature_collection_chunks(features, links, matched):
+        yield chunk
+
+
+async def stream_geojson_seq(
+    features: Iterable[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """Serialize features as a GeoJSON text sequence (RFC 8142).
+
+    Args:
+        features (Iterable[Dict[str, Any]]): The features, serialized as they are consumed.
+
+    Yields:
+        bytes: One record separator prefixed, newline terminated feature at a time.
+    """
+    for feature in features:
+        yield RECORD_SEPARATOR + orjson.dumps(feature) + b"\n"
+
+
+async def stream_ndjson(
+    features: AsyncIterable[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """Serialize features as newline delimited JSON.
+
+    Args:
+        features (AsyncIterable[Dict[str, Any]]): The features, serialized as they are read.
+
+    Yields:
+        bytes: One newline terminated feature at a time.
+    """
+    async for feature in features:
+        yield orjson.dumps(feature) + b"\n"
+
+
+async def streaming_item_collection(
+    request: Request,
+    features: Iterable[Dict[str, Any]],
+    next_token: Optional[str],
+    matched: Optional[int],
+    media_type: str,
+) -> StreamingResponse:
+    """Create a streaming response for the results of an item search.
+
+    Args:
+        request (Request): The item search request.
+        features (Iterable[Dict[str, Any]]): The features of the page, ideally a generator
+            so that each feature is only serialized when it is written.
+        next_token (Optional[str]): The token of the next page, if any.
+        matched (Optional[int]): The number of matched items, if counted.
+        media_type (str): The media type of the response, see `streaming_media_type`.
+
+    Returns:
+        StreamingResponse: A FeatureCollection for `application/geo+json`, or the bare
+        features for `application/geo+json-seq`. A sequence has no place for links, so the
+        `next` link of a GET request is sent as a `Link` header instead.
+    """
+    links = await PagingLinks(request=request, next=next_token).get_links()
+
+    if media_type == GEOJSON_SEQ_MEDIA_TYPE:
+        headers = {}
+        next_link = next((link for link in links if link["rel"] == "next"), None)
+        if next_link and next_link["method"] == "GET":
+            headers["Link"] = f'<{next_link["href"]}>; rel="next"'
+        return StreamingResponse(
+            stream_geojson_seq(features), media_type=media_type, headers=headers
+        )
+
+    return StreamingResponse(
+        stream_feature_collection(features, links, matched), media_type=media_type
+    )
+
+
+async def raw_item_collection(
+    request: Request,
+    features: Iterable[Dict[str, Any]],
+    next_token: Optional[str],
+    matched: Optional[int],
+) -> Response:
+    """Encode the results of an item search straight to a response body.
+
+    The features are dumped with orjson and spliced into the FeatureCollection, which
+    skips the `jsonable_encoder` pass FastAPI makes over the whole document of a
+    regular response.
+
+    Args:
+        request (Request): The item search request.
+        features (Iterable[Dict[str, Any]]): The features of the page.
+        next_token (Optional[str]): The token of the next page, if any.
+        matched (Optional[int]): The number of matched items, if counted.
+
+    Returns:
+        Response: The `application/geo+json` FeatureCollection.
+    """
+    links = await PagingLinks(request=request, next=next_token).get_links()
+    return Response(
+        b"".join(feature_collection_chunks(features, links, matched)),
+        media_type=GEOJSON_MEDIA_TYPE,
+    )
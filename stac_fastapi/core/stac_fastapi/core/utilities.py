@@ -3,12 +3,21 @@
 This module contains functions for transforming geospatial coordinates,
 such as converting bounding boxes to polygon representations.
 """
-from typing import Any, Dict, List, Optional, Set, Union
+import asyncio
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
 from stac_fastapi.types.stac import Item
 
 MAX_LIMIT = 10000
 
+T = TypeVar("T")
+
+# Fields `ItemSerializer.db_to_stac` needs to build the links of an item. These are
+# always fetched from the database, whatever the fields extension include/exclude sets.
+ITEM_REQUIRED_SOURCE_FIELDS = {"id", "collection", "links"}
+
 
 def bbox2polygon(b0: float, b1: float, b2: float, b3: float) -> List[List[List[float]]]:
     """Transform a bounding box represented by its four coordinates `b0`, `b1`, `b2`, and `b3` into a polygon.
@@ -25,6 +34,134 @@ def bbox2polygon(b0: float, b1: float, b2: float, b3: float) -> List[List[List[f
     return [[[b0, b1], [b2, b1], [b2, b3], [b0, b3], [b0, b1]]]
 
 
+def encode_token(search_after: List[Any], pit_id: Optional[str] = None) -> str:
+    """Encode the sort values of the last item of a page into a pagination token.
+
+    Args:
+        search_after (List[Any]): The sort values to search after.
+        pit_id (Optional[str]): The id of the point in time the pages are read from.
+
+    Returns:
+        str: The base64 encoded JSON pagination token. Without a point in time this is
+        the sort values array, otherwise an object with the point in time id as `pit`.
+    """
+    value = {"pit": pit_id, "search_after": search_after} if pit_id else search_after
+    return urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def decode_token(token: str) -> Tuple[List[Any], Optional[str]]:
+    """Decode a pagination token created by `encode_token`.
+
+    Args:
+        token (str): The pagination token.
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: The sort values to search after, and the id of
+        the point in time if the token has one.
+    """
+    value = json.loads(urlsafe_b64decode(token).decode())
+    if isinstance(value, dict):
+        return value["search_after"], value.get("pit")
+    return value, None
+
+
+async def merge_async_iterators(
+    iterators: List[AsyncIterator[T]], buffer_size: int = 1
+) -> AsyncIterator[T]:
+    """Consume async iterators concurrently and yield their values as they arrive.
+
+    Args:
+        iterators (List[AsyncIterator[T]]): The iterators to consume, which must not yield None.
+        buffer_size (int): How many values may wait to be yielded. The iterators are not
+            advanced while the buffer is full, which bounds the memory they use.
+
+    Yields:
+        T: The values of all of the iterators, in the order they are produced.
+
+    Raises:
+        Exception: The first error raised by one of the iterators. The other iterators are
+        cancelled, as they are when the returned generator is closed early.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+    # every iterator puts (value, None) for its values, then (None, error) when it
+    # fails or (None, None) when it is exhausted
+    async def consume(iterator: AsyncIterator[T]) -> None:
+        try:
+            async for value in iterator:
+                await queue.put((value, None))
+        except Exception as e:
+            await queue.put((None, e))
+        else:
+            await queue.put((None, None))
+
+    tasks = [asyncio.create_task(consume(iterator)) for iterator in iterators]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            value, error = await queue.get()
+            if error is not None:
+                raise error
+            if value is None:
+                remaining -= 1
+            else:
+                yield value
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def source_filter(
+    include: Optional[Set[str]] = None, exclude: Optional[Set[str]] = None
+) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+    """Translate fields extension include/exclude sets into a database `_source` filter.
+
+    The fields required to serialize an item (see `ITEM_REQUIRED_SOURCE_FIELDS`) are
+    always included and never (partly) excluded, so `filter_fields` gives the same
+    result whether it runs on the full or on the filtered source.
+
+    Args:
+        include (Optional[Set[str]]): The fields to include.
+        exclude (Optional[Set[str]]): The fields to exclude.
+
+    Returns:
+        Tuple[Optional[List[str]], Optional[List[str]]]: The `_source_includes` and
+        `_source_excludes` lists, or None when the respective filter is not needed.
+    """
+    source_includes = sorted(include | ITEM_REQUIRED_SOURCE_FIELDS) if include else None
+    source_excludes = sorted(
+        field
+        for field in exclude or ()
+        if field.split(".")[0] not in ITEM_REQUIRED_SOURCE_FIELDS
+    )
+    return source_includes, source_excludes or None
+
+
+def source_filter_is_complete(
+    include: Optional[Set[str]] = None, exclude: Optional[Set[str]] = None
+) -> bool:
+    """Check whether the `_source` filter alone gives the fields extension result.
+
+    This is the case when only nested fields are excluded: the `_source` filter
+    removes them, and `ItemSerializer.db_to_stac` only fills in defaults for
+    top-level fields, so `filter_fields` would not change the serialized item.
+    Included fields and excluded top-level fields still need `filter_fields`, to
+    drop the defaults `db_to_stac` adds.
+
+    Args:
+        include (Optional[Set[str]]): The fields to include.
+        exclude (Optional[Set[str]]): The fields to exclude.
+
+    Returns:
+        bool: True if `filter_fields` can be skipped.
+    """
+    return not include and all(
+        "." in field and field.split(".")[0] not in ITEM_REQUIRED_SOURCE_FIELDS
+        for field in exclude or ()
+    )
+
+
 # copied from stac-fastapi-pgstac
 # https://github.com/stac-utils/stac-fastapi-pgstac/blob/26f6d918eb933a90833f30e69e21ba3b4e8a7151/stac_fastapi/pgstac/utils.py#L10-L116
 def filter_fields(  # noqa: C901
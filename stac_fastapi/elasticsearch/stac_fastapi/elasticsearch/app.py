@@ -3,20 +3,35 @@
 import os
 
 from stac_fastapi.api.app import StacApi
-from stac_fastapi.api.models import create_get_request_model, create_post_request_model
+from stac_fastapi.api.models import (
+    ItemCollectionUri,
+    create_get_request_model,
+    create_post_request_model,
+    create_request_model,
+)
 from stac_fastapi.core.core import (
-    BulkTransactionsClient,
+    AsyncBulkTransactionsClient,
     CoreClient,
     EsAsyncBaseFiltersClient,
     TransactionsClient,
 )
-from stac_fastapi.core.extensions import QueryExtension
+from stac_fastapi.core.etag import setup_etags
+from stac_fastapi.core.extensions import (
+    BatchSearchExtension,
+    CountExtension,
+    ExportExtension,
+    IngestExtension,
+    PatchExtension,
+    QueryExtension,
+)
 from stac_fastapi.core.extensions.aggregation import (
     EsAggregationExtensionGetRequest,
     EsAggregationExtensionPostRequest,
     EsAsyncAggregationClient,
 )
 from stac_fastapi.core.extensions.fields import FieldsExtension
+from stac_fastapi.core.metrics import setup_metrics
+from stac_fastapi.core.profiling import setup_profiling
 from stac_fastapi.core.rate_limit import setup_rate_limit
 from stac_fastapi.core.route_dependencies import get_route_dependencies
 from stac_fastapi.core.session import Session
@@ -54,15 +69,16 @@ aggregation_extension = AggregationExtension(
 aggregation_extension.POST = EsAggregationExtensionPostRequest
 aggregation_extension.GET = EsAggregationExtensionGetRequest
 
+count_extension = CountExtension()
+
+transactions_client = TransactionsClient(
+    database=database_logic, session=session, settings=settings
+)
+
 search_extensions = [
-    TransactionExtension(
-        client=TransactionsClient(
-            database=database_logic, session=session, settings=settings
-        ),
-        settings=settings,
-    ),
+    TransactionExtension(client=transactions_client, settings=settings),
     BulkTransactionExtension(
-        client=BulkTransactionsClient(
+        client=AsyncBulkTransactionsClient(
             database=database_logic,
             session=session,
             settings=settings,
@@ -74,13 +90,46 @@ search_extensions = [
     TokenPaginationExtension(),
     filter_extension,
     FreeTextExtension(),
+    count_extension,
 ]
 
-extensions = [aggregation_extension] + search_extensions
+post_request_model = create_post_request_model(search_extensions)
+items_get_request_model = create_request_model(
+    "ItemCollectionURI",
+    base_model=ItemCollectionUri,
+    extensions=[count_extension],
+    request_type="GET",
+)
+
+core_client = CoreClient(
+    database=database_logic, session=session, post_request_model=post_request_model
+)
 
-database_logic.extensions = [type(ext).__name__ for ext in extensions]
+export_extension = ExportExtension(
+    client=core_client, search_post_request_model=post_request_model
+)
 
-post_request_model = create_post_request_model(search_extensions)
+batch_search_extension = BatchSearchExtension(
+    client=core_client, search_post_request_model=post_request_model
+)
+
+ingest_extension = IngestExtension(
+    client=AsyncBulkTransactionsClient(
+        database=database_logic, session=session, settings=settings
+    )
+)
+
+patch_extension = PatchExtension(client=transactions_client)
+
+extensions = [
+    aggregation_extension,
+    export_extension,
+    batch_search_extension,
+    ingest_extension,
+    patch_extension,
+] + search_extensions
+
+database_logic.extensions = [type(ext).__name__ for ext in extensions]
 
 api = StacApi(
     title=os.getenv("STAC_FASTAPI_TITLE", "stac-fastapi-elasticsearch"),
@@ -88,19 +137,31 @@ api = StacApi(
     api_version=os.getenv("STAC_FASTAPI_VERSION", "2.1"),
     settings=settings,
     extensions=extensions,
-    client=CoreClient(
-        database=database_logic, session=session, post_request_model=post_request_model
-    ),
+    client=core_client,
     search_get_request_model=create_get_request_model(search_extensions),
     search_post_request_model=post_request_model,
+    items_get_request_model=items_get_request_model,
     route_dependencies=get_route_dependencies(),
 )
 app = api.app
 app.root_path = os.getenv("STAC_FASTAPI_ROOT_PATH", "")
 
+# Add item ETags
+setup_etags(app)
+
 # Add rate limit
 setup_rate_limit(app, rate_limit=os.getenv("STAC_FASTAPI_RATE_LIMIT"))
 
+# Add profiling
+setup_profiling(
+    app,
+    profiling=os.getenv("STAC_FASTAPI_PROFILING"),
+    cluster_profiling=os.getenv("STAC_FASTAPI_CLUSTER_PROFILING"),
+)
+
+# Add metrics
+setup_metrics(app, metrics=os.getenv("STAC_FASTAPI_METRICS"), database=database_logic)
+
 
 @app.on_event("startup")
 async def _startup_event() -> None:
@@ -1,12 +1,23 @@
 """Database logic."""
 
 import asyncio
-import json
 import logging
 import os
-from base64 import urlsafe_b64decode, urlsafe_b64encode
 from copy import deepcopy
-from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple, Type, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import attr
 from opensearchpy import exceptions, helpers
@@ -16,13 +27,65 @@ from opensearchpy.helpers.search import Search
 from starlette.requests import Request
 
 from stac_fastapi.core import serializers
-from stac_fastapi.core.extensions import filter
-from stac_fastapi.core.utilities import MAX_LIMIT, bbox2polygon
+from stac_fastapi.core.bulk import (
+    BulkItemResult,
+    BulkOptions,
+    bulk_item_result,
+    bulk_op_type,
+    concurrent_streaming_bulk,
+    conflict_result,
+)
+from stac_fastapi.core.cache import MISSING, CollectionCache, FilterCache, SearchCache
+from stac_fastapi.core.envelope import (
+    ENVELOPE_FIELD,
+    ENVELOPE_MAPPING,
+    ENVELOPE_SCRIPT,
+    BBoxFilterMode,
+    envelope_coordinates,
+    get_bbox_filter_mode,
+)
+from stac_fastapi.core.etag import ItemVersion, PreconditionFailedError, replace_script
+from stac_fastapi.core.extensions.count import CountMode, track_total_hits
+from stac_fastapi.core.extents import CollectionExtents
+from stac_fastapi.core.full_text import (
+    full_text_property_mappings,
+    full_text_query,
+    get_full_text_properties,
+    with_full_text_mappings,
+)
+from stac_fastapi.core.metrics import cluster_call, observe_count
+from stac_fastapi.core.partitions import (
+    PartitionInterval,
+    get_partition_interval,
+    partition_suffix,
+    partition_suffixes,
+)
+from stac_fastapi.core.patch import (
+    ItemPatch,
+    bulk_patch_result,
+    not_found_result,
+    patch_error_reason,
+    patch_error_status,
+)
+from stac_fastapi.core.profiling import Profiler, profile_stage
+from stac_fastapi.core.utilities import (
+    MAX_LIMIT,
+    bbox2polygon,
+    decode_token,
+    encode_token,
+    merge_async_iterators,
+    source_filter,
+)
 from stac_fastapi.opensearch.config import (
     AsyncOpensearchSettings as AsyncSearchSettings,
 )
 from stac_fastapi.opensearch.config import OpensearchSettings as SyncSearchSettings
-from stac_fastapi.types.errors import ConflictError, NotFoundError
+from stac_fastapi.types.errors import (
+    ConflictError,
+    DatabaseError,
+    InvalidQueryParameter,
+    NotFoundError,
+)
 from stac_fastapi.types.stac import Collection, Item
 
 logger = logging.getLogger(__name__)
@@ -48,6 +111,13 @@ ES_INDEX_NAME_UNSUPPORTED_CHARS = {
 
 ITEM_INDICES = f"{ITEMS_INDEX_PREFIX}*,-*kibana*,-{COLLECTIONS_INDEX}*"
 
+# the item properties copied to the full text field of the free text search
+FULL_TEXT_PROPERTIES = get_full_text_properties()
+
+# longer index lists are replaced with the collection aliases, to stay within the
+# maximum length of the request line
+MAX_INDICES_LENGTH = 2048
+
 DEFAULT_SORT = {
     "properties.datetime": {"order": "desc"},
     "id": {"order": "desc"},
@@ -115,6 +185,7 @@ ES_ITEMS_MAPPINGS = {
         "id": {"type": "keyword"},
         "collection": {"type": "keyword"},
         "geometry": {"type": "geo_shape"},
+        ENVELOPE_FIELD: ENVELOPE_MAPPING,
         "assets": {"type": "object", "enabled": False},
         "links": {"type": "object", "enabled": False},
         "properties": {
@@ -133,6 +204,7 @@ ES_ITEMS_MAPPINGS = {
         },
     },
 }
+ES_ITEMS_MAPPINGS = with_full_text_mappings(ES_ITEMS_MAPPINGS, FULL_TEXT_PROPERTIES)
 
 ES_COLLECTIONS_MAPPINGS = {
     "numeric_detection": False,
@@ -174,16 +246,36 @@ def index_alias_by_collection_id(collection_id: str) -> str:
     return f"{ITEMS_INDEX_PREFIX}{''.join(c for c in collection_id if c not in ES_INDEX_NAME_UNSUPPORTED_CHARS)}"
 
 
-def indices(collection_ids: Optional[List[str]]) -> str:
+def indices(
+    collection_ids: Optional[List[str]], datetime_suffixes: Optional[List[str]] = None
+) -> str:
     """
     Get a comma-separated string of index names for a given list of collection ids.
 
     Args:
         collection_ids: A list of collection ids.
+        datetime_suffixes: The suffixes of the time partitions to search, see
+            `partition_suffixes`. All of the partitions are searched if None.
 
     Returns:
         A string of comma-separated index names. If `collection_ids` is None, returns the default indices.
     """
+    if datetime_suffixes is not None:
+        bases = (
+            [index_by_collection_id(c) for c in collection_ids]
+            if collection_ids
+            else [f"{ITEMS_INDEX_PREFIX}*"]
+        )
+        # the first index of a collection holds the items without a partition
+        names = [f"{base}-000001" for base in bases] + [
+            f"{base}_{suffix}" for base in bases for suffix in datetime_suffixes
+        ]
+        if not collection_ids:
+            names += ["-*kibana*", f"-{COLLECTIONS_INDEX}*"]
+        partition_indices = ",".join(names)
+        if len(partition_indices) <= MAX_INDICES_LENGTH:
+            return partition_indices
+
     if collection_ids is None or collection_ids == []:
         return ITEM_INDICES
     else:
@@ -305,23 +397,56 @@ def mk_item_id(item_id: str, collection_id: str):
     return f"{item_id}|{collection_id}"
 
 
-def mk_actions(collection_id: str, processed_items: List[Item]):
+def item_index_by_partition(
+    collection_id: str, item: Item, partition: PartitionInterval
+) -> str:
+    """Get the index to write an Item to.
+
+    Args:
+        collection_id (str): The id of the Collection that the Item belongs to.
+        item (Item): The Item.
+        partition (PartitionInterval): The partition interval of the item indices.
+
+    Returns:
+        str: The alias of the Collection if the item indices are not partitioned. Otherwise
+        the partition of the Item datetime, or the first index of the Collection if the
+        Item has no datetime.
+    """
+    if partition == PartitionInterval.NONE:
+        return index_alias_by_collection_id(collection_id)
+    suffix = partition_suffix(item["properties"].get("datetime"), partition)
+    if suffix is None:
+        return f"{index_by_collection_id(collection_id)}-000001"
+    return f"{index_by_collection_id(collection_id)}_{suffix}"
+
+
+def mk_actions(
+    collection_id: str,
+    processed_items: List[Item],
+    partition: PartitionInterval = PartitionInterval.NONE,
+    op_type: str = "index",
+):
     """Create Elasticsearch bulk actions for a list of processed items.
 
     Args:
         collection_id (str): The identifier for the collection the items belong to.
         processed_items (List[Item]): The list of processed items to be bulk indexed.
+        partition (PartitionInterval): The partition interval of the item indices.
+        op_type (str): The bulk operation, `index` to overwrite existing items or
+            `create` to fail on existing items.
 
     Returns:
         List[Dict[str, Union[str, Dict]]]: The list of bulk actions to be executed,
         each action being a dictionary with the following keys:
+        - `_op_type`: the bulk operation.
         - `_index`: the index to store the document in.
         - `_id`: the document's identifier.
         - `_source`: the source of the document.
     """
     return [
         {
-            "_index": index_alias_by_collection_id(collection_id),
+            "_op_type": op_type,
+            "_index": item_index_by_partition(collection_id, item, partition),
             "_id": mk_item_id(item["id"], item["collection"]),
             "_source": item,
         }
@@ -353,6 +478,25 @@ class DatabaseLogic:
 
     extensions: List[str] = attr.ib(default=attr.Factory(list))
 
+    pit_pagination: bool = attr.ib(
+        factory=lambda: os.getenv("STAC_FASTAPI_PIT_PAGINATION", "false").lower()
+        == "true"
+    )
+    pit_keep_alive: str = attr.ib(
+        factory=lambda: os.getenv("STAC_FASTAPI_PIT_KEEP_ALIVE", "1m")
+    )
+
+    search_cache: SearchCache = attr.ib(factory=SearchCache.from_env)
+    collection_cache: CollectionCache = attr.ib(factory=CollectionCache.from_env)
+    filter_cache: FilterCache = attr.ib(factory=FilterCache.from_env)
+
+    collection_extents: CollectionExtents = attr.ib(factory=CollectionExtents.from_env)
+
+    items_partition: PartitionInterval = attr.ib(factory=get_partition_interval)
+    bulk_options: BulkOptions = attr.ib(factory=BulkOptions.from_env)
+    # the item partitions known to exist
+    _item_partitions: Set[str] = attr.ib(factory=set, init=False, repr=False)
+
     aggregation_mapping: Dict[str, Dict[str, Any]] = {
         "total_count": {"value_count": {"field": "id"}},
         "collection_frequency": {"terms": {"field": "collection", "size": 100}},
@@ -426,6 +570,7 @@ class DatabaseLogic:
 
     """CORE LOGIC"""
 
+    @cluster_call
     async def get_all_collections(
         self, token: Optional[str], limit: int, request: Request
     ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
@@ -471,6 +616,42 @@ class DatabaseLogic:
 
         return collections, next_token
 
+    async def _find_item(self, collection_id: str, item_id: str) -> Optional[Dict]:
+        """Find the document of an item.
+
+        Args:
+            collection_id (str): The id of the Collection that the Item belongs to.
+            item_id (str): The id of the Item.
+
+        Returns:
+            Optional[Dict]: The get response or search hit of the Item, with its `_index`, `_source`,
+            `_seq_no` and `_primary_term`, None if the Item does not exist.
+
+        Notes:
+            A get needs a single index, so with partitioned item indices the Item is searched by id instead.
+        """
+        if self.items_partition != PartitionInterval.NONE:
+            response = await self.client.search(
+                index=index_alias_by_collection_id(collection_id),
+                body={
+                    "query": {"ids": {"values": [mk_item_id(item_id, collection_id)]}},
+                    "size": 1,
+                    "seq_no_primary_term": True,
+                },
+                ignore_unavailable=True,
+            )
+            hits = response["hits"]["hits"]
+            return hits[0] if hits else None
+
+        try:
+            return await self.client.get(
+                index=index_alias_by_collection_id(collection_id),
+                id=mk_item_id(item_id, collection_id),
+            )
+        except exceptions.NotFoundError:
+            return None
+
+    @cluster_call
     async def get_one_item(self, collection_id: str, item_id: str) -> Dict:
         """Retrieve a single item from the database.
 
@@ -487,17 +668,37 @@ class DatabaseLogic:
         Notes:
             The Item is retrieved from the Elasticsearch database using the `client.get` method,
             with the index for the Collection as the target index and the combined `mk_item_id` as the document id.
+            A get needs a single index, so with partitioned item indices the Item is searched by id instead.
         """
-        try:
-            item = await self.client.get(
-                index=index_alias_by_collection_id(collection_id),
-                id=mk_item_id(item_id, collection_id),
+        response = await self._find_item(collection_id, item_id)
+        if response is None:
+            raise NotFoundError(
+                f"Item {item_id} does not exist in Collection {collection_id}"
             )
-        except exceptions.NotFoundError:
+        return response["_source"]
+
+    @cluster_call
+    async def get_one_item_version(
+        self, collection_id: str, item_id: str
+    ) -> Tuple[Dict, Optional[ItemVersion]]:
+        """Retrieve a single item from the database, with its version.
+
+        Args:
+            collection_id (str): The id of the Collection that the Item belongs to.
+            item_id (str): The id of the Item.
+
+        Returns:
+            Tuple[Dict, Optional[ItemVersion]]: The source data of the Item, and its version.
+
+        Raises:
+            NotFoundError: If the specified Item does not exist in the Collection.
+        """
+        response = await self._find_item(collection_id, item_id)
+        if response is None:
             raise NotFoundError(
                 f"Item {item_id} does not exist in Collection {collection_id}"
             )
-        return item["_source"]
+        return response["_source"], ItemVersion.from_response(response)
 
     @staticmethod
     def make_search():
@@ -516,10 +717,21 @@ class DatabaseLogic:
 
     @staticmethod
     def apply_free_text_filter(search: Search, free_text_queries: Optional[List[str]]):
-        """Database logic to perform query for search endpoint."""
+        """Database logic to perform query for search endpoint.
+
+        With `STAC_FASTAPI_FULL_TEXT_PROPERTIES` set, the free text queries are matched as
+        phrases against the full text field, otherwise a `query_string` query matches
+        them against every property of the items.
+        """
         if free_text_queries is not None:
+            if FULL_TEXT_PROPERTIES:
+                query = full_text_query(free_text_queries)
+                if query is not None:
+                    search = search.filter(query)
+                return search
+
             free_text_query_string = '" OR properties.\\*:"'.join(free_text_queries)
-            search = search.query(
+            search = search.filter(
                 "query_string", query=f'properties.\\*:"{free_text_query_string}"'
             )
 
@@ -561,9 +773,32 @@ class DatabaseLogic:
             search (Search): The search object with the bounding box filter applied.
 
         Notes:
-            The bounding box is transformed into a polygon using the `bbox2polygon` function and
-            a geo_shape filter is added to the search object, set to intersect with the specified polygon.
+            By default, the bounding box is transformed into a polygon using the `bbox2polygon`
+            function and a geo_shape filter is added to the search object, set to intersect with
+            the specified polygon. With `STAC_FASTAPI_BBOX_FILTER` set to `envelope`, the filter
+            intersects the indexed bbox envelopes of the items instead, and with `exact`, it
+            intersects both the envelopes and the geometries.
         """
+        mode = get_bbox_filter_mode()
+        if mode != BBoxFilterMode.GEOMETRY:
+            search = search.filter(
+                Q(
+                    {
+                        "geo_shape": {
+                            ENVELOPE_FIELD: {
+                                "shape": {
+                                    "type": "envelope",
+                                    "coordinates": envelope_coordinates(bbox),
+                                },
+                                "relation": "intersects",
+                            }
+                        }
+                    }
+                )
+            )
+            if mode == BBoxFilterMode.ENVELOPE:
+                return search
+
         return search.filter(
             Q(
                 {
@@ -635,28 +870,28 @@ class DatabaseLogic:
 
         return search
 
-    @staticmethod
-    def apply_cql2_filter(search: Search, _filter: Optional[Dict[str, Any]]):
+    def apply_cql2_filter(self, search: Search, _filter: Optional[Dict[str, Any]]):
         """
         Apply a CQL2 filter to an Opensearch Search object.
 
-        This method transforms a dictionary representing a CQL2 filter into an Opensearch query
-        and applies it to the provided Search object. If the filter is None, the original Search
-        object is returned unmodified.
+        This method transforms a dictionary representing a CQL2 filter into an optimized Opensearch
+        query and applies it to the provided Search object, in the non-scoring filter context. If
+        the filter is None, the original Search object is returned unmodified.
 
         Args:
             search (Search): The Opensearch Search object to which the filter will be applied.
             _filter (Optional[Dict[str, Any]]): The filter in dictionary form that needs to be applied
                                                 to the search. The dictionary should follow the structure
                                                 required by the `to_es` function which converts it
-                                                to an Opensearch query.
+                                                to an Opensearch query. The query is
+                                                cached in `filter_cache`.
 
         Returns:
             Search: The modified Search object with the filter applied if a filter is provided,
                     otherwise the original Search object.
         """
         if _filter is not None:
-            es_query = filter.to_es(_filter)
+            es_query = self.filter_cache.to_es(_filter)
             search = search.filter(es_query)
 
         return search
@@ -669,6 +904,108 @@ class DatabaseLogic:
         else:
             return None
 
+    def item_indices(
+        self,
+        collection_ids: Optional[List[str]],
+        datetime_search: Optional[Dict[str, Optional[str]]] = None,
+    ) -> str:
+        """Get the item indices to search.
+
+        Args:
+            collection_ids (Optional[List[str]]): The collection ids to search.
+            datetime_search (Optional[Dict[str, Optional[str]]]): The datetime filter of the search.
+
+        Returns:
+            str: The comma-separated indices. With partitioned item indices and a bounded
+            datetime filter, only the partitions overlapping the datetime interval.
+        """
+        if self.items_partition == PartitionInterval.NONE:
+            return indices(collection_ids)
+        return indices(collection_ids, partition_suffixes(datetime_search))
+
+    async def collections_by_extent(
+        self,
+        bbox: Optional[List[float]],
+        datetime_search: Optional[Dict[str, Optional[str]]],
+    ) -> Optional[List[str]]:
+        """Get the collections whose extent can match a catalog-wide search.
+
+        Args:
+            bbox (Optional[List[float]]): The 2D bbox of the search.
+            datetime_search (Optional[Dict[str, Optional[str]]]): The datetime filter of the search.
+
+        Returns:
+            Optional[List[str]]: The ids of the matching collections, or None to search
+            all of the collections, because extent pruning is disabled, the search has
+            neither a bbox nor a datetime, or too many collections match to list them.
+        """
+        collection_ids = await self.collection_extents.matching_collections(
+            self.get_collection_extents,
+            self.collections_version,
+            bbox=bbox,
+            datetime_search=datetime_search,
+        )
+        if collection_ids and len(indices(collection_ids)) > MAX_INDICES_LENGTH:
+            return None
+        return collection_ids
+
+    @cluster_call
+    async def get_collection_extents(self) -> List[Dict[str, Any]]:
+        """Read the id and extent of all of the collections.
+
+        Returns:
+            List[Dict[str, Any]]: The collections, with only their `id` and `extent`.
+        """
+        collections: List[Dict[str, Any]] = []
+        search_after = None
+        while True:
+            response = await self.client.search(
+                index=COLLECTIONS_INDEX,
+                body={
+                    "sort": [{"id": {"order": "asc"}}],
+                    "size": MAX_LIMIT,
+                    "search_after": search_after,
+                    "_source": ["id", "extent"],
+                },
+            )
+            hits = response["hits"]["hits"]
+            collections.extend(hit["_source"] for hit in hits)
+            if len(hits) < MAX_LIMIT:
+                return collections
+            search_after = hits[-1]["sort"]
+
+    @staticmethod
+    def page_results(
+        response: Dict[str, Any], limit: int, pit_id: Optional[str] = None
+    ) -> Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]:
+        """Read a page of items from a search response.
+
+        Args:
+            response (Dict[str, Any]): The search response, of a search of `limit + 1` items.
+            limit (int): The number of items of the page.
+            pit_id (Optional[str]): The id of the point in time of the search, if any.
+
+        Returns:
+            Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]: The items of the page, the matched
+            count if it was computed exactly, and the token of the next page, if any.
+        """
+        hits = response["hits"]["hits"]
+        items = (hit["_source"] for hit in hits[:limit])
+
+        next_token = None
+        if len(hits) > limit and limit < MAX_LIMIT:
+            if hits and (sort_array := hits[limit - 1].get("sort")):
+                next_token = encode_token(sort_array, pit_id)
+
+        # hits.total is missing when the count is disabled, and only a lower
+        # bound ("gte") when there are more hits than the count bound
+        total = response["hits"].get("total")
+        observe_count(total)
+        matched = total["value"] if total and total["relation"] == "eq" else None
+
+        return items, matched, next_token
+
+    @cluster_call
     async def execute_search(
         self,
         search: Search,
@@ -677,6 +1014,12 @@ class DatabaseLogic:
         sort: Optional[Dict[str, Dict[str, str]]],
         collection_ids: Optional[List[str]],
         ignore_unavailable: bool = True,
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
+        count_mode: Optional[CountMode] = None,
+        datetime_search: Optional[Dict[str, Optional[str]]] = None,
+        bbox: Optional[List[float]] = None,
+        profiler: Optional[Profiler] = None,
     ) -> Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]:
         """Execute a search query with limit and other optional parameters.
 
@@ -687,17 +1030,35 @@ class DatabaseLogic:
             sort (Optional[Dict[str, Dict[str, str]]]): Specifies how the results should be sorted.
             collection_ids (Optional[List[str]]): The collection ids to search.
             ignore_unavailable (bool, optional): Whether to ignore unavailable collections. Defaults to True.
+            include (Optional[Set[str]]): Fields extension fields to include, used as a `_source` filter.
+            exclude (Optional[Set[str]]): Fields extension fields to exclude, used as a `_source` filter.
+            count_mode (Optional[CountMode]): How to count the matched items. Defaults to the deployment count mode.
+            datetime_search (Optional[Dict[str, Optional[str]]]): The datetime filter applied to `search`, used to
+                only search the overlapping time partitions of the item indices.
+            bbox (Optional[List[float]]): The 2D bbox of the spatial filter applied to `search`. With the datetime
+                filter, used to only search the collections whose extent can match a catalog-wide search.
+            profiler (Optional[Profiler]): The profiler of the request, timing the search on the cluster. When the
+                request asks for the cluster profile, the search is profiled by the cluster and not cached.
 
         Returns:
             Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]: A tuple containing:
                 - An iterable of search results, where each result is a dictionary with keys and values representing the
                 fields and values of each document.
-                - The total number of results (if the count could be computed), or None if the count could not be
-                computed.
+                - The total number of results (if the count could be computed), or None if the count is disabled or
+                exceeds the count bound.
                 - The token to be used to retrieve the next set of results, or None if there are no more results.
 
         Raises:
             NotFoundError: If the collections specified in `collection_ids` do not exist.
+            InvalidQueryParameter: If the point in time of the token has expired.
+
+        Notes:
+            With point in time pagination, a first page with a next page opens a point in
+            time on the searched indices and every following page reads from that snapshot,
+            so items written in between do not shift or repeat results. Searches that fit in
+            a single page don't open one. The point in time id is carried in the token, its
+            keep alive is renewed on every page, and it is deleted once the last page has
+            been returned.
         """
         search_body: Dict[str, Any] = {}
         query = search.query.to_dict() if search.query else None
@@ -705,65 +1066,380 @@ class DatabaseLogic:
             search_body["query"] = query
 
         search_after = None
+        pit_id = None
 
         if token:
-            search_after = json.loads(urlsafe_b64decode(token).decode())
+            search_after, pit_id = decode_token(token)
         if search_after:
             search_body["search_after"] = search_after
 
         search_body["sort"] = sort if sort else DEFAULT_SORT
+        search_body["track_total_hits"] = track_total_hits(count_mode)
+
+        search_collection_ids = collection_ids or await self.collections_by_extent(
+            bbox, datetime_search
+        )
+        if search_collection_ids == []:
+            # no collection extent can match the search
+            return [], (0 if track_total_hits(count_mode) else None), None
 
-        index_param = indices(collection_ids)
+        index_param = self.item_indices(search_collection_ids, datetime_search)
 
         max_result_window = MAX_LIMIT
 
         size_limit = min(limit + 1, max_result_window)
 
-        search_task = asyncio.create_task(
-            self.client.search(
+        source_includes, source_excludes = source_filter(include, exclude)
+
+        profile = bool(profiler and profiler.cluster)
+
+        # pages read from a point in time are not cached, their token expires with it
+        cache_key = None
+        if (
+            self.search_cache.enabled
+            and not self.pit_pagination
+            and not pit_id
+            and not profile
+        ):
+            cache_key = self.search_cache.make_key(
+                query=query,
+                sort=sort,
+                token=token,
+                limit=limit,
                 index=index_param,
                 ignore_unavailable=ignore_unavailable,
+                include=include,
+                exclude=exclude,
+                track_total_hits=track_total_hits(count_mode),
+            )
+            if (cached := self.search_cache.get(cache_key)) is not None:
+                return cached
+
+        if pit_id:
+            # a search on a point in time must not name the indices
+            search_body["pit"] = {"id": pit_id, "keep_alive": self.pit_keep_alive}
+            index_args: Dict[str, Any] = {}
+        else:
+            index_args = {
+                "index": index_param,
+                "ignore_unavailable": ignore_unavailable,
+            }
+
+        if profile:
+            search_body["profile"] = True
+
+        search_task = asyncio.create_task(
+            self.client.search(
+                **index_args,
                 body=search_body,
                 size=size_limit,
+                _source_includes=source_includes,
+                _source_excludes=source_excludes,
             )
         )
 
-        count_task = asyncio.create_task(
-            self.client.count(
-                index=index_param,
-                ignore_unavailable=ignore_unavailable,
-                body=search.to_dict(count=True),
+        try:
+            with profile_stage(profiler, "cluster"):
+                es_response = await search_task
+        except exceptions.NotFoundError:
+            if pit_id:
+                raise InvalidQueryParameter(
+                    "The pagination token has expired, restart the search from the first page"
+                )
+            raise NotFoundError(f"Collections '{collection_ids}' do not exist")
+
+        # the point in time id may change between pages, always use the latest one
+        pit_id = es_response.get("pit_id", pit_id)
+
+        if profiler:
+            profiler.add_cluster_response(es_response)
+
+        items, matched, next_token = self.page_results(es_response, limit, pit_id)
+
+        if pit_id and not next_token:
+            await self.delete_point_in_time(pit_id)
+        elif self.pit_pagination and next_token and search_after is None:
+            next_token = await self._point_in_time_token(
+                index_param, query, search_body["sort"], limit
             )
-        )
 
+        if cache_key:
+            items = list(items)
+            self.search_cache.set(cache_key, collection_ids, items, matched, next_token)
+
+        return items, matched, next_token
+
+    async def _point_in_time_token(
+        self,
+        index: str,
+        query: Optional[Dict[str, Any]],
+        sort: Any,
+        limit: int,
+    ) -> Optional[str]:
+        """Create a point in time for the next pages of a search.
+
+        The token of the second page is read from the last item of the first page in the
+        point in time, so its sort values hold the tiebreaker of the point in time searches.
+
+        Args:
+            index (str): The indices of the search.
+            query (Optional[Dict[str, Any]]): The query of the search.
+            sort (Any): The sort of the search.
+            limit (int): The number of items of a page.
+
+        Returns:
+            Optional[str]: The token of the second page, None if the snapshot has no second page.
+        """
         try:
-            es_response = await search_task
+            pit = await self.client.create_pit(
+                index=index, params={"keep_alive": self.pit_keep_alive}
+            )
         except exceptions.NotFoundError:
-            raise NotFoundError(f"Collections '{collection_ids}' do not exist")
+            return None
+        search_body: Dict[str, Any] = {
+            "pit": {"id": pit["pit_id"], "keep_alive": self.pit_keep_alive},
+            "sort": sort,
+            "from": limit - 1,
+            "size": 2,
+            "_source": False,
+            "track_total_hits": False,
+        }
+        if query:
+            search_body["query"] = query
+        response = await self.client.search(body=search_body)
+        pit_id = response.get("pit_id", pit["pit_id"])
+        hits = response["hits"]["hits"]
+        if len(hits) < 2:
+            await self.delete_point_in_time(pit_id)
+            return None
+        return encode_token(hits[0]["sort"], pit_id)
 
-        hits = es_response["hits"]["hits"]
-        items = (hit["_source"] for hit in hits[:limit])
+    @cluster_call
+    async def delete_point_in_time(self, pit_id: str) -> None:
+        """Delete a point in time created for pagination.
 
-        next_token = None
-        if len(hits) > limit and limit < max_result_window:
-            if hits and (sort_array := hits[limit - 1].get("sort")):
-                next_token = urlsafe_b64encode(json.dumps(sort_array).encode()).decode()
+        Args:
+            pit_id (str): The id of the point in time.
+
+        Notes:
+            Errors are logged and not raised, an undeleted point in time is released by the
+            cluster once its keep alive expires.
+        """
+        try:
+            await self.client.delete_pit(body={"pit_id": [pit_id]})
+        except TransportError as e:
+            logger.warning("Failed to delete point in time %s: %s", pit_id, e)
+
+    @cluster_call
+    async def execute_searches(
+        self, searches: List[Dict[str, Any]]
+    ) -> List[Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]]:
+        """Execute several searches in a single multi search request.
+
+        Args:
+            searches (List[Dict[str, Any]]): The arguments of `execute_search` of each search: `search`, `limit`,
+                `token`, `sort` and `collection_ids`, and optionally `include`, `exclude`, `count_mode`,
+                `datetime_search` and `bbox`.
+
+        Returns:
+            List[Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]]: The items, matched count and next
+            token of each search, in the order of `searches`.
+
+        Raises:
+            InvalidQueryParameter: If a token continues a point in time, or a search is invalid.
+            NotFoundError: If the collections of a search do not exist.
+            DatabaseError: If a search failed for another reason.
 
-        matched = (
-            es_response["hits"]["total"]["value"]
-            if es_response["hits"]["total"]["relation"] == "eq"
-            else None
+        Notes:
+            The searches are neither cached nor read from a point in time. A search that no
+            collection extent can match is answered without being sent.
+        """
+        results: List[
+            Optional[Tuple[Iterable[Dict[str, Any]], Optional[int], Optional[str]]]
+        ] = [None] * len(searches)
+        msearch_body: List[Dict[str, Any]] = []
+        sent: List[int] = []
+
+        for position, params in enumerate(searches):
+            search_after, pit_id = (
+                decode_token(params["token"]) if params.get("token") else (None, None)
+            )
+            if pit_id:
+                raise InvalidQueryParameter(
+                    f"The token of search {position} continues a point in time, continue it with POST /search"
+                )
+
+            count_mode = params.get("count_mode")
+            datetime_search = params.get("datetime_search")
+            search_collection_ids = params.get(
+                "collection_ids"
+            ) or await self.collections_by_extent(params.get("bbox"), datetime_search)
+            if search_collection_ids == []:
+                # no collection extent can match the search
+                results[position] = (
+                    [],
+                    (0 if track_total_hits(count_mode) else None),
+                    None,
+                )
+                continue
+
+            body: Dict[str, Any] = {
+                "sort": params.get("sort") or DEFAULT_SORT,
+                "size": min(params["limit"] + 1, MAX_LIMIT),
+                "track_total_hits": track_total_hits(count_mode),
+            }
+            search = params["search"]
+            if search.query:
+                body["query"] = search.query.to_dict()
+            if search_after:
+                body["search_after"] = search_after
+            source_includes, source_excludes = source_filter(
+                params.get("include"), params.get("exclude")
+            )
+            if source_includes or source_excludes:
+                body["_source"] = {
+                    "includes": source_includes or ["*"],
+                    "excludes": source_excludes or [],
+                }
+
+            msearch_body += [
+                {
+                    "index": self.item_indices(search_collection_ids, datetime_search),
+                    "ignore_unavailable": True,
+                },
+                body,
+            ]
+            sent.append(position)
+
+        if sent:
+            response = await self.client.msearch(body=msearch_body)
+            for position, search_response in zip(sent, response["responses"]):
+                if "error" in search_response:
+                    status = search_response.get("status")
+                    reason = search_response["error"]
+                    if isinstance(reason, dict):
+                        reason = reason.get("reason", reason)
+                    if status == 404:
+                        raise NotFoundError(
+                            f"Collections '{searches[position].get('collection_ids')}' do not exist"
+                        )
+                    if status == 400:
+                        raise InvalidQueryParameter(
+                            f"Search {position} is invalid: {reason}"
+                        )
+                    raise DatabaseError(f"Search {position} failed: {reason}")
+                results[position] = self.page_results(
+                    search_response, searches[position]["limit"]
+                )
+
+        return [result for result in results if result is not None]
+
+    async def export_search(
+        self,
+        search: Search,
+        sort: Optional[Dict[str, Dict[str, str]]],
+        collection_ids: Optional[List[str]],
+        include: Optional[Set[str]] = None,
+        exclude: Optional[Set[str]] = None,
+        slices: int = 1,
+        ignore_unavailable: bool = True,
+        datetime_search: Optional[Dict[str, Optional[str]]] = None,
+        bbox: Optional[List[float]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Read every item matching a search, without the `MAX_LIMIT` of a page.
+
+        Args:
+            search (Search): The search query to be executed.
+            sort (Optional[Dict[str, Dict[str, str]]]): Specifies how the results should be sorted.
+            collection_ids (Optional[List[str]]): The collection ids to search.
+            include (Optional[Set[str]]): Fields extension fields to include, used as a `_source` filter.
+            exclude (Optional[Set[str]]): Fields extension fields to exclude, used as a `_source` filter.
+            slices (int): The number of slices of the results read in parallel. Defaults to 1.
+            ignore_unavailable (bool, optional): Whether to ignore unavailable collections. Defaults to True.
+            datetime_search (Optional[Dict[str, Optional[str]]]): The datetime filter applied to `search`, used to
+                only search the overlapping time partitions of the item indices.
+            bbox (Optional[List[float]]): The 2D bbox of the spatial filter applied to `search`. With the datetime
+                filter, used to only search the collections whose extent can match a catalog-wide search.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: The matching items. With more than one slice, the
+            items of the slices are interleaved and the sort order only holds within a slice.
+
+        Raises:
+            NotFoundError: If the collections specified in `collection_ids` do not exist.
+
+        Notes:
+            The items are read from a point in time with `search_after`, `MAX_LIMIT` items
+            per request and slice. The point in time is opened before this method returns,
+            so a missing collection is raised before any item is read, and it is closed once
+            the items have been read or the iterator is closed.
+        """
+        query = search.query.to_dict() if search.query else None
+        source_includes, source_excludes = source_filter(include, exclude)
+
+        search_collection_ids = collection_ids or await self.collections_by_extent(
+            bbox, datetime_search
         )
-        if count_task.done():
+        if search_collection_ids == []:
+            # no collection extent can match the search
+            async def no_items() -> AsyncIterator[Dict[str, Any]]:
+                for item in ():
+                    yield item
+
+            return no_items()
+
+        try:
+            pit = await self.client.create_pit(
+                index=self.item_indices(search_collection_ids, datetime_search),
+                params={"keep_alive": self.pit_keep_alive},
+            )
+        except exceptions.NotFoundError:
+            raise NotFoundError(f"Collections '{collection_ids}' do not exist")
+        pit_id = pit["pit_id"]
+
+        async def read_slice(slice_id: int) -> AsyncIterator[List[Dict[str, Any]]]:
+            search_body: Dict[str, Any] = {
+                "pit": {"id": pit_id, "keep_alive": self.pit_keep_alive},
+                "sort": sort or DEFAULT_SORT,
+                "track_total_hits": False,
+            }
+            if query:
+                search_body["query"] = query
+            if slices > 1:
+                search_body["slice"] = {"id": slice_id, "max": slices}
+            while True:
+                response = await self.client.search(
+                    body=search_body,
+                    size=MAX_LIMIT,
+                    _source_includes=source_includes,
+                    _source_excludes=source_excludes,
+                )
+                hits = response["hits"]["hits"]
+                if hits:
+                    yield [hit["_source"] for hit in hits]
+                if len(hits) < MAX_LIMIT:
+                    return
+                search_body["search_after"] = hits[-1]["sort"]
+                search_body["pit"]["id"] = response.get(
+                    "pit_id", search_body["pit"]["id"]
+                )
+
+        async def read_items() -> AsyncIterator[Dict[str, Any]]:
             try:
-                matched = count_task.result().get("count")
-            except Exception as e:
-                logger.error(f"Count task failed: {e}")
+                async for page in merge_async_iterators(
+                    [read_slice(slice_id) for slice_id in range(slices)],
+                    buffer_size=slices,
+                ):
+                    for item in page:
+                        yield item
+            finally:
+                await self.delete_point_in_time(pit_id)
 
-        return items, matched, next_token
+        return read_items()
 
     """ AGGREGATE LOGIC """
 
+    @cluster_call
     async def aggregate(
         self,
         collection_ids: Optional[List[str]],
@@ -776,8 +1452,15 @@ class DatabaseLogic:
         geometry_geotile_grid_precision: int,
         datetime_frequency_interval: str,
         ignore_unavailable: Optional[bool] = True,
+        datetime_search: Optional[Dict[str, Optional[str]]] = None,
+        bbox: Optional[List[float]] = None,
     ):
-        """Return aggregations of STAC Items."""
+        """Return aggregations of STAC Items.
+
+        The datetime filter and the 2D bbox of the spatial filter applied to `search` are
+        used to only search the overlapping time partitions, and the collections whose
+        extent can match a catalog-wide search.
+        """
         search_body: Dict[str, Any] = {}
         query = search.query.to_dict() if search.query else None
         if query:
@@ -808,7 +1491,11 @@ class DatabaseLogic:
             if k in aggregations
         }
 
-        index_param = indices(collection_ids)
+        # the aggregations of an empty search are still computed, over all of the collections
+        search_collection_ids = collection_ids or await self.collections_by_extent(
+            bbox, datetime_search
+        )
+        index_param = self.item_indices(search_collection_ids or None, datetime_search)
         search_task = asyncio.create_task(
             self.client.search(
                 index=index_param,
@@ -826,11 +1513,109 @@ class DatabaseLogic:
 
     """ TRANSACTION LOGIC """
 
+    @cluster_call
     async def check_collection_exists(self, collection_id: str):
         """Database logic to check if a collection exists."""
-        if not await self.client.exists(index=COLLECTIONS_INDEX, id=collection_id):
+        if self.collection_cache.enabled:
+            try:
+                await self.find_collection(collection_id)
+            except NotFoundError:
+                raise NotFoundError(f"Collection {collection_id} does not exist")
+        elif not await self.client.exists(index=COLLECTIONS_INDEX, id=collection_id):
             raise NotFoundError(f"Collection {collection_id} does not exist")
 
+    @cluster_call
+    def sync_check_collection_exists(self, collection_id: str):
+        """Check if a collection exists, see `check_collection_exists`."""
+        if not self.sync_client.exists(index=COLLECTIONS_INDEX, id=collection_id):
+            raise NotFoundError(f"Collection {collection_id} does not exist")
+
+    @cluster_call
+    async def item_exists(self, item_id: str, collection_id: str) -> bool:
+        """Check if an item exists.
+
+        Args:
+            item_id (str): The id of the Item.
+            collection_id (str): The id of the Collection that the Item belongs to.
+
+        Returns:
+            bool: True if the Item exists. With partitioned item indices, the Item is
+            counted by id in all of the partitions of the Collection.
+        """
+        if self.items_partition == PartitionInterval.NONE:
+            return bool(
+                await self.client.exists(
+                    index=index_alias_by_collection_id(collection_id),
+                    id=mk_item_id(item_id, collection_id),
+                )
+            )
+        response = await self.client.count(
+            index=index_alias_by_collection_id(collection_id),
+            body={"query": {"ids": {"values": [mk_item_id(item_id, collection_id)]}}},
+            ignore_unavailable=True,
+        )
+        return response["count"] > 0
+
+    @cluster_call
+    def sync_item_exists(self, item_id: str, collection_id: str) -> bool:
+        """Check if an item exists, see `item_exists`."""
+        if self.items_partition == PartitionInterval.NONE:
+            return bool(
+                self.sync_client.exists(
+                    index=index_alias_by_collection_id(collection_id),
+                    id=mk_item_id(item_id, collection_id),
+                )
+            )
+        response = self.sync_client.count(
+            index=index_alias_by_collection_id(collection_id),
+            body={"query": {"ids": {"values": [mk_item_id(item_id, collection_id)]}}},
+            ignore_unavailable=True,
+        )
+        return response["count"] > 0
+
+    @cluster_call
+    async def create_item_partitions(
+        self, collection_id: str, index_names: Iterable[str]
+    ) -> None:
+        """Create the item partitions of a collection that are not known to exist yet.
+
+        Args:
+            collection_id (str): The id of the Collection.
+            index_names (Iterable[str]): The indices the items of the Collection are written to,
+                see `item_index_by_partition`.
+
+        Notes:
+            A partition is created with the alias of the Collection, so that it is searched
+            with the rest of the Collection. The settings and mappings of the index template
+            are used implicitly.
+        """
+        alias = index_alias_by_collection_id(collection_id)
+        for index in set(index_names) - self._item_partitions - {alias}:
+            try:
+                await self.client.indices.create(
+                    index=index, body={"aliases": {alias: {}}}
+                )
+            except TransportError as e:
+                if e.status_code != 400:
+                    raise e
+            self._item_partitions.add(index)
+
+    @cluster_call
+    def sync_create_item_partitions(
+        self, collection_id: str, index_names: Iterable[str]
+    ) -> None:
+        """Create the item partitions of a collection, see `create_item_partitions`."""
+        alias = index_alias_by_collection_id(collection_id)
+        for index in set(index_names) - self._item_partitions - {alias}:
+            try:
+                self.sync_client.indices.create(
+                    index=index, body={"aliases": {alias: {}}}
+                )
+            except TransportError as e:
+                if e.status_code != 400:
+                    raise e
+            self._item_partitions.add(index)
+
     async def prep_create_item(
         self, item: Item, base_url: str, exist_ok: bool = False
     ) -> Item:
@@ -851,10 +1636,7 @@ class DatabaseLogic:
         """
         await self.check_collection_exists(collection_id=item["collection"])
 
-        if not exist_ok and await self.client.exists(
-            index=index_alias_by_collection_id(item["collection"]),
-            id=mk_item_id(item["id"], item["collection"]),
-        ):
+        if not exist_ok and await self.item_exists(item["id"], item["collection"]):
             raise ConflictError(
                 f"Item {item['id']} in collection {item['collection']} already exists"
             )
@@ -885,19 +1667,16 @@ class DatabaseLogic:
         """
         item_id = item["id"]
         collection_id = item["collection"]
-        if not self.sync_client.exists(index=COLLECTIONS_INDEX, id=collection_id):
-            raise NotFoundError(f"Collection {collection_id} does not exist")
+        self.sync_check_collection_exists(collection_id)
 
-        if not exist_ok and self.sync_client.exists(
-            index=index_alias_by_collection_id(collection_id),
-            id=mk_item_id(item_id, collection_id),
-        ):
+        if not exist_ok and self.sync_item_exists(item_id, collection_id):
             raise ConflictError(
                 f"Item {item_id} in collection {collection_id} already exists"
             )
 
         return self.item_serializer.stac_to_db(item, base_url)
 
+    @cluster_call
     async def create_item(self, item: Item, refresh: bool = False):
         """Database logic for creating one item.
 
@@ -911,21 +1690,260 @@ class DatabaseLogic:
         Returns:
             None
         """
-        # todo: check if collection exists, but cache
         item_id = item["id"]
         collection_id = item["collection"]
+        index = item_index_by_partition(collection_id, item, self.items_partition)
+        await self.create_item_partitions(collection_id, [index])
         es_resp = await self.client.index(
-            index=index_alias_by_collection_id(collection_id),
+            index=index,
             id=mk_item_id(item_id, collection_id),
             body=item,
             refresh=refresh,
         )
+        self.search_cache.invalidate_collection(collection_id)
 
         if (meta := es_resp.get("meta")) and meta.get("status") == 409:
             raise ConflictError(
                 f"Item {item_id} in collection {collection_id} already exists"
             )
 
+    @cluster_call
+    async def update_item(
+        self,
+        item: Item,
+        refresh: bool = False,
+        version: Optional[ItemVersion] = None,
+    ) -> Optional[ItemVersion]:
+        """Replace an item in place.
+
+        Args:
+            item (Item): The prepped item.
+            refresh (bool, optional): Refresh the index after performing the operation. Defaults to False.
+            version (Optional[ItemVersion]): The version the Item must be at, e.g. from an `If-Match` header.
+
+        Returns:
+            Optional[ItemVersion]: The new version of the Item.
+
+        Raises:
+            NotFoundError: If the Item does not exist.
+            PreconditionFailedError: If the Item is not at `version`.
+
+        Notes:
+            The Item is replaced with a single `_update` request, conditional on `version` if given, so it never
+            disappears from the searches, and the update fails if the Item does not exist. With partitioned item
+            indices, the Item is first looked up to find its partition: the write is conditional on the version
+            read, and the Item is deleted from its previous partition if its datetime moved it to another one.
+        """
+        item_id = item["id"]
+        collection_id = item["collection"]
+        doc_id = mk_item_id(item_id, collection_id)
+        not_at_version = PreconditionFailedError(
+            f"Item {item_id} in collection {collection_id} is not at version {version.etag if version else None}"
+        )
+
+        if self.items_partition == PartitionInterval.NONE:
+            try:
+                response = await self.client.update(
+                    index=index_alias_by_collection_id(collection_id),
+                    id=doc_id,
+                    body={"script": replace_script(item)},
+                    refresh=refresh,
+                    **(version.index_params() if version else {"retry_on_conflict": 3}),
+                )
+            except exceptions.NotFoundError:
+                raise NotFoundError(
+                    f"Item {item_id} does not exist in Collection {collection_id}"
+                )
+            except exceptions.ConflictError:
+                raise not_at_version
+            self.search_cache.invalidate_collection(collection_id)
+            return ItemVersion.from_response(response)
+
+        current = await self._find_item(collection_id, item_id)
+        if current is None:
+            raise NotFoundError(
+                f"Item {item_id} does not exist in Collection {collection_id}"
+            )
+        current_version = ItemVersion.from_response(current)
+        if version is not None and version != current_version:
+            raise not_at_version
+
+        index = item_index_by_partition(collection_id, item, self.items_partition)
+        previous_index = None
+        if current["_index"] != index:
+            # the Item is created in its new partition
+            previous_index = current["_index"]
+            version = None
+            await self.create_item_partitions(collection_id, [index])
+        else:
+            version = current_version
+
+        try:
+            response = await self.client.index(
+                index=index,
+                id=doc_id,
+                body=item,
+                refresh=refresh,
+                **(version.index_params() if version else {}),
+            )
+        except exceptions.ConflictError:
+            raise not_at_version
+
+        if previous_index is not None:
+            try:
+                await self.client.delete(
+                    index=previous_index, id=doc_id, refresh=refresh
+                )
+            except exceptions.NotFoundError:
+                pass
+        self.search_cache.invalidate_collection(collection_id)
+        return ItemVersion.from_response(response)
+
+    @cluster_call
+    async def patch_item(
+        self,
+        collection_id: str,
+        item_id: str,
+        patch: ItemPatch,
+        updated: str,
+        refresh: bool = False,
+        version: Optional[ItemVersion] = None,
+    ) -> Tuple[Dict, Optional[ItemVersion]]:
+        """Apply a patch to an item in the cluster.
+
+        Args:
+            collection_id (str): The id of the Collection that the Item belongs to.
+            item_id (str): The id of the Item.
+            patch (ItemPatch): The patch, which must be applicable in place, see `ItemPatch.in_place_error`.
+            updated (str): The new `properties.updated` of the Item.
+            refresh (bool, optional): Refresh the index after performing the operation. Defaults to False.
+            version (Optional[ItemVersion]): The version the Item must be at, e.g. from an `If-Match` header.
+
+        Returns:
+            Tuple[Dict, Optional[ItemVersion]]: The source data of the patched Item, and its new version.
+
+        Raises:
+            NotFoundError: If the Item does not exist in the Collection.
+            PreconditionFailedError: If the Item is not at `version`.
+            ConflictError: If the patch can't be applied to the Item, e.g. a path is missing or a test fails.
+            InvalidQueryParameter: If a value of the patch does not match the mapping of its field.
+
+        Notes:
+            The patch is applied with a single `_update` request, as a partial document or a script, so the Item is
+            not sent back and forth. Without `version`, the update is retried on concurrent writes. With partitioned
+            item indices, the Item is first looked up to find its partition.
+        """
+        index = index_alias_by_collection_id(collection_id)
+        if self.items_partition != PartitionInterval.NONE:
+            current = await self._find_item(collection_id, item_id)
+            if current is None:
+                raise NotFoundError(
+                    f"Item {item_id} does not exist in Collection {collection_id}"
+                )
+            index = current["_index"]
+
+        try:
+            response = await self.client.update(
+                index=index,
+                id=mk_item_id(item_id, collection_id),
+                refresh=refresh,
+                body=patch.update_body(updated),
+                _source=True,
+                **(version.index_params() if version else {"retry_on_conflict": 3}),
+            )
+        except exceptions.NotFoundError:
+            raise NotFoundError(
+                f"Item {item_id} does not exist in Collection {collection_id}"
+            )
+        except exceptions.ConflictError:
+            raise PreconditionFailedError(
+                f"Item {item_id} in collection {collection_id} is not at version {version.etag if version else None}"
+            )
+        except exceptions.RequestError as e:
+            message = f"The patch of Item {item_id} in collection {collection_id} could not be applied: {patch_error_reason(e.info)}"
+            if patch_error_status(e.info) == 409:
+                raise ConflictError(message)
+            raise InvalidQueryParameter(message)
+
+        self.search_cache.invalidate_collection(collection_id)
+        return response["get"]["_source"], ItemVersion.from_response(response)
+
+    @cluster_call
+    async def bulk_patch_items(
+        self,
+        collection_id: str,
+        patches: Dict[str, ItemPatch],
+        updated: str,
+        refresh: bool = False,
+    ) -> List[BulkItemResult]:
+        """Apply patches to many items in the cluster.
+
+        Args:
+            collection_id (str): The id of the Collection that the Items belong to.
+            patches (Dict[str, ItemPatch]): The patches by Item id, which must be applicable in place, see
+                `ItemPatch.in_place_error`.
+            updated (str): The new `properties.updated` of the Items.
+            refresh (bool, optional): Refresh the index after performing the operation. Defaults to False.
+
+        Returns:
+            List[BulkItemResult]: The result of each Item, in the order of `patches`.
+
+        Notes:
+            The patches are sent as bulk `update` actions, in the chunks of `bulk_options`. With partitioned item
+            indices, the partitions of the Items are first looked up, with a search per `MAX_LIMIT` Items.
+        """
+        indices: Dict[str, str] = {}
+        if self.items_partition != PartitionInterval.NONE:
+            doc_ids = [mk_item_id(item_id, collection_id) for item_id in patches]
+            for start in range(0, len(doc_ids), MAX_LIMIT):
+                chunk = doc_ids[start : start + MAX_LIMIT]
+                response = await self.client.search(
+                    index=index_alias_by_collection_id(collection_id),
+                    body={"query": {"ids": {"values": chunk}}, "_source": False},
+                    size=len(chunk),
+                    ignore_unavailable=True,
+                )
+                indices.update(
+                    (hit["_id"], hit["_index"]) for hit in response["hits"]["hits"]
+                )
+
+        item_ids = []
+        actions = []
+        for item_id, patch in patches.items():
+            doc_id = mk_item_id(item_id, collection_id)
+            if self.items_partition != PartitionInterval.NONE and doc_id not in indices:
+                continue
+            item_ids.append(item_id)
+            actions.append(
+                {
+                    "_op_type": "update",
+                    "_index": indices.get(
+                        doc_id, index_alias_by_collection_id(collection_id)
+                    ),
+                    "_id": doc_id,
+                    "retry_on_conflict": 3,
+                    **patch.update_body(updated),
+                }
+            )
+
+        responses = await concurrent_streaming_bulk(
+            helpers.async_streaming_bulk,
+            self.client,
+            actions,
+            self.bulk_options,
+            refresh=refresh,
+        )
+        patched = {
+            item_id: bulk_patch_result(item_id, collection_id, response)
+            for item_id, response in zip(item_ids, responses)
+        }
+        self.search_cache.invalidate_collection(collection_id)
+        return [
+            patched.get(item_id) or not_found_result(item_id, collection_id)
+            for item_id in patches
+        ]
+
+    @cluster_call
     async def delete_item(
         self, item_id: str, collection_id: str, refresh: bool = False
     ):
@@ -939,6 +1957,23 @@ class DatabaseLogic:
         Raises:
             NotFoundError: If the Item does not exist in the database.
         """
+        if self.items_partition != PartitionInterval.NONE:
+            # the partition of the item is not known, delete it by id from all of them
+            response = await self.client.delete_by_query(
+                index=index_alias_by_collection_id(collection_id),
+                body={
+                    "query": {"ids": {"values": [mk_item_id(item_id, collection_id)]}}
+                },
+                refresh=refresh,
+                ignore_unavailable=True,
+            )
+            if not response["deleted"]:
+                raise NotFoundError(
+                    f"Item {item_id} in collection {collection_id} not found"
+                )
+            self.search_cache.invalidate_collection(collection_id)
+            return
+
         try:
             await self.client.delete(
                 index=index_alias_by_collection_id(collection_id),
@@ -949,7 +1984,9 @@ class DatabaseLogic:
             raise NotFoundError(
                 f"Item {item_id} in collection {collection_id} not found"
             )
+        self.search_cache.invalidate_collection(collection_id)
 
+    @cluster_call
     async def create_collection(self, collection: Collection, refresh: bool = False):
         """Create a single collection in the database.
 
@@ -976,7 +2013,10 @@ class DatabaseLogic:
         )
 
         await create_item_index(collection_id)
+        self.collection_cache.invalidate(collection_id)
+        self.collection_extents.invalidate()
 
+    @cluster_call
     async def find_collection(self, collection_id: str) -> Collection:
         """Find and return a collection from the database.
 
@@ -992,17 +2032,48 @@ class DatabaseLogic:
 
         Notes:
             This function searches for a collection in the database using the specified `collection_id` and returns the found
-            collection as a `Collection` object. If the collection is not found, a `NotFoundError` is raised.
+            collection as a `Collection` object. If the collection is not found, a `NotFoundError` is raised. When the
+            collection cache is enabled, found and missing collections are cached.
         """
+        if self.collection_cache.enabled:
+            await self.collection_cache.revalidate(self.collections_version)
+            cached = self.collection_cache.get(collection_id)
+            if cached is MISSING:
+                raise NotFoundError(f"Collection {collection_id} not found")
+            if cached is not None:
+                return cached
+
         try:
             collection = await self.client.get(
                 index=COLLECTIONS_INDEX, id=collection_id
             )
         except exceptions.NotFoundError:
+            self.collection_cache.set(collection_id, None)
             raise NotFoundError(f"Collection {collection_id} not found")
 
+        self.collection_cache.set(collection_id, collection["_source"])
         return collection["_source"]
 
+    @cluster_call
+    async def collections_version(self) -> Optional[Tuple[int, int]]:
+        """Get a version of the collections index, used to revalidate the collection cache.
+
+        Returns:
+            Optional[Tuple[int, int]]: The number of index and delete operations on the
+            primary shards of the collections index, which changes with every collection
+            write. None if the index stats are not available.
+        """
+        try:
+            stats = await self.client.indices.stats(
+                index=COLLECTIONS_INDEX, metric="indexing"
+            )
+            indexing = stats["_all"]["primaries"]["indexing"]
+        except (TransportError, KeyError) as e:
+            logger.warning("Failed to get the collections index stats: %s", e)
+            return None
+        return indexing["index_total"], indexing["delete_total"]
+
+    @cluster_call
     async def update_collection(
         self, collection_id: str, collection: Collection, refresh: bool = False
     ):
@@ -1022,6 +2093,8 @@ class DatabaseLogic:
             `collection_id` and with the collection specified in the `Collection` object.
             If the collection is not found, a `NotFoundError` is raised.
         """
+        # the collection is read from the database, not from the cache
+        self.collection_cache.invalidate(collection_id)
         await self.find_collection(collection_id=collection_id)
 
         if collection_id != collection["id"]:
@@ -1050,6 +2123,11 @@ class DatabaseLogic:
                 refresh=refresh,
             )
 
+        self.collection_cache.invalidate(collection_id)
+        self.collection_extents.invalidate()
+        self.search_cache.invalidate_collection(collection["id"])
+
+    @cluster_call
     async def delete_collection(self, collection_id: str, refresh: bool = False):
         """Delete a collection from the database.
 
@@ -1066,59 +2144,193 @@ class DatabaseLogic:
             deletes the collection. If `refresh` is set to True, the index is refreshed after the deletion. Additionally, this
             function also calls `delete_item_index` to delete the index for the items in the collection.
         """
+        # the collection is read from the database, not from the cache
+        self.collection_cache.invalidate(collection_id)
         await self.find_collection(collection_id=collection_id)
         await self.client.delete(
             index=COLLECTIONS_INDEX, id=collection_id, refresh=refresh
         )
         await delete_item_index(collection_id)
+        self._item_partitions.clear()
+        self.collection_cache.invalidate(collection_id)
+        self.collection_extents.invalidate()
+        self.search_cache.invalidate_collection(collection_id)
+
+    def _partitioned_doc_ids(self, processed_items: List[Item]) -> Dict[str, str]:
+        """Get the document ids of the items to check for conflicts across partitions.
+
+        A bulk `create` action only conflicts with an item of the same partition. With
+        partitioned item indices, the items are looked up in all of the partitions of
+        their collection first, in a single search per batch.
+
+        Returns:
+            Dict[str, str]: The item ids by document id, empty without partitioning.
+        """
+        if self.items_partition == PartitionInterval.NONE:
+            return {}
+        return {
+            mk_item_id(item["id"], item["collection"]): item["id"]
+            for item in processed_items
+        }
+
+    async def existing_item_ids(
+        self, collection_id: str, processed_items: List[Item]
+    ) -> Set[str]:
+        """Get the ids of the items of a batch that exist in another partition.
+
+        Args:
+            collection_id (str): The id of the Collection.
+            processed_items (List[Item]): The items.
+
+        Returns:
+            Set[str]: The ids of the existing items, always empty without partitioning.
+        """
+        doc_ids = self._partitioned_doc_ids(processed_items)
+        existing: Set[str] = set()
+        if doc_ids:
+            response = await self.client.search(
+                index=index_alias_by_collection_id(collection_id),
+                body={"query": {"ids": {"values": list(doc_ids)}}, "_source": False},
+                size=len(doc_ids),
+                ignore_unavailable=True,
+            )
+            existing = {doc_ids[hit["_id"]] for hit in response["hits"]["hits"]}
+        return existing
+
+    def sync_existing_item_ids(
+        self, collection_id: str, processed_items: List[Item]
+    ) -> Set[str]:
+        """Get the ids of the items of a batch that exist, see `existing_item_ids`."""
+        doc_ids = self._partitioned_doc_ids(processed_items)
+        existing: Set[str] = set()
+        if doc_ids:
+            response = self.sync_client.search(
+                index=index_alias_by_collection_id(collection_id),
+                body={"query": {"ids": {"values": list(doc_ids)}}, "_source": False},
+                size=len(doc_ids),
+                ignore_unavailable=True,
+            )
+            existing = {doc_ids[hit["_id"]] for hit in response["hits"]["hits"]}
+        return existing
+
+    @staticmethod
+    def _merge_bulk_results(
+        processed_items: List[Item],
+        existing: Set[str],
+        written: Iterator[BulkItemResult],
+    ) -> List[BulkItemResult]:
+        """Get the results of all of the items, in order, conflicting or written."""
+        return [
+            conflict_result(item["id"], item["collection"])
+            if item["id"] in existing
+            else next(written)
+            for item in processed_items
+        ]
 
+    @cluster_call
     async def bulk_async(
-        self, collection_id: str, processed_items: List[Item], refresh: bool = False
-    ) -> None:
-        """Perform a bulk insert of items into the database asynchronously.
+        self,
+        collection_id: str,
+        processed_items: List[Item],
+        refresh: bool = False,
+        exist_ok: bool = True,
+    ) -> List[BulkItemResult]:
+        """Perform a bulk write of items into the database asynchronously.
 
         Args:
             self: The instance of the object calling this function.
             collection_id (str): The ID of the collection to which the items belong.
             processed_items (List[Item]): A list of `Item` objects to be inserted into the database.
             refresh (bool): Whether to refresh the index after the bulk insert (default: False).
+            exist_ok (bool): Whether the items can exist already and are overwritten (default: True). Otherwise the
+                existing items are not written, and reported as conflicts.
+
+        Returns:
+            List[BulkItemResult]: The result of each item, in the order of `processed_items`.
 
         Notes:
-            This function performs a bulk insert of `processed_items` into the database using the specified `collection_id`. The
-            insert is performed asynchronously, and the event loop is used to run the operation in a separate executor. The
-            `mk_actions` function is called to generate a list of actions for the bulk insert. If `refresh` is set to True, the
-            index is refreshed after the bulk insert. The function does not return any value.
+            The existence of the items is not checked beforehand: the items are written with bulk `create` actions,
+            which fail on existing items, or `index` actions, which overwrite them. Only with partitioned item indices,
+            the items are first looked up in the other partitions of the collection, in a single search.
+
+            The actions are sent in chunks of `bulk_options`, with up to `bulk_options.max_concurrency` chunks in
+            flight on the client of the searches.
         """
-        await helpers.async_bulk(
+        existing = (
+            set()
+            if exist_ok
+            else await self.existing_item_ids(collection_id, processed_items)
+        )
+        items = [item for item in processed_items if item["id"] not in existing]
+        actions = mk_actions(
+            collection_id, items, self.items_partition, bulk_op_type(exist_ok)
+        )
+        await self.create_item_partitions(
+            collection_id, (action["_index"] for action in actions)
+        )
+        responses = await concurrent_streaming_bulk(
+            helpers.async_streaming_bulk,
             self.client,
-            mk_actions(collection_id, processed_items),
+            actions,
+            self.bulk_options,
             refresh=refresh,
-            raise_on_error=False,
         )
+        written = [
+            bulk_item_result(item["id"], response)
+            for item, response in zip(items, responses)
+        ]
+        self.search_cache.invalidate_collection(collection_id)
+        return self._merge_bulk_results(processed_items, existing, iter(written))
 
+    @cluster_call
     def bulk_sync(
-        self, collection_id: str, processed_items: List[Item], refresh: bool = False
-    ) -> None:
-        """Perform a bulk insert of items into the database synchronously.
+        self,
+        collection_id: str,
+        processed_items: List[Item],
+        refresh: bool = False,
+        exist_ok: bool = True,
+    ) -> List[BulkItemResult]:
+        """Perform a bulk write of items into the database synchronously, see `bulk_async`.
 
         Args:
             self: The instance of the object calling this function.
             collection_id (str): The ID of the collection to which the items belong.
             processed_items (List[Item]): A list of `Item` objects to be inserted into the database.
             refresh (bool): Whether to refresh the index after the bulk insert (default: False).
+            exist_ok (bool): Whether the items can exist already and are overwritten (default: True).
 
-        Notes:
-            This function performs a bulk insert of `processed_items` into the database using the specified `collection_id`. The
-            insert is performed synchronously and blocking, meaning that the function does not return until the insert has
-            completed. The `mk_actions` function is called to generate a list of actions for the bulk insert. If `refresh` is set to
-            True, the index is refreshed after the bulk insert. The function does not return any value.
+        Returns:
+            List[BulkItemResult]: The result of each item, in the order of `processed_items`.
         """
-        helpers.bulk(
-            self.sync_client,
-            mk_actions(collection_id, processed_items),
-            refresh=refresh,
-            raise_on_error=False,
+        existing = (
+            set()
+            if exist_ok
+            else self.sync_existing_item_ids(collection_id, processed_items)
+        )
+        items = [item for item in processed_items if item["id"] not in existing]
+        actions = mk_actions(
+            collection_id, items, self.items_partition, bulk_op_type(exist_ok)
         )
+        self.sync_create_item_partitions(
+            collection_id, (action["_index"] for action in actions)
+        )
+        written = [
+            bulk_item_result(item["id"], response)
+            for item, response in zip(
+                items,
+                helpers.streaming_bulk(
+                    self.sync_client,
+                    actions,
+                    chunk_size=self.bulk_options.chunk_size,
+                    max_chunk_bytes=self.bulk_options.max_chunk_bytes,
+                    refresh=refresh,
+                    raise_on_error=False,
+                    raise_on_exception=False,
+                ),
+            )
+        ]
+        self.search_cache.invalidate_collection(collection_id)
+        return self._merge_bulk_results(processed_items, existing, iter(written))
 
     # DANGER
     async def delete_items(self) -> None:
@@ -1128,6 +2340,77 @@ class DatabaseLogic:
             body={"query": {"match_all": {}}},
             wait_for_completion=True,
         )
+        self.search_cache.clear()
+
+    async def migrate_bbox_envelopes(
+        self, wait_for_completion: bool = False
+    ) -> Dict[str, Any]:
+        """Add the bbox envelope to the items indexed without one.
+
+        New item indices get the envelope field from the index template, and new items get
+        their envelope from the item serializer. The existing indices get the mapping of the
+        field, and their items without an envelope are then updated in place.
+
+        Args:
+            wait_for_completion (bool): Whether to wait for all of the items to be updated,
+                instead of returning the id of the update task.
+
+        Returns:
+            Dict[str, Any]: The `update_by_query` response, with the `task` to follow
+            unless `wait_for_completion` is set.
+        """
+        await self.client.indices.put_mapping(
+            index=ITEM_INDICES,
+            body={"properties": {ENVELOPE_FIELD: ENVELOPE_MAPPING}},
+        )
+        response = await self.client.update_by_query(
+            index=ITEM_INDICES,
+            body={
+                "query": {"bool": {"must_not": {"exists": {"field": ENVELOPE_FIELD}}}},
+                "script": {"lang": "painless", "source": ENVELOPE_SCRIPT},
+            },
+            conflicts="proceed",
+            refresh=True,
+            wait_for_completion=wait_for_completion,
+        )
+        self.search_cache.clear()
+        return response
+
+    async def migrate_full_text_field(
+        self, wait_for_completion: bool = False
+    ) -> Dict[str, Any]:
+        """Add the full text field to the existing item indices.
+
+        New item indices get the full text field from the index template. The existing
+        indices get its mappings, and their items are then updated in place, so that their
+        properties are copied to the field.
+
+        Args:
+            wait_for_completion (bool): Whether to wait for all of the items to be updated,
+                instead of returning the id of the update task.
+
+        Returns:
+            Dict[str, Any]: The `update_by_query` response, with the `task` to follow
+            unless `wait_for_completion` is set.
+
+        Raises:
+            ValueError: If `STAC_FASTAPI_FULL_TEXT_PROPERTIES` is not set.
+        """
+        properties = FULL_TEXT_PROPERTIES
+        if not properties:
+            raise ValueError("STAC_FASTAPI_FULL_TEXT_PROPERTIES is not set")
+        await self.client.indices.put_mapping(
+            index=ITEM_INDICES,
+            body={"properties": full_text_property_mappings(properties)},
+        )
+        response = await self.client.update_by_query(
+            index=ITEM_INDICES,
+            conflicts="proceed",
+            refresh=True,
+            wait_for_completion=wait_for_completion,
+        )
+        self.search_cache.clear()
+        return response
 
     # DANGER
     async def delete_collections(self) -> None:
@@ -1137,3 +2420,5 @@ class DatabaseLogic:
             body={"query": {"match_all": {}}},
             wait_for_completion=True,
         )
+        self.collection_cache.clear()
+        self.collection_extents.invalidate()
@@ -1,3 +1,4 @@
+import json
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -23,12 +24,17 @@ ROUTES = {
     "GET /collections/{collection_id}/items/{item_id}",
     "GET /search",
     "POST /search",
+    "POST /search/export",
+    "POST /search/batch",
     "DELETE /collections/{collection_id}",
     "DELETE /collections/{collection_id}/items/{item_id}",
     "POST /collections",
     "POST /collections/{collection_id}/items",
+    "POST /collections/{collection_id}/ingest",
     "PUT /collections/{collection_id}",
     "PUT /collections/{collection_id}/items/{item_id}",
+    "PATCH /collections/{collection_id}/items/{item_id}",
+    "PATCH /collections/{collection_id}/bulk_items",
     "GET /aggregations",
     "GET /aggregate",
     "POST /aggregations",
@@ -78,6 +84,52 @@ async def test_app_transaction_extension(app_client, ctx, load_test_data):
     await app_client.delete(f"/collections/{item['collection']}/items/{item['id']}")
 
 
+@pytest.mark.asyncio
+async def test_app_ingest_extension(app_client, ctx, load_test_data):
+    items = []
+    for _ in range(3):
+        item = load_test_data("test_item.json")
+        item["id"] = str(uuid.uuid4())
+        items.append(item)
+    lines = [json.dumps(item) for item in items]
+    lines.insert(1, "")
+    lines.append(json.dumps(ctx.item))
+    lines.append('{"type": "Feature"}')
+    body = "\n".join(lines).encode()
+
+    async def chunks():
+        # split the lines across the chunks of the body
+        for start in range(0, len(body), 100):
+            yield body[start : start + 100]
+
+    url = f"/collections/{ctx.collection['id']}/ingest"
+    resp = await app_client.post(
+        url, content=chunks(), headers={"content-type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 200
+    resp_json = resp.json()
+    assert resp_json["added"] == 3
+    assert resp_json["failed"] == 2
+    assert [(error["line"], error["id"]) for error in resp_json["errors"]] == [
+        (5, ctx.item["id"]),
+        (6, None),
+    ]
+
+    for item in items:
+        resp = await app_client.get(
+            f"/collections/{item['collection']}/items/{item['id']}"
+        )
+        assert resp.status_code == 200
+
+    resp = await app_client.post(
+        f"{url}?method=upsert", content=json.dumps(ctx.item).encode()
+    )
+    assert resp.json() == {"added": 1, "failed": 0, "errors": []}
+
+    resp = await app_client.post("/collections/missing-collection/ingest", content=b"")
+    assert resp.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_app_search_response(app_client, ctx):
     resp = await app_client.get("/search", params={"ids": ["test-item"]})
@@ -124,6 +176,191 @@ async def test_app_context_results(app_client, txn_client, ctx, load_test_data):
         assert matched == 1
 
 
+@pytest.mark.asyncio
+async def test_app_count_extension_exact(app_client, ctx):
+    resp = await app_client.get(
+        "/search", params={"ids": ["test-item"], "count": "exact"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["numMatched"] == 1
+
+
+@pytest.mark.asyncio
+async def test_app_count_extension_off(app_client, ctx):
+    resp = await app_client.post("/search", json={"ids": ["test-item"], "count": "off"})
+    assert resp.status_code == 200
+    resp_json = resp.json()
+    assert resp_json["numReturned"] == 1
+    assert resp_json.get("numMatched") is None
+
+
+@pytest.mark.asyncio
+async def test_app_count_extension_item_collection(app_client, ctx):
+    resp = await app_client.get(
+        f"/collections/{ctx.item['collection']}/items", params={"count": "off"}
+    )
+    assert resp.status_code == 200
+    assert resp.json().get("numMatched") is None
+
+    resp = await app_client.get(
+        f"/collections/{ctx.item['collection']}/items", params={"count": "some"}
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_app_count_extension_bounded(
+    app_client, ctx, txn_client, load_test_data, monkeypatch
+):
+    monkeypatch.setenv("STAC_FASTAPI_COUNT_BOUND", "1")
+    test_item = load_test_data("test_item.json")
+    test_item["id"] = "test-item-count-bound"
+    await create_item(txn_client, test_item)
+
+    body = {"collections": [test_item["collection"]], "count": "bounded"}
+    resp = await app_client.post("/search", json=body)
+    assert resp.status_code == 200
+    resp_json = resp.json()
+    assert resp_json["numReturned"] == 2
+    # more items match than the count bound, so the count is left out
+    assert resp_json.get("numMatched") is None
+
+    monkeypatch.setenv("STAC_FASTAPI_COUNT_BOUND", "10")
+    resp = await app_client.post("/search", json=body)
+    assert resp.json()["numMatched"] == 2
+
+
+@pytest.mark.asyncio
+async def test_app_streaming_response(app_client, ctx, monkeypatch):
+    params = {"collections": [ctx.item["collection"]], "limit": 1}
+    resp = await app_client.get("/search", params=params)
+    monkeypatch.setenv("STAC_FASTAPI_STREAMING_RESPONSES", "true")
+    streaming_resp = await app_client.get("/search", params=params)
+    assert streaming_resp.status_code == 200
+    assert streaming_resp.headers["content-type"] == "application/geo+json"
+    assert streaming_resp.json() == resp.json()
+
+
+@pytest.mark.asyncio
+async def test_app_raw_response(app_client, ctx, monkeypatch):
+    params = {"collections": [ctx.item["collection"]], "limit": 1}
+    resp = await app_client.post("/search", json=params)
+    monkeypatch.setenv("STAC_FASTAPI_RAW_RESPONSES", "true")
+    raw_resp = await app_client.post("/search", json=params)
+    assert raw_resp.status_code == 200
+    assert raw_resp.headers["content-type"] == "application/geo+json"
+    assert raw_resp.json() == resp.json()
+
+
+@pytest.mark.asyncio
+async def test_app_profiling(app_client, ctx):
+    params = {"collections": [ctx.item["collection"]], "limit": 1}
+    resp = await app_client.post("/search", json=params)
+    assert "server-timing" not in resp.headers
+
+    resp = await app_client.post("/search", json=params, headers={"X-Profile": "1"})
+    assert resp.status_code == 200
+    stages = [
+        timing.split(";")[0] for timing in resp.headers["server-timing"].split(", ")
+    ]
+    for stage in (
+        "validate",
+        "build",
+        "search",
+        "cluster",
+        "serialize",
+        "links",
+        "total",
+    ):
+        assert stage in stages
+    assert "profile" not in resp.json()
+
+    resp = await app_client.post(
+        "/search", json=params, headers={"X-Profile": "cluster"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["profile"]["shards"]
+
+
+@pytest.mark.asyncio
+async def test_app_geojson_seq_response(app_client, ctx, txn_client, load_test_data):
+    test_item = load_test_data("test_item.json")
+    test_item["id"] = "test-item-geojson-seq"
+    await create_item(txn_client, test_item)
+
+    resp = await app_client.get(
+        f"/collections/{test_item['collection']}/items",
+        params={"limit": 1},
+        headers={"Accept": "application/geo+json-seq"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/geo+json-seq"
+    assert 'rel="next"' in resp.headers["link"]
+    records = resp.content.split(b"\x1e")[1:]
+    assert len(records) == 1
+    assert json.loads(records[0])["type"] == "Feature"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("slices", (1, 2))
+async def test_app_export_extension(
+    app_client, ctx, txn_client, load_test_data, slices
+):
+    test_item = load_test_data("test_item.json")
+    item_ids = {ctx.item["id"]}
+    for i in range(3):
+        test_item["id"] = f"test-item-export-{i}"
+        await create_item(txn_client, test_item)
+        item_ids.add(test_item["id"])
+
+    resp = await app_client.post(
+        "/search/export",
+        json={
+            "collections": [test_item["collection"]],
+            "fields": {"include": ["id", "properties.datetime"]},
+            "slices": slices,
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    items = [json.loads(line) for line in resp.text.splitlines()]
+    assert {item["id"] for item in items} == item_ids
+    assert all(list(item["properties"]) == ["datetime"] for item in items)
+
+
+@pytest.mark.asyncio
+async def test_app_batch_search_extension(app_client, ctx, txn_client, load_test_data):
+    test_item = load_test_data("test_item.json")
+    test_item["id"] = "test-item-batch"
+    await create_item(txn_client, test_item)
+
+    searches = [
+        {"collections": [test_item["collection"]], "limit": 1},
+        {"ids": [ctx.item["id"]], "fields": {"include": ["id"]}},
+        {"collections": [test_item["collection"]], "bbox": [0, 0, 1, 1]},
+    ]
+    resp = await app_client.post("/search/batch", json=searches)
+    assert resp.status_code == 200
+    first, second, third = resp.json()
+
+    assert len(first["features"]) == 1 and first["numMatched"] == 2
+    [next_link] = [link for link in first["links"] if link["rel"] == "next"]
+    assert next_link["method"] == "POST" and next_link["href"].endswith("/search")
+
+    # the next link continues the search with POST /search
+    resp = await app_client.post("/search", json=next_link["body"])
+    assert resp.status_code == 200
+    assert len(resp.json()["features"]) == 1
+    assert resp.json()["features"][0]["id"] != first["features"][0]["id"]
+
+    assert [item["id"] for item in second["features"]] == [ctx.item["id"]]
+    assert "assets" not in second["features"][0]
+    assert third["features"] == [] and third["numMatched"] == 0
+
+    resp = await app_client.post("/search/batch", json=[])
+    assert resp.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_app_fields_extension(app_client, ctx, txn_client):
     resp = await app_client.get(
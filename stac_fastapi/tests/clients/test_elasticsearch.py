@@ -297,6 +297,62 @@ async def test_bulk_item_insert(ctx, core_client, txn_client, bulk_txn_client):
     #     )
 
 
+@pytest.mark.asyncio
+async def test_bulk_item_insert_conflicts(ctx, core_client, bulk_txn_client):
+    items = {}
+    for _ in range(3):
+        _item = deepcopy(ctx.item)
+        _item["id"] = str(uuid.uuid4())
+        items[_item["id"]] = _item
+    items[ctx.item["id"]] = deepcopy(ctx.item)
+
+    result = bulk_txn_client.bulk_item_insert(Items(items=items), refresh=True)
+    assert result.startswith("Added 3 of 4 Items. 1 Items failed: ")
+    assert ctx.item["id"] in result
+
+    result = bulk_txn_client.bulk_item_insert(
+        Items(items=items, method="upsert"), refresh=True
+    )
+    assert result == "Successfully added 4 Items."
+
+
+@pytest.mark.asyncio
+async def test_async_bulk_item_insert(ctx, core_client, async_bulk_txn_client):
+    items = {}
+    for _ in range(3):
+        _item = deepcopy(ctx.item)
+        _item["id"] = str(uuid.uuid4())
+        items[_item["id"]] = _item
+    items[ctx.item["id"]] = deepcopy(ctx.item)
+
+    result = await async_bulk_txn_client.bulk_item_insert(
+        Items(items=items), refresh=True
+    )
+    assert result.startswith("Added 3 of 4 Items. 1 Items failed: ")
+
+    for item_id in items:
+        item = await core_client.get_item(
+            item_id, ctx.item["collection"], request=MockRequest
+        )
+        assert item["id"] == item_id
+
+
+@pytest.mark.asyncio
+async def test_feature_collection_insert_conflict(core_client, txn_client, ctx):
+    _item = deepcopy(ctx.item)
+    _item["id"] = str(uuid.uuid4())
+    feature_collection = {"type": "FeatureCollection", "features": [_item, ctx.item]}
+
+    with pytest.raises(ConflictError):
+        await create_item(txn_client, feature_collection)
+
+    # the other items are added
+    item = await core_client.get_item(
+        _item["id"], _item["collection"], request=MockRequest
+    )
+    assert item["id"] == _item["id"]
+
+
 @pytest.mark.asyncio
 async def test_feature_collection_insert(
     core_client,
@@ -12,18 +12,33 @@ from httpx import AsyncClient
 from stac_pydantic import api
 
 from stac_fastapi.api.app import StacApi
-from stac_fastapi.api.models import create_get_request_model, create_post_request_model
+from stac_fastapi.api.models import (
+    ItemCollectionUri,
+    create_get_request_model,
+    create_post_request_model,
+    create_request_model,
+)
 from stac_fastapi.core.core import (
+    AsyncBulkTransactionsClient,
     BulkTransactionsClient,
     CoreClient,
     TransactionsClient,
 )
-from stac_fastapi.core.extensions import QueryExtension
+from stac_fastapi.core.etag import setup_etags
+from stac_fastapi.core.extensions import (
+    BatchSearchExtension,
+    CountExtension,
+    ExportExtension,
+    IngestExtension,
+    PatchExtension,
+    QueryExtension,
+)
 from stac_fastapi.core.extensions.aggregation import (
     EsAggregationExtensionGetRequest,
     EsAggregationExtensionPostRequest,
     EsAsyncAggregationClient,
 )
+from stac_fastapi.core.profiling import setup_profiling
 from stac_fastapi.core.rate_limit import setup_rate_limit
 from stac_fastapi.core.route_dependencies import get_route_dependencies
 
@@ -193,6 +208,13 @@ def bulk_txn_client():
     return BulkTransactionsClient(database=database, session=None, settings=settings)
 
 
+@pytest.fixture
+def async_bulk_txn_client():
+    return AsyncBulkTransactionsClient(
+        database=database, session=None, settings=settings
+    )
+
+
 @pytest_asyncio.fixture(scope="session")
 async def app():
     settings = AsyncSettings()
@@ -218,24 +240,61 @@ async def app():
         TokenPaginationExtension(),
         FilterExtension(),
         FreeTextExtension(),
+        CountExtension(),
     ]
 
-    extensions = [aggregation_extension] + search_extensions
-
     post_request_model = create_post_request_model(search_extensions)
+    items_get_request_model = create_request_model(
+        "ItemCollectionURI",
+        base_model=ItemCollectionUri,
+        extensions=search_extensions,
+        request_type="GET",
+    )
 
-    return StacApi(
+    core_client = CoreClient(
+        database=database,
+        session=None,
+        post_request_model=post_request_model,
+    )
+    export_extension = ExportExtension(
+        client=core_client, search_post_request_model=post_request_model
+    )
+
+    batch_search_extension = BatchSearchExtension(
+        client=core_client, search_post_request_model=post_request_model
+    )
+
+    ingest_extension = IngestExtension(
+        client=AsyncBulkTransactionsClient(
+            database=database, session=None, settings=settings
+        )
+    )
+
+    patch_extension = PatchExtension(
+        client=TransactionsClient(database=database, session=None, settings=settings)
+    )
+
+    extensions = [
+        aggregation_extension,
+        export_extension,
+        batch_search_extension,
+        ingest_extension,
+        patch_extension,
+    ] + search_extensions
+    core_client.extensions = extensions
+
+    app = StacApi(
         settings=settings,
-        client=CoreClient(
-            database=database,
-            session=None,
-            extensions=extensions,
-            post_request_model=post_request_model,
-        ),
+        client=core_client,
         extensions=extensions,
         search_get_request_model=create_get_request_model(search_extensions),
         search_post_request_model=post_request_model,
+        items_get_request_model=items_get_request_model,
     ).app
+    setup_etags(app)
+    setup_profiling(app, profiling="header", cluster_profiling="true")
+
+    return app
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.core.bulk import (
+    BulkItemResult,
+    BulkOptions,
+    bulk_item_result,
+    bulk_op_type,
+    bulk_results_summary,
+    concurrent_streaming_bulk,
+    conflict_result,
+    raise_for_bulk_results,
+)
+from stac_fastapi.types.errors import ConflictError, DatabaseError
+
+
+def test_bulk_op_type():
+    assert bulk_op_type(exist_ok=True) == "index"
+    assert bulk_op_type(exist_ok=False) == "create"
+
+
+def test_bulk_item_result():
+    assert bulk_item_result(
+        "a", (True, {"create": {"_id": "a|c", "status": 201, "result": "created"}})
+    ) == BulkItemResult(id="a", status=201)
+
+    result = bulk_item_result(
+        "b",
+        (
+            False,
+            {
+                "create": {
+                    "_id": "b|c",
+                    "status": 409,
+                    "error": {
+                        "type": "version_conflict_engine_exception",
+                        "reason": "[b|c]: version conflict, document already exists",
+                    },
+                }
+            },
+        ),
+    )
+    assert result.conflict and not result.ok
+    assert result.error == "[b|c]: version conflict, document already exists"
+
+    # a chunk failing with a transport error
+    result = bulk_item_result(
+        "c", (False, {"index": {"_id": "c|c", "error": "ConnectionError(...)"}})
+    )
+    assert result == BulkItemResult(id="c", status=500, error="ConnectionError(...)")
+
+
+def test_bulk_results_summary():
+    results = [BulkItemResult(id="a", status=201), BulkItemResult(id="b", status=200)]
+    assert bulk_results_summary(results) == "Successfully added 2 Items."
+    raise_for_bulk_results(results)
+
+    results.append(conflict_result("c", "coll"))
+    assert bulk_results_summary(results) == (
+        "Added 2 of 3 Items. 1 Items failed: c: Item c in collection coll already exists"
+    )
+    with pytest.raises(ConflictError):
+        raise_for_bulk_results(results)
+
+    results.append(BulkItemResult(id="d", status=400, error="mapper_parsing_exception"))
+    with pytest.raises(DatabaseError):
+        raise_for_bulk_results(results)
+
+
+def test_bulk_options_from_env(monkeypatch):
+    for name in ("CHUNK_SIZE", "CHUNK_BYTES", "CONCURRENCY"):
+        monkeypatch.delenv(f"STAC_FASTAPI_BULK_{name}", raising=False)
+    assert BulkOptions.from_env() == BulkOptions(
+        chunk_size=500, max_chunk_bytes=100 * 1024 * 1024, max_concurrency=1
+    )
+
+    monkeypatch.setenv("STAC_FASTAPI_BULK_CHUNK_SIZE", "100")
+    monkeypatch.setenv("STAC_FASTAPI_BULK_CONCURRENCY", "4")
+    options = BulkOptions.from_env()
+    assert options.chunk_size == 100
+    assert options.max_concurrency == 4
+
+    monkeypatch.setenv("STAC_FASTAPI_BULK_CONCURRENCY", "0")
+    with pytest.raises(ValueError):
+        BulkOptions.from_env()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streaming_bulk():
+    in_flight = 0
+    max_in_flight = 0
+    requests = []
+
+    async def streaming_bulk(client, actions, chunk_size, **kwargs):
+        nonlocal in_flight, max_in_flight
+        requests.append(len(actions))
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # the later chunks answer first
+        await asyncio.sleep(0.01 / len(requests))
+        in_flight -= 1
+        for action in actions:
+            yield True, {"create": {"_id": action["_id"], "status": 201}}
+
+    actions = [{"_id": str(i)} for i in range(10)]
+    options = BulkOptions(chunk_size=3, max_concurrency=2)
+    responses = await concurrent_streaming_bulk(
+        streaming_bulk, None, actions, options, refresh=True
+    )
+    assert [info["create"]["_id"] for _, info in responses] == [
+        action["_id"] for action in actions
+    ]
+    assert requests == [3, 3, 3, 1]
+    assert max_in_flight == 2
+
+    requests.clear()
+    await concurrent_streaming_bulk(
+        streaming_bulk, None, actions, BulkOptions(chunk_size=3)
+    )
+    assert requests == [10]
@@ -0,0 +1,179 @@
+import pytest
+
+from stac_fastapi.core import cache as cache_module
+from stac_fastapi.core.cache import (
+    MISSING,
+    CollectionCache,
+    FilterCache,
+    SearchCache,
+    TTLCache,
+)
+from stac_fastapi.core.extensions import filter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    # "b" is now the least recently used entry
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_ttl_cache_expiry(clock):
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    clock[0] = 9
+    assert cache.get("a") == 1
+    clock[0] = 10
+    assert cache.get("a", "expired") == "expired"
+    assert cache.stats()["size"] == 0
+
+
+def test_ttl_cache_disabled():
+    cache = TTLCache(max_size=0, ttl=10)
+    cache.set("a", 1)
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_search_cache_key_is_normalized():
+    assert SearchCache.make_key(
+        query={"b": 1, "a": 2}, include={"y", "x"}
+    ) == SearchCache.make_key(include={"x", "y"}, query={"a": 2, "b": 1})
+    assert SearchCache.make_key(limit=10) != SearchCache.make_key(limit=11)
+
+
+def test_search_cache_invalidate_collection():
+    search_cache = SearchCache(cache=TTLCache(max_size=10, ttl=60))
+    search_cache.set(b"one", ["c1"], [{"id": "i1"}], 1, None)
+    search_cache.set(b"both", ["c1", "c2"], [], 0, None)
+    search_cache.set(b"all", None, [], 0, None)
+    search_cache.set(b"two", ["c2"], [], 0, None)
+
+    search_cache.invalidate_collection("c1")
+
+    assert search_cache.get(b"one") is None
+    assert search_cache.get(b"both") is None
+    assert search_cache.get(b"all") is None
+    assert search_cache.get(b"two") == ([], 0, None)
+
+
+def test_search_cache_returns_copies():
+    search_cache = SearchCache(cache=TTLCache(max_size=10, ttl=60))
+    search_cache.set(b"key", ["c1"], [{"id": "i1"}], 1, "token")
+    items, matched, next_token = search_cache.get(b"key")
+    items[0]["id"] = "changed"
+    assert search_cache.get(b"key") == ([{"id": "i1"}], 1, "token")
+
+
+@pytest.mark.parametrize(
+    "size, ttl",
+    (("not-a-number", None), (None, "1m")),
+)
+def test_search_cache_from_env_invalid(size, ttl, monkeypatch):
+    for name, value in (
+        ("STAC_FASTAPI_SEARCH_CACHE_SIZE", size),
+        ("STAC_FASTAPI_SEARCH_CACHE_TTL", ttl),
+    ):
+        if value:
+            monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match="STAC_FASTAPI_SEARCH_CACHE_SIZE"):
+        SearchCache.from_env()
+
+
+def test_search_cache_from_env(monkeypatch):
+    assert not SearchCache.from_env().enabled
+    monkeypatch.setenv("STAC_FASTAPI_SEARCH_CACHE_SIZE", "100")
+    monkeypatch.setenv("STAC_FASTAPI_SEARCH_CACHE_TTL", "5")
+    search_cache = SearchCache.from_env()
+    assert search_cache.enabled
+    assert (search_cache.cache.max_size, search_cache.cache.ttl) == (100, 5.0)
+
+
+def test_collection_cache():
+    collection_cache = CollectionCache(cache=TTLCache(max_size=10, ttl=60))
+    collection_cache.set("c1", {"id": "c1"})
+    collection_cache.set("c2", None)
+    assert collection_cache.get("c1") == {"id": "c1"}
+    assert collection_cache.get("c2") is MISSING
+    assert collection_cache.get("c3") is None
+
+    collection_cache.get("c1")["id"] = "changed"
+    assert collection_cache.get("c1") == {"id": "c1"}
+
+    collection_cache.invalidate("c1")
+    assert collection_cache.get("c1") is None
+    assert collection_cache.get("c2") is MISSING
+
+
+@pytest.mark.asyncio
+async def test_collection_cache_revalidate(clock):
+    collection_cache = CollectionCache(
+        cache=TTLCache(max_size=10, ttl=60), version_check_interval=5
+    )
+    versions = [(1, 0)]
+    checks = []
+
+    async def get_version():
+        checks.append(clock[0])
+        return versions[0]
+
+    await collection_cache.revalidate(get_version)
+    collection_cache.set("c1", {"id": "c1"})
+
+    # the version is not checked again within the interval
+    versions[0] = (2, 0)
+    clock[0] = 4
+    await collection_cache.revalidate(get_version)
+    assert checks == [0] and collection_cache.get("c1") == {"id": "c1"}
+
+    clock[0] = 5
+    await collection_cache.revalidate(get_version)
+    assert checks == [0, 5] and collection_cache.get("c1") is None
+
+    # an unchanged version keeps the cached collections
+    collection_cache.set("c1", {"id": "c1"})
+    clock[0] = 10
+    await collection_cache.revalidate(get_version)
+    assert collection_cache.get("c1") == {"id": "c1"}
+
+
+def test_filter_cache(monkeypatch):
+    cache = FilterCache.from_env()
+    cql2_json = cache.parse_text("eo:cloud_cover < 10 AND platform = 'landsat-8'")
+    assert cql2_json["op"] == "and"
+    assert (
+        cache.parse_text("eo:cloud_cover < 10 AND platform = 'landsat-8'") == cql2_json
+    )
+
+    query = cache.to_es(cql2_json)
+    assert query == filter.to_es_filter(cql2_json)
+    # keys are compared regardless of their order
+    assert cache.to_es(dict(reversed(list(cql2_json.items())))) == query
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+    # the callers get copies of the cached filters
+    query["bool"].clear()
+    assert cache.to_es(cql2_json) == filter.to_es_filter(cql2_json)
+
+    monkeypatch.setenv("STAC_FASTAPI_FILTER_CACHE_SIZE", "0")
+    disabled = FilterCache.from_env()
+    assert disabled.to_es(cql2_json) == filter.to_es_filter(cql2_json)
+    assert disabled.stats()["size"] == 0
@@ -0,0 +1,51 @@
+import pytest
+
+from stac_fastapi.core.envelope import (
+    BBoxFilterMode,
+    bbox_envelope,
+    envelope_coordinates,
+    get_bbox_filter_mode,
+)
+from stac_fastapi.core.serializers import ItemSerializer
+
+
+def test_get_bbox_filter_mode(monkeypatch):
+    assert get_bbox_filter_mode() == BBoxFilterMode.GEOMETRY
+    monkeypatch.setenv("STAC_FASTAPI_BBOX_FILTER", "Envelope")
+    assert get_bbox_filter_mode() == BBoxFilterMode.ENVELOPE
+    monkeypatch.setenv("STAC_FASTAPI_BBOX_FILTER", "polygon")
+    with pytest.raises(ValueError):
+        get_bbox_filter_mode()
+
+
+@pytest.mark.parametrize(
+    "bbox, coordinates",
+    (
+        ([0, 1, 2, 3], [[0, 3], [2, 1]]),
+        ([0, 1, -5, 2, 3, 5], [[0, 3], [2, 1]]),
+    ),
+)
+def test_envelope_coordinates(bbox, coordinates):
+    assert envelope_coordinates(bbox) == coordinates
+    assert bbox_envelope({"bbox": bbox}) == {
+        "type": "envelope",
+        "coordinates": coordinates,
+    }
+
+
+def test_bbox_envelope_missing():
+    assert bbox_envelope({}) is None
+    assert bbox_envelope({"bbox": [0, 1, 2]}) is None
+
+
+def test_item_serializer_envelope(monkeypatch):
+    def item():
+        return {"id": "a", "bbox": [0, 1, 2, 3], "properties": {}, "links": []}
+
+    assert "bbox_envelope" not in ItemSerializer.stac_to_db(item(), "http://test/")
+    monkeypatch.setenv("STAC_FASTAPI_BBOX_FILTER", "envelope")
+    db_item = ItemSerializer.stac_to_db(item(), "http://test/")
+    assert db_item["bbox_envelope"]["coordinates"] == [[0, 3], [2, 1]]
+    assert "bbox_envelope" not in ItemSerializer.db_to_stac(
+        dict(db_item, collection="c"), "http://test/"
+    )
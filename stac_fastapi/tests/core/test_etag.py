@@ -0,0 +1,75 @@
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+
+from stac_fastapi.core.etag import (
+    ItemVersion,
+    PreconditionFailedError,
+    if_match_version,
+    set_item_etag,
+    setup_etags,
+)
+
+
+def test_item_version_etag():
+    version = ItemVersion(seq_no=12, primary_term=3)
+    assert version.etag == '"12-3"'
+    assert ItemVersion.from_etag(version.etag) == version
+    assert ItemVersion.from_etag('W/"12-3"') is None
+    assert ItemVersion.from_etag("12-3") is None
+    assert version.index_params() == {"if_seq_no": 12, "if_primary_term": 3}
+
+
+def test_item_version_from_response():
+    assert ItemVersion.from_response(
+        {"_id": "a", "_seq_no": 4, "_primary_term": 1}
+    ) == ItemVersion(seq_no=4, primary_term=1)
+    assert ItemVersion.from_response({"_id": "a"}) is None
+
+
+class HeadersRequest:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_if_match_version():
+    assert if_match_version(HeadersRequest({})) is None
+    assert if_match_version(HeadersRequest({"if-match": "*"})) is None
+    assert if_match_version(HeadersRequest({"if-match": '"7-2"'})) == ItemVersion(
+        seq_no=7, primary_term=2
+    )
+    with pytest.raises(PreconditionFailedError):
+        if_match_version(HeadersRequest({"if-match": '"7-2", "8-2"'}))
+    # requests without headers, e.g. of the client tests
+    assert if_match_version(object()) is None
+
+
+@pytest.mark.asyncio
+async def test_setup_etags():
+    app = FastAPI()
+
+    @app.get("/items/{seq_no}")
+    def get_item(seq_no: int, request: Request):
+        set_item_etag(request, ItemVersion(seq_no=seq_no, primary_term=1))
+        return {}
+
+    @app.put("/items/{seq_no}")
+    def update_item(seq_no: int, request: Request):
+        version = if_match_version(request)
+        if version is not None and version.seq_no != seq_no:
+            raise PreconditionFailedError("Item was modified")
+        return {}
+
+    setup_etags(app)
+
+    async with AsyncClient(app=app, base_url="http://test") as c:
+        resp = await c.get("/items/3")
+        assert resp.headers["etag"] == '"3-1"'
+
+        resp = await c.put("/items/3", headers={"If-Match": '"3-1"'})
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+
+        resp = await c.put("/items/4", headers={"If-Match": '"3-1"'})
+        assert resp.status_code == 412
+        assert resp.json()["code"] == "PreconditionFailedError"
@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from stac_fastapi.core.extents import (
+    CollectionExtent,
+    CollectionExtents,
+    bbox_intersects,
+    geometry_bbox,
+)
+
+
+def extent_collection(collection_id, bbox, interval):
+    return {
+        "id": collection_id,
+        "extent": {"spatial": {"bbox": [bbox]}, "temporal": {"interval": [interval]}},
+    }
+
+
+@pytest.mark.parametrize(
+    "a, b, intersects",
+    [
+        ([0, 0, 10, 10], [5, 5, 15, 15], True),
+        ([0, 0, 10, 10], [10, 10, 20, 20], True),
+        ([0, 0, 10, 10], [11, 0, 20, 10], False),
+        ([0, 0, 10, 10], [0, 11, 10, 20], False),
+        # crossing the antimeridian
+        ([170, 0, -170, 10], [175, 5, 178, 6], True),
+        ([170, 0, -170, 10], [-175, 5, -172, 6], True),
+        ([170, 0, -170, 10], [0, 0, 10, 10], False),
+    ],
+)
+def test_bbox_intersects(a, b, intersects):
+    assert bbox_intersects(a, b) is intersects
+    assert bbox_intersects(b, a) is intersects
+
+
+def test_geometry_bbox():
+    assert geometry_bbox({"type": "Point", "coordinates": [1, 2]}) == [1, 2, 1, 2]
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[[0, 1], [4, 1], [4, 3], [0, 3], [0, 1]]],
+    }
+    assert geometry_bbox(polygon) == [0, 1, 4, 3]
+    assert geometry_bbox({"type": "GeometryCollection", "geometries": []}) is None
+
+
+def test_collection_extent_matches():
+    extent = CollectionExtent.from_collection(
+        extent_collection("a", [0, 0, 10, 10], ["2020-01-01T00:00:00Z", None])
+    )
+    assert extent.matches([5, 5, 6, 6], None)
+    assert not extent.matches([20, 20, 30, 30], None)
+    assert extent.matches(
+        [5, 5, 6, 6], (datetime(2021, 1, 1, tzinfo=timezone.utc), None)
+    )
+    assert not extent.matches(
+        [5, 5, 6, 6], (None, datetime(2019, 1, 1, tzinfo=timezone.utc))
+    )
+
+    # an unknown extent matches every search
+    unknown = CollectionExtent.from_collection({"id": "b", "extent": {}})
+    assert unknown.bboxes is None and unknown.intervals is None
+    assert unknown.matches(
+        [20, 20, 30, 30], (None, datetime(2019, 1, 1, tzinfo=timezone.utc))
+    )
+
+
+@pytest.mark.asyncio
+async def test_collection_extents_matching_collections():
+    collections = [
+        extent_collection(
+            "europe",
+            [-10, 35, 30, 70],
+            ["2020-01-01T00:00:00Z", "2020-12-31T00:00:00Z"],
+        ),
+        extent_collection("africa", [-20, -35, 50, 35], ["2015-01-01T00:00:00Z", None]),
+    ]
+    loads = []
+    version = [1]
+
+    async def load_collections():
+        loads.append(1)
+        return collections
+
+    async def get_version():
+        return version[0]
+
+    extents = CollectionExtents(enabled=True, version_check_interval=0)
+
+    async def matching(bbox=None, datetime_search=None):
+        return await extents.matching_collections(
+            load_collections, get_version, bbox=bbox, datetime_search=datetime_search
+        )
+
+    assert await matching() is None
+    assert await matching(bbox=[0, 40, 1, 41]) == ["europe"]
+    assert await matching(bbox=[0, 0, 1, 1]) == ["africa"]
+    assert await matching(bbox=[100, 0, 101, 1]) == []
+    assert await matching(
+        datetime_search={"gte": "2021-06-01T00:00:00Z", "lte": None}
+    ) == ["africa"]
+    assert await matching(datetime_search={"eq": "2020-06-01T00:00:00Z"}) == [
+        "europe",
+        "africa",
+    ]
+    assert len(loads) == 1
+
+    # the table is reloaded when the collections index has changed
+    version[0] = 2
+    await matching(bbox=[0, 40, 1, 41])
+    assert len(loads) == 2
+
+    # and after a collection write of its worker
+    extents.invalidate()
+    await matching(bbox=[0, 40, 1, 41])
+    assert len(loads) == 3
+
+    # pruning is disabled by default
+    assert (
+        await CollectionExtents().matching_collections(
+            load_collections, get_version, bbox=[0, 40, 1, 41]
+        )
+        is None
+    )
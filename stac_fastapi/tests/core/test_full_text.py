@@ -0,0 +1,45 @@
+from stac_fastapi.core.full_text import (
+    full_text_query,
+    get_full_text_properties,
+    with_full_text_mappings,
+)
+
+MAPPINGS = {
+    "properties": {
+        "id": {"type": "keyword"},
+        "properties": {"type": "object", "properties": {"datetime": {"type": "date"}}},
+    }
+}
+
+
+def test_get_full_text_properties(monkeypatch):
+    assert get_full_text_properties() == []
+    monkeypatch.setenv("STAC_FASTAPI_FULL_TEXT_PROPERTIES", "title, keywords,,")
+    assert get_full_text_properties() == ["title", "keywords"]
+
+
+def test_with_full_text_mappings():
+    assert with_full_text_mappings(MAPPINGS, []) == MAPPINGS
+
+    mappings = with_full_text_mappings(MAPPINGS, ["title", "platform"])
+    assert mappings["properties"]["full_text"] == {"type": "text"}
+    assert mappings["properties"]["properties"]["properties"] == {
+        "datetime": {"type": "date"},
+        "title": {"type": "text", "copy_to": "full_text"},
+        "platform": {"type": "keyword", "copy_to": "full_text"},
+    }
+    # the original mappings are left unchanged
+    assert "full_text" not in MAPPINGS["properties"]
+
+
+def test_full_text_query():
+    assert full_text_query([]) is None
+    assert full_text_query(["landsat"]) == {"match_phrase": {"full_text": "landsat"}}
+    assert full_text_query(["landsat", "sentinel 2"]) == {
+        "bool": {
+            "should": [
+                {"match_phrase": {"full_text": "landsat"}},
+                {"match_phrase": {"full_text": "sentinel 2"}},
+            ]
+        }
+    }
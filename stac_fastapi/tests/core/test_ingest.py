@@ -0,0 +1,58 @@
+import pytest
+from fastapi import HTTPException
+
+from stac_fastapi.core.bulk import BulkItemResult
+from stac_fastapi.core.ingest import IngestSummary, ndjson_lines
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def read_lines(chunks, **kwargs):
+    return [line async for line in ndjson_lines(stream(*chunks), **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines():
+    lines = await read_lines(
+        [b'{"id": ', b'"a"}\n\n{"id"', b': "b"}\r\n', b'{"id": "c"}']
+    )
+    assert lines == [(1, b'{"id": "a"}'), (3, b'{"id": "b"}'), (4, b'{"id": "c"}')]
+
+    assert await read_lines([]) == []
+    assert await read_lines([b"\n", b" \n"]) == []
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines_max_line_bytes():
+    assert await read_lines([b"12345\n", b"6789"], max_line_bytes=5) == [
+        (1, b"12345"),
+        (2, b"6789"),
+    ]
+    with pytest.raises(HTTPException) as e:
+        await read_lines([b"12345\n", b"678", b"901"], max_line_bytes=5)
+    assert e.value.status_code == 413
+    assert "Line 2" in e.value.detail
+
+
+def test_ingest_summary():
+    summary = IngestSummary(max_errors=2)
+    summary.add_error(1, None, "invalid item")
+    summary.add_results(
+        [2, 3, 4],
+        [
+            BulkItemResult(id="a", status=201),
+            BulkItemResult(id="b", status=409, error="exists"),
+            BulkItemResult(id="c", status=409, error="exists"),
+        ],
+    )
+    assert summary.to_dict() == {
+        "added": 1,
+        "failed": 3,
+        "errors": [
+            {"line": 1, "id": None, "error": "invalid item"},
+            {"line": 3, "id": "b", "error": "exists"},
+        ],
+    }
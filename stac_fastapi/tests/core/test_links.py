@@ -0,0 +1,90 @@
+import attr
+import pytest
+from starlette.requests import Request
+
+from stac_fastapi.core.context import get_request_context
+from stac_fastapi.core.models.links import (
+    BaseLinks,
+    PagingLinks,
+    item_links_template,
+    link_method_names,
+)
+from stac_fastapi.types.links import ItemLinks
+
+
+@pytest.mark.parametrize("base_url", ("http://test/", "http://test/api/v1/"))
+@pytest.mark.parametrize(
+    "collection_id, item_id", (("collection", "item"), ("a b", "x:y"))
+)
+def test_item_links_template(base_url, collection_id, item_id):
+    expected = ItemLinks(
+        collection_id=collection_id, item_id=item_id, base_url=base_url
+    ).create_links()
+    links = item_links_template(base_url).create_links(
+        collection_id=collection_id, item_id=item_id
+    )
+    assert links == expected
+    assert item_links_template(base_url) is item_links_template(base_url)
+
+
+def make_request(method="GET", path="/", body=b""):
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "scheme": "http",
+            "server": ("test", 80),
+            "path": path,
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"test")],
+        },
+        receive,
+    )
+
+
+def test_link_method_names():
+    @attr.s
+    class ExtraLinks(BaseLinks):
+        def link_extra(self):
+            return dict(rel="extra", href=self.base_url)
+
+        def link_missing(self):
+            return None
+
+    assert link_method_names(ExtraLinks) == [
+        "link_extra",
+        "link_missing",
+        "link_root",
+        "link_self",
+    ]
+
+    links = ExtraLinks(request=make_request()).create_links()
+    assert [link["rel"] for link in links] == ["extra", "root", "self"]
+
+
+@pytest.mark.asyncio
+async def test_paging_links_post():
+    request = make_request("POST", "/search", b'{"collections": ["a"]}')
+    links = await PagingLinks(request=request, next="token").get_links()
+    next_link = next(link for link in links if link["rel"] == "next")
+    assert next_link["href"] == "http://test/search"
+    assert next_link["body"] == {"collections": ["a"], "token": "token"}
+
+
+def test_request_context():
+    request = make_request(path="/search")
+    context = get_request_context(request)
+    assert get_request_context(request) is context
+    assert context.base_url == "http://test/"
+    assert context.url == "http://test/search"
+
+    class Extension:
+        pass
+
+    assert context.set_extensions([Extension()]) == ["Extension"]
+    # the extensions are only set once per request
+    assert context.set_extensions(["Other"]) == ["Extension"]
@@ -0,0 +1,132 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+from stac_fastapi.core.metrics import (
+    cluster_call,
+    count_items,
+    metrics_enabled,
+    observe_count,
+    setup_metrics,
+)
+
+
+def sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(f"stac_fastapi_{name}", labels) or 0.0
+
+
+def test_metrics_enabled(monkeypatch):
+    monkeypatch.delenv("STAC_FASTAPI_METRICS", raising=False)
+    assert not metrics_enabled()
+    monkeypatch.setenv("STAC_FASTAPI_METRICS", "True")
+    assert metrics_enabled()
+    assert not metrics_enabled("false")
+
+
+@pytest.mark.asyncio
+async def test_cluster_call():
+    @cluster_call
+    async def find_things(fail: bool):
+        if fail:
+            raise KeyError("missing")
+        return "found"
+
+    @cluster_call
+    def sync_find_things():
+        return "found"
+
+    count = sample("cluster_call_duration_seconds_count", method="find_things")
+    errors = sample("cluster_call_errors_total", method="find_things", error="KeyError")
+
+    assert await find_things(False) == "found"
+    with pytest.raises(KeyError):
+        await find_things(True)
+    assert sync_find_things() == "found"
+
+    assert (
+        sample("cluster_call_duration_seconds_count", method="find_things") == count + 2
+    )
+    assert (
+        sample("cluster_call_errors_total", method="find_things", error="KeyError")
+        == errors + 1
+    )
+    assert sample("cluster_call_duration_seconds_count", method="sync_find_things") >= 1
+
+
+def test_count_items():
+    returned = sample("items_returned_total")
+    items = count_items(iter([1, 2, 3]))
+    assert sample("items_returned_total") == returned
+    assert list(items) == [1, 2, 3]
+    assert sample("items_returned_total") == returned + 3
+
+
+@pytest.mark.parametrize(
+    "total,outcome",
+    (
+        ({"value": 3, "relation": "eq"}, "completed"),
+        ({"value": 10000, "relation": "gte"}, "discarded"),
+        (None, "disabled"),
+    ),
+)
+def test_observe_count(total, outcome):
+    observed = sample("search_counts_total", outcome=outcome)
+    observe_count(total)
+    assert sample("search_counts_total", outcome=outcome) == observed + 1
+
+
+class Cache:
+    def __init__(self, hits, misses):
+        self.hits = hits
+        self.misses = misses
+
+    def stats(self):
+        return {
+            "size": 1,
+            "max_size": 10,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": 0,
+        }
+
+
+class Database:
+    search_cache = Cache(3, 1)
+    collection_cache = Cache(0, 0)
+    filter_cache = Cache(1, 1)
+
+
+@pytest.mark.asyncio
+async def test_setup_metrics():
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    def get_thing(thing_id: str):
+        return {"id": thing_id}
+
+    setup_metrics(app, metrics="true", database=Database())
+
+    async with AsyncClient(app=app, base_url="http://test") as c:
+        assert (await c.get("/things/a")).status_code == 200
+        resp = await c.get("/metrics")
+
+    assert resp.status_code == 200
+    lines = resp.text.splitlines()
+    assert (
+        'stac_fastapi_request_duration_seconds_count{method="GET",route="/things/{thing_id}",status="200"} 1.0'
+        in lines
+    )
+    assert (
+        'stac_fastapi_response_bytes_total{method="GET",route="/things/{thing_id}"} 10.0'
+        in lines
+    )
+    assert 'stac_fastapi_cache_hit_ratio{cache="search"} 0.75' in lines
+    assert 'stac_fastapi_cache_hit_ratio{cache="collection"} 0.0' in lines
+    assert 'stac_fastapi_cache_hits_total{cache="filter"} 1.0' in lines
+
+
+def test_setup_metrics_disabled():
+    app = FastAPI()
+    setup_metrics(app, metrics="false")
+    assert "/metrics" not in [route.path for route in app.routes]
@@ -0,0 +1,58 @@
+import pytest
+
+from stac_fastapi.core.partitions import (
+    PartitionInterval,
+    get_partition_interval,
+    partition_suffix,
+    partition_suffixes,
+)
+
+
+def test_get_partition_interval(monkeypatch):
+    monkeypatch.delenv("STAC_FASTAPI_ITEMS_PARTITION", raising=False)
+    assert get_partition_interval() == PartitionInterval.NONE
+
+    monkeypatch.setenv("STAC_FASTAPI_ITEMS_PARTITION", "Month")
+    assert get_partition_interval() == PartitionInterval.MONTH
+
+    monkeypatch.setenv("STAC_FASTAPI_ITEMS_PARTITION", "week")
+    with pytest.raises(ValueError):
+        get_partition_interval()
+
+
+@pytest.mark.parametrize(
+    "interval, item_datetime, suffix",
+    [
+        (PartitionInterval.NONE, "2020-02-12T12:30:22Z", None),
+        (PartitionInterval.YEAR, "2020-02-12T12:30:22Z", "2020"),
+        (PartitionInterval.MONTH, "2020-02-12T12:30:22Z", "2020-02"),
+        # partitions are in UTC
+        (PartitionInterval.MONTH, "2020-03-01T00:30:00+01:00", "2020-02"),
+        (PartitionInterval.MONTH, None, None),
+    ],
+)
+def test_partition_suffix(interval, item_datetime, suffix):
+    assert partition_suffix(item_datetime, interval) == suffix
+
+
+def test_partition_suffixes():
+    assert partition_suffixes(None) is None
+    assert partition_suffixes({"gte": "2020-01-01T00:00:00Z", "lte": None}) is None
+    assert partition_suffixes({"gte": None, "lte": "2020-01-01T00:00:00Z"}) is None
+
+    assert partition_suffixes(
+        {"gte": "2020-02-12T00:00:00Z", "lte": "2020-02-12T00:00:00Z"}
+    ) == ["2020", "2020-02"]
+    assert partition_suffixes({"eq": "2020-02-12T00:00:00Z"}) == ["2020", "2020-02"]
+
+    # whole years are matched with a pattern
+    assert partition_suffixes(
+        {"gte": "2019-11-30T00:00:00Z", "lte": "2021-01-31T00:00:00Z"}
+    ) == ["2019", "2019-11", "2019-12", "2020*", "2021", "2021-01"]
+
+    assert (
+        partition_suffixes(
+            {"gte": "2021-01-01T00:00:00Z", "lte": "2020-01-01T00:00:00Z"}
+        )
+        == []
+    )
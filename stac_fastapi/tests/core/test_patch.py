@@ -0,0 +1,255 @@
+import pytest
+from fastapi import HTTPException
+
+from stac_fastapi.core.patch import (
+    JSON_PATCH_MEDIA_TYPE,
+    MERGE_PATCH_MEDIA_TYPE,
+    PATCH_SCRIPT,
+    ItemPatch,
+    bulk_patch_result,
+    bulk_patch_summary,
+    parse_pointer,
+    patch_error_reason,
+    patch_error_status,
+)
+
+ITEM = {
+    "type": "Feature",
+    "id": "item",
+    "collection": "collection",
+    "geometry": {"type": "Point", "coordinates": [0.0, 0.0]},
+    "properties": {
+        "datetime": "2020-01-01T00:00:00Z",
+        "gsd": 15,
+        "keywords": ["a", "b"],
+    },
+}
+
+
+def test_parse_pointer():
+    assert parse_pointer("/properties/eo:cloud_cover") == [
+        "properties",
+        "eo:cloud_cover",
+    ]
+    assert parse_pointer("/properties/a~1b~0c") == ["properties", "a/b~c"]
+    for pointer in ("", "properties", "/id", "/collection", "/bbox_envelope", 1):
+        with pytest.raises(HTTPException) as e:
+            parse_pointer(pointer)
+        assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "body,media_type",
+    [
+        ({"id": "another"}, MERGE_PATCH_MEDIA_TYPE),
+        ([{"op": "replace", "path": "/properties/gsd"}], JSON_PATCH_MEDIA_TYPE),
+        ([{"op": "unknown", "path": "/properties/gsd"}], JSON_PATCH_MEDIA_TYPE),
+        ({"op": "remove", "path": "/properties/gsd"}, JSON_PATCH_MEDIA_TYPE),
+        ([], MERGE_PATCH_MEDIA_TYPE),
+    ],
+)
+def test_invalid_patch(body, media_type):
+    with pytest.raises(HTTPException) as e:
+        ItemPatch.from_body(body, media_type)
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"properties": {"gsd": 10, "eo:cloud_cover": None, "view": {"azimuth": 1}}},
+        {"assets": {"x": {"href": "a.tif", "title": None}, "y": None}},
+        [{"op": "copy", "from": "/geometry", "path": "/properties/footprint"}],
+        [{"op": "move", "from": "/properties/gsd", "path": "/properties/res"}],
+        [{"op": "replace", "path": "/assets/x/href", "value": "b.tif"}],
+        [{"op": "remove", "path": "/assets/x/title"}],
+        [{"op": "test", "path": "/stac_version", "value": "1.0.0"}],
+    ],
+)
+def test_patch_in_place(patch):
+    assert ItemPatch.from_value(patch).in_place_error() is None
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"stac_version": None},
+        {"geometry": None},
+        {"properties": None},
+        {"properties": {"datetime": "2021-01-01T00:00:00Z"}},
+        {"properties": {"start_datetime": None}},
+        {"properties": {"gsd": -1}},
+        {"assets": "x"},
+        {"assets": {"x": {"href": None}}},
+        {"assets": {"x": {"title": "an asset without href"}}},
+        [{"op": "move", "from": "/geometry", "path": "/properties/footprint"}],
+        [{"op": "copy", "from": "/assets/x", "path": "/assets/y"}],
+        [{"op": "remove", "path": "/assets/x/href"}],
+        [{"op": "add", "path": "/assets/x", "value": {"title": "t"}}],
+    ],
+)
+def test_patch_not_in_place(patch):
+    assert ItemPatch.from_value(patch).in_place_error()
+
+
+def test_patch_update_body():
+    patch = ItemPatch.from_merge_patch({"properties": {"gsd": 10}})
+    assert patch.update_body("now") == {
+        "doc": {"properties": {"gsd": 10, "updated": "now"}}
+    }
+    assert patch.merge == {"properties": {"gsd": 10}}
+
+    script = ItemPatch.from_merge_patch({"properties": {"gsd": None}}).update_body(
+        "now"
+    )["script"]
+    assert script["source"] == PATCH_SCRIPT
+    assert script["params"] == {
+        "operations": [
+            {"op": "merge", "path": [], "value": {"properties": {"gsd": None}}}
+        ],
+        "updated": "now",
+    }
+
+    script = ItemPatch.from_json_patch(
+        [{"op": "move", "from": "/properties/gsd", "path": "/properties/res"}]
+    ).update_body("now")["script"]
+    assert script["params"]["operations"] == [
+        {"op": "move", "path": ["properties", "res"], "from": ["properties", "gsd"]}
+    ]
+
+
+def test_patch_apply():
+    patch = ItemPatch.from_json_patch(
+        [
+            {"op": "test", "path": "/properties/gsd", "value": 15},
+            {"op": "add", "path": "/properties/keywords/1", "value": "c"},
+            {"op": "move", "from": "/properties/keywords/0", "path": "/properties/k"},
+            {"op": "copy", "from": "/properties/gsd", "path": "/properties/res"},
+            {"op": "replace", "path": "/properties/gsd", "value": 30},
+            {"op": "remove", "path": "/properties/keywords/1"},
+        ]
+    )
+    item = patch.apply(ITEM)
+    assert item["properties"] == {
+        "datetime": "2020-01-01T00:00:00Z",
+        "gsd": 30,
+        "keywords": ["c"],
+        "k": "a",
+        "res": 15,
+    }
+    assert ITEM["properties"]["gsd"] == 15
+
+    item = ItemPatch.from_merge_patch(
+        {"properties": {"gsd": None, "keywords": ["x"], "view": {"azimuth": 1}}}
+    ).apply(ITEM)
+    assert item["properties"] == {
+        "datetime": "2020-01-01T00:00:00Z",
+        "keywords": ["x"],
+        "view": {"azimuth": 1},
+    }
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "test", "path": "/properties/gsd", "value": 30},
+        {"op": "remove", "path": "/properties/missing"},
+        {"op": "replace", "path": "/properties/keywords/2", "value": "c"},
+        {"op": "add", "path": "/properties/missing/key", "value": 1},
+    ],
+)
+def test_patch_apply_conflict(operation):
+    with pytest.raises(HTTPException) as e:
+        ItemPatch.from_json_patch([operation]).apply(ITEM)
+    assert e.value.status_code == 409
+
+
+def test_patch_apply_defaulted_field():
+    item = dict(ITEM, stac_version="1.0.0")
+    with pytest.raises(HTTPException) as e:
+        ItemPatch.from_merge_patch({"stac_version": None}).apply(item)
+    assert e.value.status_code == 400
+    assert (
+        ItemPatch.from_merge_patch({"stac_version": "1.1.0"}).apply(item)[
+            "stac_version"
+        ]
+        == "1.1.0"
+    )
+
+
+def test_patch_error_reason():
+    error = {
+        "type": "illegal_argument_exception",
+        "reason": "failed to execute script",
+        "caused_by": {
+            "type": "script_exception",
+            "reason": "runtime error",
+            "caused_by": {
+                "type": "illegal_argument_exception",
+                "reason": "Path not found: gsd",
+            },
+        },
+    }
+    assert patch_error_reason({"error": error, "status": 400}) == "Path not found: gsd"
+    assert patch_error_reason("error") == "error"
+    assert patch_error_status({"error": error, "status": 400}) == 409
+
+    mapping_error = {
+        "type": "mapper_parsing_exception",
+        "reason": "failed to parse field [properties.eo:cloud_cover] of type [long]",
+    }
+    assert patch_error_status({"error": mapping_error, "status": 400}) == 400
+
+
+def test_bulk_patch_results():
+    results = [
+        bulk_patch_result("a", "c", (True, {"update": {"status": 200}})),
+        bulk_patch_result(
+            "b",
+            "c",
+            (
+                False,
+                {
+                    "update": {
+                        "status": 400,
+                        "error": {
+                            "reason": "failed to execute script",
+                            "caused_by": {
+                                "type": "script_exception",
+                                "caused_by": {"reason": "Test failed: properties/gsd"},
+                            },
+                        },
+                    }
+                },
+            ),
+        ),
+        bulk_patch_result(
+            "d", "c", (False, {"update": {"status": 404, "error": {"reason": "x"}}})
+        ),
+        bulk_patch_result(
+            "e",
+            "c",
+            (
+                False,
+                {
+                    "update": {
+                        "status": 400,
+                        "error": {
+                            "type": "mapper_parsing_exception",
+                            "reason": "failed to parse field [properties.gsd]",
+                        },
+                    }
+                },
+            ),
+        ),
+    ]
+    assert [result.status for result in results] == [200, 409, 404, 400]
+    assert bulk_patch_summary(results) == {
+        "patched": 1,
+        "failed": 3,
+        "errors": [
+            {"id": "b", "error": "Test failed: properties/gsd"},
+            {"id": "d", "error": "Item d does not exist in Collection c"},
+            {"id": "e", "error": "failed to parse field [properties.gsd]"},
+        ],
+    }
@@ -0,0 +1,120 @@
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+
+from stac_fastapi.core.profiling import (
+    Profiler,
+    ProfilingMode,
+    cluster_profiling_enabled,
+    get_profiler,
+    get_profiling_mode,
+    profile_stage,
+    setup_profiling,
+)
+
+
+def test_get_profiling_mode(monkeypatch):
+    monkeypatch.delenv("STAC_FASTAPI_PROFILING", raising=False)
+    assert get_profiling_mode() == ProfilingMode.OFF
+    monkeypatch.setenv("STAC_FASTAPI_PROFILING", "Always")
+    assert get_profiling_mode() == ProfilingMode.ALWAYS
+    assert get_profiling_mode("header") == ProfilingMode.HEADER
+    with pytest.raises(ValueError):
+        get_profiling_mode("sometimes")
+
+
+def test_profiler_server_timing():
+    profiler = Profiler()
+    with profiler.stage("build"):
+        pass
+    profiler.add("search", 2.5)
+    profiler.add("search", 1.0)
+    profiler.add_cluster_response({"took": 3, "profile": {"shards": []}})
+    profiler.returned()
+
+    timings = profiler.server_timing().split(", ")
+    assert [timing.split(";")[0] for timing in timings] == [
+        "build",
+        "search",
+        "took",
+        "encode",
+        "total",
+    ]
+    assert timings[1] == "search;dur=3.500"
+    assert timings[2] == "took;dur=3.000"
+    assert profiler.cluster_profile == {"shards": []}
+
+
+def test_profile_stage_without_profiler():
+    with profile_stage(None, "build"):
+        pass
+
+
+def profiled_app(profiling: str, cluster_profiling: str = "false") -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    def root(request: Request):
+        profiler = get_profiler(request)
+        if profiler is None:
+            return {}
+        profiler.handled()
+        with profile_stage(profiler, "build"):
+            pass
+        return {"cluster": profiler.cluster}
+
+    setup_profiling(app, profiling=profiling, cluster_profiling=cluster_profiling)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_profiling_header():
+    async with AsyncClient(app=profiled_app("header"), base_url="http://test") as c:
+        resp = await c.get("/")
+        assert resp.json() == {}
+        assert "server-timing" not in resp.headers
+
+        resp = await c.get("/", headers={"X-Profile": "1"})
+        assert resp.json() == {"cluster": False}
+        stages = [t.split(";")[0] for t in resp.headers["server-timing"].split(", ")]
+        assert stages == ["validate", "build", "total"]
+
+        # the cluster profile is not allowed
+        resp = await c.get("/", headers={"X-Profile": "cluster"})
+        assert resp.json() == {"cluster": False}
+        assert "server-timing" in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_profiling_cluster():
+    app = profiled_app("header", cluster_profiling="true")
+    async with AsyncClient(app=app, base_url="http://test") as c:
+        resp = await c.get("/", headers={"X-Profile": "cluster"})
+        assert resp.json() == {"cluster": True}
+
+        resp = await c.get("/", headers={"X-Profile": "1"})
+        assert resp.json() == {"cluster": False}
+
+
+def test_cluster_profiling_enabled(monkeypatch):
+    monkeypatch.delenv("STAC_FASTAPI_CLUSTER_PROFILING", raising=False)
+    assert not cluster_profiling_enabled()
+    monkeypatch.setenv("STAC_FASTAPI_CLUSTER_PROFILING", "True")
+    assert cluster_profiling_enabled()
+    assert not cluster_profiling_enabled("false")
+
+
+@pytest.mark.asyncio
+async def test_profiling_always():
+    async with AsyncClient(app=profiled_app("always"), base_url="http://test") as c:
+        resp = await c.get("/")
+        assert resp.json() == {"cluster": False}
+        assert "server-timing" in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_profiling_off():
+    async with AsyncClient(app=profiled_app("off"), base_url="http://test") as c:
+        resp = await c.get("/", headers={"X-Profile": "1"})
+        assert resp.json() == {}
+        assert "server-timing" not in resp.headers
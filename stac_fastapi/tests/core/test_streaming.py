@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from starlette.requests import Request
+
+from stac_fastapi.core.streaming import (
+    GEOJSON_MEDIA_TYPE,
+    GEOJSON_SEQ_MEDIA_TYPE,
+    raw_item_collection,
+    raw_responses_enabled,
+    stream_feature_collection,
+    stream_geojson_seq,
+    streaming_media_type,
+)
+
+FEATURES = [{"type": "Feature", "id": "a"}, {"type": "Feature", "id": "b"}]
+LINKS = [{"rel": "root", "href": "http://test/"}]
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("features", (FEATURES, []))
+@pytest.mark.parametrize("matched", (None, 2))
+async def test_stream_feature_collection(features, matched):
+    body = await collect(stream_feature_collection(iter(features), LINKS, matched))
+    expected = {
+        "type": "FeatureCollection",
+        "features": features,
+        "links": LINKS,
+        "numReturned": len(features),
+    }
+    if matched is not None:
+        expected["numMatched"] = matched
+    assert json.loads(body) == expected
+
+
+@pytest.mark.asyncio
+async def test_stream_geojson_seq():
+    body = await collect(stream_geojson_seq(iter(FEATURES)))
+    assert body.startswith(b"\x1e") and body.endswith(b"\n")
+    assert [json.loads(record) for record in body.split(b"\x1e")[1:]] == FEATURES
+
+
+@pytest.mark.asyncio
+async def test_raw_item_collection(monkeypatch):
+    assert not raw_responses_enabled()
+    monkeypatch.setenv("STAC_FASTAPI_RAW_RESPONSES", "true")
+    assert raw_responses_enabled()
+
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("test", 80),
+            "path": "/search",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"test")],
+        }
+    )
+    response = await raw_item_collection(request, iter(FEATURES), None, 2)
+    assert response.media_type == GEOJSON_MEDIA_TYPE
+    body = json.loads(response.body)
+    assert body["features"] == FEATURES
+    assert body["numReturned"] == 2 and body["numMatched"] == 2
+    assert {link["rel"] for link in body["links"]} == {"root", "self"}
+
+
+@pytest.mark.parametrize(
+    "accept, streaming, expected",
+    (
+        ("application/geo+json-seq", "false", GEOJSON_SEQ_MEDIA_TYPE),
+        (
+            "application/json, application/geo+json-seq;q=0.9",
+            "false",
+            GEOJSON_SEQ_MEDIA_TYPE,
+        ),
+        ("application/geo+json", "true", GEOJSON_MEDIA_TYPE),
+        ("application/geo+json", "false", None),
+        (None, "false", None),
+    ),
+)
+def test_streaming_media_type(accept, streaming, expected, monkeypatch):
+    monkeypatch.setenv("STAC_FASTAPI_STREAMING_RESPONSES", streaming)
+    headers = [(b"accept", accept.encode())] if accept else []
+    request = Request({"type": "http", "headers": headers})
+    assert streaming_media_type(request) == expected
@@ -0,0 +1,95 @@
+import json
+from base64 import urlsafe_b64encode
+
+import pytest
+
+from stac_fastapi.core.utilities import (
+    decode_token,
+    encode_token,
+    filter_fields,
+    merge_async_iterators,
+    source_filter,
+    source_filter_is_complete,
+)
+
+
+@pytest.mark.parametrize(
+    "include, exclude, expected",
+    (
+        (None, None, (None, None)),
+        (set(), set(), (None, None)),
+        (
+            {"properties.datetime"},
+            None,
+            (["collection", "id", "links", "properties.datetime"], None),
+        ),
+        (None, {"assets", "properties.gsd"}, (None, ["assets", "properties.gsd"])),
+        # required fields, and nested fields of required fields, are never excluded
+        (None, {"id", "links.href", "links"}, (None, None)),
+        (
+            {"assets"},
+            {"collection", "assets.B1"},
+            (["assets", "collection", "id", "links"], ["assets.B1"]),
+        ),
+    ),
+)
+def test_source_filter(include, exclude, expected) -> None:
+    assert source_filter(include, exclude) == expected
+
+
+@pytest.mark.parametrize(
+    "include, exclude, expected",
+    (
+        (None, None, True),
+        (None, {"properties.gsd", "assets.B1"}, True),
+        (None, {"assets"}, False),
+        (None, {"links.href"}, False),
+        ({"properties.gsd"}, None, False),
+    ),
+)
+def test_source_filter_is_complete(include, exclude, expected) -> None:
+    assert source_filter_is_complete(include, exclude) is expected
+
+
+def test_source_filter_is_complete_matches_filter_fields(test_item) -> None:
+    exclude = {"properties.gsd", "assets.SR_B1"}
+    assert source_filter_is_complete(None, exclude)
+    # what the _source filter returns for these excludes
+    source = dict(test_item)
+    source["properties"] = {
+        k: v for k, v in test_item["properties"].items() if k != "gsd"
+    }
+    source["assets"] = {k: v for k, v in test_item["assets"].items() if k != "SR_B1"}
+    assert filter_fields(source, None, exclude) == source
+
+
+@pytest.mark.parametrize("pit_id", (None, "pit-id"))
+def test_token_round_trip(pit_id):
+    search_after = ["2020-02-12T12:30:22Z", "item-id", "collection-id"]
+    assert decode_token(encode_token(search_after, pit_id)) == (search_after, pit_id)
+
+
+def test_decode_token_sort_values():
+    # tokens without a point in time are the plain encoded sort values
+    token = urlsafe_b64encode(json.dumps(["2020-02-12T12:30:22Z", "item-id"]).encode())
+    assert decode_token(token.decode()) == (["2020-02-12T12:30:22Z", "item-id"], None)
+
+
+async def count_to(n: int, fail: bool = False):
+    for i in range(n):
+        yield i
+    if fail:
+        raise ValueError("failed")
+
+
+@pytest.mark.asyncio
+async def test_merge_async_iterators():
+    merged = merge_async_iterators([count_to(3), count_to(2), count_to(0)])
+    assert sorted([value async for value in merged]) == [0, 0, 1, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_merge_async_iterators_error():
+    merged = merge_async_iterators([count_to(100), count_to(1, fail=True)])
+    with pytest.raises(ValueError, match="failed"):
+        [value async for value in merged]
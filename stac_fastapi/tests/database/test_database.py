@@ -4,7 +4,12 @@ import uuid
 import pytest
 from stac_pydantic import api
 
-from ..conftest import MockRequest, database
+from stac_fastapi.core.cache import CollectionCache, SearchCache, TTLCache
+from stac_fastapi.core.extents import CollectionExtents
+from stac_fastapi.core.partitions import PartitionInterval
+from stac_fastapi.types.errors import NotFoundError
+
+from ..conftest import DatabaseLogic, MockRequest, create_item, database
 
 if os.getenv("BACKEND", "elasticsearch").lower() == "opensearch":
     from stac_fastapi.opensearch.database_logic import (
@@ -12,6 +17,7 @@ if os.getenv("BACKEND", "elasticsearch").lower() == "opensearch":
         ES_COLLECTIONS_MAPPINGS,
         ES_ITEMS_MAPPINGS,
         index_alias_by_collection_id,
+        index_by_collection_id,
     )
 else:
     from stac_fastapi.elasticsearch.database_logic import (
@@ -19,6 +25,7 @@ else:
         ES_COLLECTIONS_MAPPINGS,
         ES_ITEMS_MAPPINGS,
         index_alias_by_collection_id,
+        index_by_collection_id,
     )
 
 
@@ -51,3 +58,234 @@ async def test_index_mapping_items(txn_client, load_test_data):
         actual_mappings["dynamic_templates"] == ES_ITEMS_MAPPINGS["dynamic_templates"]
     )
     await txn_client.delete_collection(collection["id"])
+
+
+@pytest.mark.asyncio
+async def test_execute_search_source_filter(ctx):
+    items, _, _ = await database.execute_search(
+        search=database.make_search(),
+        limit=1,
+        token=None,
+        sort=None,
+        collection_ids=[ctx.item["collection"]],
+        include={"properties.datetime"},
+        exclude={"links.href"},
+    )
+    [item] = list(items)
+    assert "assets" not in item and "geometry" not in item
+    assert set(item) == {"id", "collection", "links", "properties"}
+    # links are required to serialize the item, so they are never (partly) excluded
+    assert item["links"] and all("href" in link for link in item["links"])
+    assert list(item["properties"]) == ["datetime"]
+
+
+@pytest.mark.asyncio
+async def test_execute_search_pit_pagination(ctx, txn_client):
+    pit_database = DatabaseLogic(pit_pagination=True)
+    second_item = dict(ctx.item, id=f"{ctx.item['id']}-2")
+    await create_item(txn_client, second_item)
+
+    search_args = dict(
+        search=pit_database.make_search(),
+        limit=1,
+        sort=None,
+        collection_ids=[ctx.item["collection"]],
+    )
+    items, _, token = await pit_database.execute_search(token=None, **search_args)
+    [first] = list(items)
+    assert token
+
+    # items created after the first page are not part of the snapshot
+    await create_item(txn_client, dict(ctx.item, id=f"{ctx.item['id']}-3"))
+
+    items, _, token = await pit_database.execute_search(token=token, **search_args)
+    [second] = list(items)
+    assert token is None
+    assert {first["id"], second["id"]} == {ctx.item["id"], second_item["id"]}
+
+
+@pytest.mark.asyncio
+async def test_execute_search_pit_pagination_single_page(ctx, monkeypatch):
+    pit_database = DatabaseLogic(pit_pagination=True)
+    opened = []
+
+    async def open_pit(*args, **kwargs):
+        opened.append(kwargs)
+        raise AssertionError("a single page search must not open a point in time")
+
+    for name in ("open_point_in_time", "create_pit"):
+        monkeypatch.setattr(pit_database.client, name, open_pit, raising=False)
+
+    items, _, token = await pit_database.execute_search(
+        search=pit_database.make_search(),
+        limit=10,
+        token=None,
+        sort=None,
+        collection_ids=[ctx.item["collection"]],
+    )
+    assert [item["id"] for item in items] == [ctx.item["id"]]
+    assert token is None
+    assert opened == []
+
+
+@pytest.mark.asyncio
+async def test_execute_search_cache(ctx, txn_client):
+    search_cache = SearchCache(cache=TTLCache(max_size=10, ttl=60))
+    cached_database = DatabaseLogic(search_cache=search_cache)
+    search_args = dict(
+        search=cached_database.make_search(),
+        limit=10,
+        token=None,
+        sort=None,
+        collection_ids=[ctx.item["collection"]],
+    )
+
+    items, matched, _ = await cached_database.execute_search(**search_args)
+    assert [item["id"] for item in items] == [ctx.item["id"]]
+    items, cached_matched, _ = await cached_database.execute_search(**search_args)
+    assert [item["id"] for item in items] == [ctx.item["id"]]
+    assert cached_matched == matched
+    assert search_cache.stats()["hits"] == 1
+
+    # a write to the collection drops its cached searches
+    await cached_database.delete_item(
+        ctx.item["id"], ctx.item["collection"], refresh=True
+    )
+    items, matched, _ = await cached_database.execute_search(**search_args)
+    assert list(items) == [] and matched == 0
+
+
+@pytest.mark.asyncio
+async def test_find_collection_cache(ctx, txn_client):
+    collection_cache = CollectionCache(cache=TTLCache(max_size=10, ttl=60))
+    cached_database = DatabaseLogic(collection_cache=collection_cache)
+    collection_id = ctx.collection["id"]
+
+    for _ in range(2):
+        collection = await cached_database.find_collection(collection_id)
+        assert collection["id"] == collection_id
+    assert collection_cache.stats()["hits"] == 1
+
+    # missing collections are cached too, until they are created
+    new_collection = dict(ctx.collection, id=f"new-{uuid.uuid4()}")
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            await cached_database.check_collection_exists(new_collection["id"])
+    assert collection_cache.stats()["hits"] == 2
+
+    await cached_database.create_collection(new_collection, refresh=True)
+    await cached_database.check_collection_exists(new_collection["id"])
+    await cached_database.delete_collection(new_collection["id"])
+    with pytest.raises(NotFoundError):
+        await cached_database.find_collection(new_collection["id"])
+
+
+@pytest.mark.asyncio
+async def test_partitioned_item_indices(ctx):
+    partitioned_database = DatabaseLogic(items_partition=PartitionInterval.MONTH)
+    collection_id = ctx.item["collection"]
+    item = dict(
+        ctx.item,
+        id=f"{ctx.item['id']}-2021",
+        properties=dict(ctx.item["properties"], datetime="2021-03-04T05:06:07Z"),
+    )
+    partition = f"{index_by_collection_id(collection_id)}_2021-03"
+
+    async def search_ids(gte, lte):
+        datetime_search = {"gte": gte, "lte": lte}
+        items, _, _ = await partitioned_database.execute_search(
+            search=partitioned_database.apply_datetime_filter(
+                partitioned_database.make_search(), datetime_search
+            ),
+            limit=10,
+            token=None,
+            sort=None,
+            collection_ids=[collection_id],
+            datetime_search=datetime_search,
+        )
+        return [item["id"] for item in items]
+
+    try:
+        await partitioned_database.create_item(item, refresh=True)
+        assert await database.client.indices.exists(index=partition)
+        assert await partitioned_database.item_exists(item["id"], collection_id)
+        found = await partitioned_database.get_one_item(collection_id, item["id"])
+        assert found["id"] == item["id"]
+
+        # the item indexed before partitioning is in the first index of the collection
+        assert await search_ids("2021-03-01T00:00:00Z", "2021-03-31T00:00:00Z") == [
+            item["id"]
+        ]
+        assert await search_ids("2020-01-01T00:00:00Z", "2020-12-31T00:00:00Z") == [
+            ctx.item["id"]
+        ]
+
+        await partitioned_database.delete_item(item["id"], collection_id, refresh=True)
+        with pytest.raises(NotFoundError):
+            await partitioned_database.get_one_item(collection_id, item["id"])
+    finally:
+        await database.client.indices.delete(index=partition, ignore_unavailable=True)
+
+
+@pytest.mark.asyncio
+async def test_execute_search_extent_pruning(ctx):
+    pruned_database = DatabaseLogic(collection_extents=CollectionExtents(enabled=True))
+    regional = dict(
+        ctx.collection,
+        id=f"regional-{uuid.uuid4()}",
+        extent={
+            "spatial": {"bbox": [[0, 0, 1, 1]]},
+            "temporal": {"interval": [["2020-01-01T00:00:00Z", None]]},
+        },
+    )
+    await pruned_database.create_collection(regional, refresh=True)
+    bbox = ctx.item["bbox"]
+
+    try:
+        # the test collection has a global extent, the regional one is left out
+        assert await pruned_database.collections_by_extent(bbox, None) == [
+            ctx.collection["id"]
+        ]
+        assert sorted(
+            await pruned_database.collections_by_extent([0.5, 0.5, 0.6, 0.6], None)
+        ) == sorted([ctx.collection["id"], regional["id"]])
+
+        items, _, _ = await pruned_database.execute_search(
+            search=pruned_database.apply_bbox_filter(
+                pruned_database.make_search(), bbox
+            ),
+            limit=10,
+            token=None,
+            sort=None,
+            collection_ids=None,
+            bbox=bbox,
+        )
+        assert [item["id"] for item in items] == [ctx.item["id"]]
+    finally:
+        await pruned_database.delete_collection(regional["id"])
+
+
+@pytest.mark.asyncio
+async def test_bbox_envelope_filter(ctx, monkeypatch):
+    async def search_ids(bbox):
+        items, _, _ = await database.execute_search(
+            search=database.apply_bbox_filter(database.make_search(), bbox),
+            limit=10,
+            token=None,
+            sort=None,
+            collection_ids=[ctx.collection["id"]],
+        )
+        return [item["id"] for item in items]
+
+    bbox = ctx.item["bbox"]
+    far_away = [-10, -10, -9, -9]
+    monkeypatch.setenv("STAC_FASTAPI_BBOX_FILTER", "envelope")
+    # the test item was indexed without an envelope
+    assert await search_ids(bbox) == []
+
+    await database.migrate_bbox_envelopes(wait_for_completion=True)
+    assert await search_ids(bbox) == [ctx.item["id"]]
+    assert await search_ids(far_away) == []
+
+    monkeypatch.setenv("STAC_FASTAPI_BBOX_FILTER", "exact")
+    assert await search_ids(bbox) == [ctx.item["id"]]
@@ -0,0 +1,58 @@
+import pytest
+
+from stac_fastapi.core.extensions.count import (
+    CountMode,
+    get_count_mode,
+    track_total_hits,
+)
+
+
+@pytest.mark.parametrize(
+    "count_mode, expected",
+    (
+        (CountMode.EXACT, True),
+        (CountMode.BOUNDED, 10000),
+        (CountMode.OFF, False),
+    ),
+)
+def test_track_total_hits(count_mode, expected, monkeypatch) -> None:
+    monkeypatch.delenv("STAC_FASTAPI_COUNT_BOUND", raising=False)
+    assert track_total_hits(count_mode) == expected
+
+
+def test_track_total_hits_bound(monkeypatch) -> None:
+    monkeypatch.setenv("STAC_FASTAPI_COUNT_BOUND", "500")
+    assert track_total_hits(CountMode.BOUNDED) == 500
+
+
+def test_track_total_hits_deployment_default(monkeypatch) -> None:
+    monkeypatch.delenv("STAC_FASTAPI_COUNT_MODE", raising=False)
+    assert track_total_hits() is True
+
+    monkeypatch.setenv("STAC_FASTAPI_COUNT_MODE", "off")
+    assert track_total_hits() is False
+    # the request count mode overrides the deployment one
+    assert track_total_hits(CountMode.EXACT) is True
+
+
+@pytest.mark.parametrize(
+    "env, value",
+    (
+        ("STAC_FASTAPI_COUNT_MODE", "sometimes"),
+        ("STAC_FASTAPI_COUNT_BOUND", "-1"),
+        ("STAC_FASTAPI_COUNT_BOUND", "many"),
+    ),
+)
+def test_track_total_hits_invalid_env(env, value, monkeypatch) -> None:
+    monkeypatch.setenv(env, value)
+    monkeypatch.setenv(
+        "STAC_FASTAPI_COUNT_MODE",
+        value if env == "STAC_FASTAPI_COUNT_MODE" else "bounded",
+    )
+    with pytest.raises(ValueError, match=env):
+        track_total_hits()
+
+
+def test_get_count_mode_case_insensitive(monkeypatch) -> None:
+    monkeypatch.setenv("STAC_FASTAPI_COUNT_MODE", "Bounded")
+    assert get_count_mode() == CountMode.BOUNDED
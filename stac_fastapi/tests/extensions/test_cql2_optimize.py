@@ -0,0 +1,142 @@
+import pytest
+
+from stac_fastapi.core.extensions.filter import optimize, to_es, to_es_filter
+
+
+def prop(name):
+    return {"property": name}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    (
+        # single value in
+        (
+            {"terms": {"platform": ["landsat-8"]}},
+            {"term": {"platform": "landsat-8"}},
+        ),
+        ({"terms": {"platform": ["a", "b"]}}, {"terms": {"platform": ["a", "b"]}}),
+        # must to filter, nested conjunctions flattened
+        (
+            {
+                "bool": {
+                    "must": [
+                        {"term": {"a": 1}},
+                        {"bool": {"must": [{"term": {"b": 2}}, {"term": {"c": 3}}]}},
+                        {"bool": {"must_not": {"exists": {"field": "d"}}}},
+                    ]
+                }
+            },
+            {
+                "bool": {
+                    "filter": [
+                        {"term": {"a": 1}},
+                        {"term": {"b": 2}},
+                        {"term": {"c": 3}},
+                    ],
+                    "must_not": [{"exists": {"field": "d"}}],
+                }
+            },
+        ),
+        # nested disjunctions flattened
+        (
+            {
+                "bool": {
+                    "should": [
+                        {"term": {"a": 1}},
+                        {"bool": {"should": [{"term": {"b": 2}}, {"term": {"c": 3}}]}},
+                    ]
+                }
+            },
+            {
+                "bool": {
+                    "should": [
+                        {"term": {"a": 1}},
+                        {"term": {"b": 2}},
+                        {"term": {"c": 3}},
+                    ]
+                }
+            },
+        ),
+        # a disjunction of a single query
+        ({"bool": {"should": [{"term": {"a": 1}}]}}, {"term": {"a": 1}}),
+        # NOT (a OR b)
+        (
+            {
+                "bool": {
+                    "must_not": [
+                        {"bool": {"should": [{"term": {"a": 1}}, {"term": {"b": 2}}]}}
+                    ]
+                }
+            },
+            {"bool": {"must_not": [{"term": {"a": 1}}, {"term": {"b": 2}}]}},
+        ),
+        # ranges on the same field
+        (
+            {
+                "bool": {
+                    "must": [
+                        {"range": {"x": {"gte": 1}}},
+                        {"term": {"a": 1}},
+                        {"range": {"x": {"lt": 5}}},
+                        {"range": {"y": {"gt": 0}}},
+                    ]
+                }
+            },
+            {
+                "bool": {
+                    "filter": [
+                        {"range": {"x": {"gte": 1, "lt": 5}}},
+                        {"term": {"a": 1}},
+                        {"range": {"y": {"gt": 0}}},
+                    ]
+                }
+            },
+        ),
+        # ranges bounding the same end are kept apart
+        (
+            {
+                "bool": {
+                    "must": [{"range": {"x": {"gt": 1}}}, {"range": {"x": {"gte": 2}}}]
+                }
+            },
+            {
+                "bool": {
+                    "filter": [
+                        {"range": {"x": {"gt": 1}}},
+                        {"range": {"x": {"gte": 2}}},
+                    ]
+                }
+            },
+        ),
+    ),
+)
+def test_optimize(query, expected):
+    assert optimize(query) == expected
+
+
+def test_to_es_filter():
+    cql2 = {
+        "op": "and",
+        "args": [
+            {"op": ">=", "args": [prop("eo:cloud_cover"), 10]},
+            {
+                "op": "and",
+                "args": [
+                    {"op": "<", "args": [prop("eo:cloud_cover"), 50]},
+                    {"op": "in", "args": [prop("platform"), ["landsat-8"]]},
+                ],
+            },
+        ],
+    }
+    original = to_es(cql2)
+    assert to_es_filter(cql2) == {
+        "bool": {
+            "filter": [
+                {"range": {"eo:cloud_cover": {"gte": 10, "lt": 50}}},
+                {"term": {"platform": "landsat-8"}},
+            ]
+        }
+    }
+    # the query built by to_es is left unchanged
+    assert to_es(cql2) == original
@@ -122,6 +122,216 @@ async def test_update_item_already_exists(app_client, ctx, load_test_data):
     await app_client.delete(f"/collections/{item['collection']}/items/{item['id']}")
 
 
+@pytest.mark.asyncio
+async def test_update_item_if_match(app_client, ctx):
+    """Test conditional updates of an item with its ETag (transactions extension)"""
+    item = ctx.item
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+    resp = await app_client.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+
+    item["properties"]["gsd"] = 16
+    resp = await app_client.put(url, json=item, headers={"If-Match": etag})
+    assert resp.status_code == 200
+    new_etag = resp.headers["etag"]
+    assert new_etag != etag
+
+    # the item was modified since the first ETag
+    item["properties"]["gsd"] = 32
+    resp = await app_client.put(url, json=item, headers={"If-Match": etag})
+    assert resp.status_code == 412
+
+    resp = await app_client.get(url)
+    assert resp.json()["properties"]["gsd"] == 16
+    assert resp.headers["etag"] == new_etag
+
+
+@pytest.mark.asyncio
+async def test_update_item_path_mismatch(app_client, ctx):
+    """Test updating an item with another id than the path (transactions extension)"""
+    item = dict(ctx.item, id="another-item")
+    resp = await app_client.put(
+        f"/collections/{item['collection']}/items/{ctx.item['id']}", json=item
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_patch_item_merge_patch(app_client, ctx):
+    """Test patching an item with a JSON Merge Patch (patch extension)"""
+    item = ctx.item
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+    resp = await app_client.patch(
+        url,
+        json={"properties": {"gsd": 16, "eo:cloud_cover": None}},
+        headers={"Content-Type": "application/merge-patch+json"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["properties"]["gsd"] == 16
+    assert "eo:cloud_cover" not in resp.json()["properties"]
+    assert resp.json()["properties"]["updated"] != item["properties"].get("updated")
+
+    resp = await app_client.get(url)
+    assert resp.json()["properties"]["gsd"] == 16
+    assert resp.json()["geometry"] == item["geometry"]
+
+
+@pytest.mark.asyncio
+async def test_patch_item_json_patch(app_client, ctx):
+    """Test patching an item with a JSON Patch (patch extension)"""
+    item = ctx.item
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+    headers = {"Content-Type": "application/json-patch+json"}
+    resp = await app_client.patch(
+        url,
+        json=[
+            {
+                "op": "test",
+                "path": "/properties/gsd",
+                "value": item["properties"]["gsd"],
+            },
+            {"op": "replace", "path": "/properties/gsd", "value": 16},
+            {"op": "add", "path": "/properties/keywords", "value": ["landsat"]},
+            {"op": "add", "path": "/properties/keywords/-", "value": "oli"},
+        ],
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["properties"]["gsd"] == 16
+    assert resp.json()["properties"]["keywords"] == ["landsat", "oli"]
+
+    # the test operation fails, the item is unchanged
+    resp = await app_client.patch(
+        url,
+        json=[
+            {"op": "test", "path": "/properties/gsd", "value": 32},
+            {"op": "replace", "path": "/properties/gsd", "value": 64},
+        ],
+        headers=headers,
+    )
+    assert resp.status_code == 409
+
+    resp = await app_client.patch(
+        url, json=[{"op": "replace", "path": "/id", "value": "a"}], headers=headers
+    )
+    assert resp.status_code == 400
+
+    resp = await app_client.get(url)
+    assert resp.json()["properties"]["gsd"] == 16
+
+
+@pytest.mark.asyncio
+async def test_patch_item_geometry(app_client, ctx):
+    """Test patching the geometry and the datetime of an item (patch extension)"""
+    item = ctx.item
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+    geometry = {"type": "Point", "coordinates": [10.0, 20.0]}
+    resp = await app_client.patch(
+        url,
+        json={
+            "geometry": geometry,
+            "bbox": [10.0, 20.0, 10.0, 20.0],
+            "properties": {"datetime": "2021-01-01T00:00:00Z"},
+        },
+        headers={"Content-Type": "application/merge-patch+json"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["geometry"] == geometry
+
+    resp = await app_client.get(
+        "/search",
+        params={"collections": item["collection"], "bbox": "9.9,19.9,10.1,20.1"},
+    )
+    assert [feature["id"] for feature in resp.json()["features"]] == [item["id"]]
+
+    resp = await app_client.patch(
+        url,
+        json={"geometry": {"type": "Point"}},
+        headers={"Content-Type": "application/merge-patch+json"},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_patch_item_invalid(app_client, ctx):
+    """Test patches making an item invalid (patch extension)"""
+    item = ctx.item
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+    asset = next(iter(item["assets"]))
+    for patch in (
+        {"stac_version": None},
+        {"assets": {asset: {"href": None}}},
+        {"assets": "x"},
+        # the value does not match the mapping of the field
+        {"properties": {"eo:cloud_cover": "cloudy"}},
+    ):
+        resp = await app_client.patch(
+            url, json=patch, headers={"Content-Type": "application/merge-patch+json"}
+        )
+        assert resp.status_code == 400, patch
+
+    resp = await app_client.get(url)
+    assert resp.json()["stac_version"] == item["stac_version"]
+    assert resp.json()["assets"][asset]["href"] == item["assets"][asset]["href"]
+    assert resp.json()["properties"]["eo:cloud_cover"] == 0
+
+
+@pytest.mark.asyncio
+async def test_patch_item_if_match(app_client, ctx):
+    """Test conditional patches of an item with its ETag (patch extension)"""
+    item = ctx.item
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+    etag = (await app_client.get(url)).headers["etag"]
+
+    resp = await app_client.patch(
+        url, json={"properties": {"gsd": 16}}, headers={"If-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+    resp = await app_client.patch(
+        url, json={"properties": {"gsd": 32}}, headers={"If-Match": etag}
+    )
+    assert resp.status_code == 412
+
+    resp = await app_client.patch(
+        f"/collections/{item['collection']}/items/missing-item",
+        json={"properties": {"gsd": 32}},
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch_items(app_client, ctx):
+    """Test patching many items in one request (patch extension)"""
+    item = ctx.item
+    resp = await app_client.patch(
+        f"/collections/{item['collection']}/bulk_items",
+        json={
+            "items": {
+                item["id"]: {"properties": {"gsd": 16}},
+                "missing-item": [
+                    {"op": "replace", "path": "/properties/gsd", "value": 16}
+                ],
+            }
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["patched"] == 1
+    assert resp.json()["failed"] == 1
+    assert resp.json()["errors"][0]["id"] == "missing-item"
+
+    resp = await app_client.get(f"/collections/{item['collection']}/items/{item['id']}")
+    assert resp.json()["properties"]["gsd"] == 16
+
+    resp = await app_client.patch(
+        f"/collections/{item['collection']}/bulk_items",
+        json={"items": {item["id"]: {"stac_version": None}}},
+    )
+    assert resp.json()["failed"] == 1
+
+
 @pytest.mark.asyncio
 async def test_update_new_item(app_client, load_test_data):
     """Test updating an item which does not exist (transactions extension)"""
@@ -135,6 +345,18 @@ async def test_update_new_item(app_client, load_test_data):
     assert resp.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_update_missing_item(app_client, ctx):
+    """Test updating an item which does not exist in an existing collection (transactions extension)"""
+    item = dict(ctx.item, id="missing-item")
+    url = f"/collections/{item['collection']}/items/{item['id']}"
+
+    resp = await app_client.put(url, json=item)
+    assert resp.status_code == 404
+    resp = await app_client.get(url)
+    assert resp.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_update_item_missing_collection(app_client, ctx, load_test_data):
     """Test updating an item without a parent collection (transactions extension)"""